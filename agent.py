@@ -4,52 +4,74 @@ Device Agent for Snapdragon vs Intel Performance Championship
 Runs on each laptop to monitor and report metrics
 """
 
-import json
 import time
+import argparse
 import threading
 import platform
 import socket
 import psutil
-import socketio
 import logging
 import sys
 import random
+import statistics
 from datetime import datetime
-import subprocess
+
+from config_loader import ConfigWatcher, get_config
+from energy_meter import EnergyMeter, combine_reports, detect_power_source
+from perf_model import load_performance_model
+from platform_detector import cpu_name
+from sim_clock import get_clock
+from startup_profile import StartupProfile, import_breakdown, lazy_import, module_available
+from structured_logging import RateLimitedLogger, SampledLogger, configure_logging
+from thermal_monitor import ThermalMonitor
+from throughput_tracker import SustainedThroughputTracker
+
+# Heavy imports are deferred to first use: socketio pulls in aiohttp and
+# requests (most of the agent's import time), and WMI/COM only matter on
+# Windows once a reading is taken
+socketio = lazy_import('socketio')
 
 # Windows-specific imports (conditional)
-try:
-    import wmi
-    import pythoncom
-    WINDOWS_WMI_AVAILABLE = True
-except ImportError:
-    WINDOWS_WMI_AVAILABLE = False
-    if platform.system() == 'Windows':
-        logging.warning("WMI not available. Install with: pip install wmi pywin32")
+WINDOWS_WMI_AVAILABLE = platform.system() == 'Windows' and \
+    module_available('wmi') and module_available('pythoncom')
+wmi = lazy_import('wmi')
+pythoncom = lazy_import('pythoncom')
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured in main() (configure_logging), not on import
 logger = logging.getLogger(__name__)
+if platform.system() == 'Windows' and not WINDOWS_WMI_AVAILABLE:
+    logger.warning("WMI not available. Install with: pip install wmi pywin32")
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# Start-up phases; main() loads the config (and with it the budget) after imports
+startup = StartupProfile()
+startup.mark('imports')
 
 class DeviceAgent:
-    def __init__(self, device_type=None, device_config=None):
+    def __init__(self, device_type=None, device_config=None, clock=None, config=None):
         """Initialize the device agent
         
         Args:
             device_type: Optional device type ('snapdragon' or 'intel') for testing
             device_config: Optional device configuration dict for testing
+            clock: Optional sim_clock.Clock (a VirtualClock time-warps rehearsals)
+            config: Optional config dict (default: config.json via config_loader)
         """
+        # Validated; reloadable sections are updated in place
+        self.config = config or get_config()
+        self.clock = clock or get_clock()
+        logging_config = self.config.get('logging', {})
+        # Metrics are read and reported every update_interval: a failing sensor
+        # is logged once a minute, and per-report debug lines are sampled
+        self.errors = RateLimitedLogger(logger, logging_config.get('error_interval', 60), clock=self.clock)
+        self.debug_log = SampledLogger(logger, logging_config.get('debug_sample_every', 100))
         self.device_type = device_type if device_type else self.detect_device_type()
-        self.device_config = device_config if device_config else config['devices'].get(self.device_type, {})
-        self.sio = socketio.Client()
+        self.device_config = device_config if device_config else self.config['devices'].get(self.device_type, {})
         self.running = True
         self.current_test = None
         self.workload = 'idle'
-        self.server_url = f"http://{config['network']['server_ip']}:{config['network']['server_port']}"
+        self.server_url = f"http://{self.config['network']['server_ip']}:{self.config['network']['server_port']}"
+        # Stable id so several agents of one platform can join the same race
+        self.device_id = f"{self.device_type}-{socket.gethostname()}".lower()
         
         # Store device metrics
         self.base_cpu = self.device_config.get('base_cpu', 20)
@@ -57,14 +79,23 @@ class DeviceAgent:
         self.battery_drain_rate = self.device_config.get('battery_drain_rate', 1.0)
         self.ai_tops = self.device_config.get('ai_tops', 20)
         
-        # Setup Socket.IO event handlers
+        # Recorded timing traces drive simulated generation steps
+        self.perf_model = load_performance_model(self.device_type)
+        
+        # Energy accounting source, probed on first use (WMI/sysfs probes are slow)
+        self._power_source = None
+        self._power_source_lock = threading.Lock()
+        
+        # Setup Socket.IO event handlers (by now socketio has usually been prefetched)
+        self.sio = socketio.Client()
         self.setup_handlers()
         
         logger.info(f"Device Agent initialized as: {self.device_type}")
         
     def detect_device_type(self):
         """Detect if this is Snapdragon or Intel device"""
-        processor = platform.processor().lower()
+        # platform.processor() would spawn `uname -p` on Linux
+        processor = cpu_name().lower()
         machine = platform.machine().lower()
         
         # Check for ARM/Snapdragon
@@ -99,6 +130,7 @@ class DeviceAgent:
             # Register device
             self.sio.emit('device_register', {
                 'device_type': self.device_type,
+                'device_id': self.device_id,
                 'hostname': socket.gethostname(),
                 'platform': platform.platform()
             })
@@ -121,13 +153,17 @@ class DeviceAgent:
             self.current_test = scenario
             
             # Start test in separate thread
-            test_thread = threading.Thread(
-                target=self.run_test,
-                args=(scenario, test_config),
-                daemon=True
-            )
-            test_thread.start()
-        
+            self.clock.start_thread(self.run_test, args=(scenario, test_config))
+
+        @self.sio.event
+        def prepare_test(data):
+            """Get ready for an upcoming tournament phase and acknowledge"""
+            scenario = data['scenario']
+            logger.info(f"Preparing for: {scenario}")
+            
+            # Set up in the background; test_ready goes out once it is done
+            self.clock.start_thread(self.prepare_scenario, args=(scenario, data.get('config') or {}))
+
         @self.sio.event
         def demo_stopped(data):
             """Handle demo stop"""
@@ -173,7 +209,7 @@ class DeviceAgent:
                 metrics['fan_rpm'] = self.get_fan_speed_simulation()
             
         except Exception as e:
-            logger.error(f"Error getting metrics: {e}")
+            self.errors.error('get_metrics', f"Error getting metrics: {e}")
         
         return metrics
     
@@ -194,7 +230,7 @@ class DeviceAgent:
                 temp_celsius = temp_kelvin - 273.15
                 return round(temp_celsius, 1)
         except Exception as e:
-            logger.debug(f"Could not get real temperature via WMI: {e}")
+            self.debug_log.debug('wmi_temperature', f"Could not get real temperature via WMI: {e}")
         finally:
             pythoncom.CoUninitialize()
         
@@ -238,7 +274,7 @@ class DeviceAgent:
                 if sensor.SensorType == 'Fan':
                     return int(sensor.Value)
         except Exception as e:
-            logger.debug(f"Could not get real fan speed via WMI: {e}")
+            self.debug_log.debug('wmi_fan', f"Could not get real fan speed via WMI: {e}")
         finally:
             pythoncom.CoUninitialize()
         
@@ -282,11 +318,88 @@ class DeviceAgent:
         logger.info(f"Simulating {workload_type} workload on {self.device_type}")
         
         # Update CPU and temperature based on workload
-        if workload_type in config.get('simulation', {}).get('workload_profiles', {}):
-            profile = config['simulation']['workload_profiles'][workload_type]
+        if workload_type in self.config.get('simulation', {}).get('workload_profiles', {}):
+            profile = self.config['simulation']['workload_profiles'][workload_type]
             self.base_cpu = self.device_config.get('base_cpu', 20) * profile.get('cpu_multiplier', 1.0)
             self.base_temp = self.device_config.get('base_temp', 40) + profile.get('temp_increase', 0)
     
+    def get_simulated_load(self):
+        """Load fraction used by the simulated power model"""
+        if self.current_test:
+            return 1.0
+        return min(self.base_cpu / 100.0, 1.0)
+    
+    @property
+    def power_source(self):
+        """Most precise power source available, detected once"""
+        if self._power_source is None:
+            with self._power_source_lock:
+                if self._power_source is None:
+                    self._power_source = detect_power_source(self.device_config, self.get_simulated_load)
+                    logger.info(f"Energy source: {self._power_source.name}")
+        return self._power_source
+    
+    def create_energy_meter(self):
+        """Create an energy meter for a single test window"""
+        return EnergyMeter(self.power_source,
+                           sample_interval=self.config.get('energy', {}).get('sample_interval', 0.1),
+                           capacity_wh=self.device_config.get('battery_capacity_wh'),
+                           clock=self.clock)
+    
+    def prepare_scenario(self, scenario, test_config):
+        """Set up for an upcoming scenario, then report ready to the server
+        
+        Generation scenarios reload the performance model (picking up a
+        refitted trace) and warm its sampler; every scenario opens the power
+        source and takes a short metered probe, so detection and WMI/COM
+        start-up happen now rather than in the race's first seconds.
+        """
+        ready = {'scenario': scenario, 'device_id': self.device_id}
+        try:
+            if scenario in ('ai_showdown', 'sustained_generation'):
+                self.perf_model = load_performance_model(self.device_type)
+                self.perf_model.sample_run(test_config.get('steps', 20))
+            
+            meter = self.create_energy_meter()
+            meter.start()
+            self.clock.sleep(meter.sample_interval * 3)
+            probe = meter.stop()
+            ready['energy_source'] = probe['source']
+            ready['energy_samples'] = probe['samples']
+            ready['charging'] = probe['charging']
+            if probe['charging'] and scenario == 'battery_race':
+                logger.warning("Charging during battery_race preparation; unplug for a meaningful drain")
+        except Exception as e:
+            self.errors.error('prepare_test', f"Preparing {scenario} failed: {e}")
+            ready['error'] = str(e)
+        
+        ready['temperature'] = self.get_system_metrics().get('temperature')
+        self.sio.emit('test_ready', ready)
+    
+    def get_cpu_freq(self):
+        """Current CPU frequency in MHz (0 if unavailable)"""
+        try:
+            freq = psutil.cpu_freq()
+            return freq.current if freq else 0
+        except Exception:
+            return 0
+    
+    def run_work_slice(self, slice_seconds):
+        """Run the fixed stress workload for a time slice, returning work units per second"""
+        units = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < slice_seconds:
+            _ = sum(j*j for j in range(5000))
+            units += 1
+            if self.clock.virtual:
+                # Measure the real rate on a short burst, then warp over the slice
+                if units >= 10:
+                    break
+        rate = units / (time.perf_counter() - start)
+        if self.clock.virtual:
+            self.clock.sleep(slice_seconds)
+        return rate
+    
     def get_metrics(self):
         """Get current device metrics for testing"""
         return self.get_system_metrics()
@@ -314,42 +427,129 @@ class DeviceAgent:
     
     def run_test(self, scenario, test_config):
         """Run a specific test scenario"""
-        start_time = time.time()
+        start_time = self.clock.time()
         
         if scenario == 'ai_showdown':
             # Simulate AI image generation
             logger.info("Starting AI image generation simulation...")
+            meter = self.create_energy_meter()
+            meter.start()
             
-            # Simulate different completion times
-            if self.device_type == 'snapdragon':
-                duration = random.uniform(8, 12)
-            else:
-                duration = random.uniform(25, 35)
+            # Repeat the generation so the server can score medians, not one noisy run
+            steps = test_config.get('steps', 20)
+            repetitions = test_config.get('repetitions', 1)
+            run_times = []
             
-            # Show progress updates
+            for repetition in range(repetitions):
+                # Replay per-step timings from the platform's performance model
+                run_start = self.clock.monotonic()
+                step_times = self.perf_model.sample_run(steps, start_offset=sum(run_times))
+                
+                # Show progress updates
+                for step in range(steps):
+                    if not self.current_test:
+                        break
+                        
+                    progress = (repetition * steps + step + 1) / (repetitions * steps) * 100
+                    self.sio.emit('test_progress', {
+                        'device_type': self.device_type,
+                        'scenario': scenario,
+                        'progress': progress,
+                        'step': step + 1,
+                        'total_steps': steps,
+                        'repetition': repetition + 1,
+                        'repetitions': repetitions
+                    })
+                    
+                    self.clock.sleep(step_times[step])
+                else:
+                    run_times.append(round(self.clock.monotonic() - run_start, 2))
+                    continue
+                break
+            
+            # Report completion
+            completion_time = statistics.median(run_times) if run_times else self.clock.time() - start_time
+            energy = meter.stop(images=len(run_times))
+            self.sio.emit('test_complete', {
+                'device_type': self.device_type,
+                'scenario': scenario,
+                'result': {
+                    'time': round(completion_time, 1),
+                    'runs': run_times,
+                    'total_time': round(self.clock.time() - start_time, 1),
+                    'energy': energy,
+                    'success': True
+                }
+            })
+            
+        elif scenario == 'sustained_generation':
+            # Back-to-back image generation for a fixed duration
+            logger.info("Starting sustained generation run...")
+            duration = test_config.get('duration', 300)
             steps = test_config.get('steps', 20)
-            for step in range(steps):
+            repetitions = max(test_config.get('repetitions', 1), 1)
+            rest = test_config.get('rest', 10)
+            run_length = max((duration - rest * (repetitions - 1)) / repetitions, 1)
+            meter = self.create_energy_meter()
+            meter.start()
+            summaries = []
+            image_count = 0
+            
+            # Separate sustained runs with an idle rest between them; each run's
+            # images/minute is one sample for the server's scoring
+            for repetition in range(repetitions):
                 if not self.current_test:
                     break
+                if repetition:
+                    self.clock.sleep(rest)
+                tracker = SustainedThroughputTracker(window=test_config.get('trend_window', 60),
+                                                     dropoff_threshold=test_config.get('dropoff_threshold', 0.15))
+                run_start = self.clock.monotonic()
+                
+                while self.current_test and self.clock.monotonic() - run_start < run_length:
+                    image_start = self.clock.monotonic()
+                    # Continuous load, so throttling follows time since the run started
+                    step_times = self.perf_model.sample_run(steps, start_offset=image_start - run_start)
                     
-                progress = (step + 1) / steps * 100
-                self.sio.emit('test_progress', {
-                    'device_type': self.device_type,
-                    'scenario': scenario,
-                    'progress': progress,
-                    'step': step + 1,
-                    'total_steps': steps
-                })
+                    for step in range(steps):
+                        if not self.current_test:
+                            break
+                        self.clock.sleep(step_times[step])
+                    else:
+                        latency = self.clock.monotonic() - image_start
+                        tracker.record(self.clock.monotonic() - run_start, latency)
+                        image_count += 1
+                        
+                        # Stream per-image latency
+                        self.sio.emit('image_generated', {
+                            'device_type': self.device_type,
+                            'scenario': scenario,
+                            'image': image_count,
+                            'run': repetition + 1,
+                            'latency': round(latency, 2),
+                            'elapsed': round(self.clock.monotonic() - run_start, 1)
+                        })
                 
-                time.sleep(duration / steps)
+                tracker.finish(self.clock.monotonic() - run_start)
+                summaries.append(tracker.summary())
+            
+            energy = meter.stop(images=image_count)
+            runs = [summary['images_per_minute'] for summary in summaries if summary['elapsed']]
+            latencies = [summary['latency_variance'] for summary in summaries if summary['images'] > 1]
+            dropoffs = [summary['dropoff_point'] for summary in summaries if summary['dropoff_point'] is not None]
             
-            # Report completion
-            completion_time = time.time() - start_time
             self.sio.emit('test_complete', {
                 'device_type': self.device_type,
                 'scenario': scenario,
                 'result': {
-                    'time': round(completion_time, 1),
+                    'images': image_count,
+                    'images_per_minute': round(statistics.median(runs), 2) if runs else 0.0,
+                    'dropoff_point': min(dropoffs, default=None),
+                    'latency_variance': round(statistics.mean(latencies), 3) if latencies else 0.0,
+                    'runs': runs,
+                    'sustained': summaries,
+                    'energy': energy,
+                    'duration': duration,
                     'success': True
                 }
             })
@@ -358,33 +558,41 @@ class DeviceAgent:
             # Simulate battery drain test
             logger.info("Starting battery efficiency test...")
             duration = test_config.get('duration', 180)
+            repetitions = max(test_config.get('repetitions', 1), 1)
+            run_length = duration / repetitions
             
-            # Simulate CPU/GPU stress
-            start_battery = psutil.sensors_battery().percent if psutil.sensors_battery() else 100
+            # Separately metered runs, so the server scores independent repeats
+            meter = self.create_energy_meter()
+            reports = []
+            drain_runs = []
             
-            for i in range(duration):
+            for repetition in range(repetitions):
                 if not self.current_test:
                     break
-                    
-                # Simulate workload
-                _ = sum(j*j for j in range(10000))
-                time.sleep(1)
-            
-            # Report battery drain
-            end_battery = psutil.sensors_battery().percent if psutil.sensors_battery() else 95
-            drain = start_battery - end_battery
+                meter.start()
+                run_start = self.clock.monotonic()
+                while self.current_test and self.clock.monotonic() - run_start < run_length:
+                    # Simulate CPU/GPU stress while integrating battery energy
+                    _ = sum(j*j for j in range(10000))
+                    self.clock.sleep(1)
+                report = meter.stop()
+                reports.append(report)
+                if report['duration']:
+                    # Scaled to the whole test, the same scale as battery_drain
+                    drain_runs.append(round(report['battery_drain'] * duration / report['duration'], 3))
             
-            # Simulate different drain rates
-            if self.device_type == 'snapdragon':
-                drain = random.uniform(2, 3)
-            else:
-                drain = random.uniform(5, 7)
+            # Report measured battery drain
+            energy = combine_reports(reports)
             
             self.sio.emit('test_complete', {
                 'device_type': self.device_type,
                 'scenario': scenario,
                 'result': {
-                    'battery_drain': round(drain, 1),
+                    'battery_drain': energy['battery_drain'],
+                    'runs': drain_runs,
+                    'joules': energy['joules'],
+                    'avg_watts': energy['avg_watts'],
+                    'energy': energy,
                     'duration': duration,
                     'success': True
                 }
@@ -395,25 +603,54 @@ class DeviceAgent:
             logger.info("Starting thermal stress test...")
             duration = test_config.get('duration', 180)
             
-            max_temp = 0
-            for i in range(duration):
+            # Hold a constant duty cycle and record frequency, temperature and work rate
+            monitor = ThermalMonitor(throttle_drop=test_config.get('throttle_drop', 0.10),
+                                     curve_bucket=test_config.get('curve_bucket', 60))
+            work_slice = test_config.get('work_slice', 0.5)
+            repetitions = max(test_config.get('repetitions', 1), 1)
+            rest = test_config.get('rest', 10)
+            run_length = max((duration - rest * (repetitions - 1)) / repetitions, 1)
+            peaks = []
+            load_start = self.clock.monotonic()
+            
+            # Separate loaded runs with an idle rest between them; each run's
+            # peak is one sample for the server's scoring
+            for repetition in range(repetitions):
                 if not self.current_test:
                     break
-                    
-                # Simulate workload
-                _ = sum(j*j for j in range(50000))
-                
-                # Track max temperature
-                current_temp = self.get_temperature_simulation()
-                max_temp = max(max_temp, current_temp)
+                if repetition:
+                    self.clock.sleep(rest)
+                run_start = self.clock.monotonic()
+                peak = None
                 
-                time.sleep(1)
+                while self.current_test and self.clock.monotonic() - run_start < run_length:
+                    period_start = self.clock.monotonic()
+                    work_rate = self.run_work_slice(work_slice)
+                    
+                    if platform.system() == 'Windows':
+                        current_temp = self.get_temperature_windows()
+                    else:
+                        current_temp = self.get_temperature_simulation()
+                    
+                    monitor.record(period_start - load_start, self.get_cpu_freq(), current_temp, work_rate)
+                    if current_temp is not None:
+                        peak = current_temp if peak is None else max(peak, current_temp)
+                    
+                    self.clock.sleep(max(0, 1 - (self.clock.monotonic() - period_start)))
+                if peak is not None:
+                    peaks.append(peak)
+            
+            thermal = monitor.summary()
             
             self.sio.emit('test_complete', {
                 'device_type': self.device_type,
                 'scenario': scenario,
                 'result': {
-                    'max_temperature': round(max_temp, 1),
+                    'max_temperature': thermal['max_temperature'] or 0,
+                    'runs': peaks,
+                    'time_to_throttle': thermal['time_to_throttle'],
+                    'steady_state_pct_of_peak': thermal['steady_state_pct_of_peak'],
+                    'thermal': thermal,
                     'duration': duration,
                     'success': True
                 }
@@ -430,14 +667,16 @@ class DeviceAgent:
                     self.sio.emit('metrics_update', {
                         'device_type': self.device_type,
                         'metrics': metrics,
-                        'timestamp': datetime.now().isoformat()
+                        'timestamp': datetime.fromtimestamp(self.clock.time()).isoformat()
                     })
+                    self.debug_log.debug('metrics_update', "Reported metrics: cpu %s%%, %s C",
+                                         metrics.get('cpu', {}).get('percent'), metrics.get('temperature'))
                 
-                time.sleep(config['monitoring']['update_interval'])
+                self.clock.sleep(self.config['simulation']['update_interval'])
                 
             except Exception as e:
-                logger.error(f"Error reporting metrics: {e}")
-                time.sleep(5)
+                self.errors.error('report_metrics', f"Error reporting metrics: {e}")
+                self.clock.sleep(5)
     
     def connect_to_server(self):
         """Connect to the championship server"""
@@ -447,7 +686,7 @@ class DeviceAgent:
         while retry_count < max_retries:
             try:
                 logger.info(f"Attempting to connect to {self.server_url}...")
-                self.sio.connect(self.server_url)
+                self.sio.connect(self.server_url, auth={'role': 'agent', 'device_id': self.device_id})
                 logger.info("Successfully connected to server!")
                 return True
                 
@@ -458,7 +697,7 @@ class DeviceAgent:
                 if retry_count < max_retries:
                     wait_time = retry_count * 2
                     logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    self.clock.sleep(wait_time)
                 else:
                     logger.error("Max retries reached. Unable to connect to server.")
                     return False
@@ -471,30 +710,75 @@ class DeviceAgent:
         if not self.connect_to_server():
             logger.error("Failed to connect to server. Exiting.")
             return
+        startup.mark('connect')
+        self.check_startup_budget()
         
-        # Start metrics reporter thread
-        reporter_thread = threading.Thread(target=self.metrics_reporter, daemon=True)
-        reporter_thread.start()
+        # Probe the power source now, off the critical path, so the first
+        # battery race does not pay for it
+        self.clock.start_thread(lambda: self.power_source)
+        # Start metrics reporter thread; it re-reads update_interval each report
+        self.clock.start_thread(self.metrics_reporter)
+        ConfigWatcher(clock=self.clock).start()
         
         # Keep running
         try:
             logger.info(f"Agent running as {self.device_type}. Press Ctrl+C to stop.")
             while self.running:
-                time.sleep(1)
+                self.clock.sleep(1)
                 
         except KeyboardInterrupt:
             logger.info("Shutting down agent...")
             self.running = False
             self.sio.disconnect()
 
+    def check_startup_budget(self):
+        """Log how long start-up took and any phase over its budget"""
+        report = startup.report()
+        logger.info(f"Started in {report['total']:.2f}s: {report['phases']} "
+                    f"(lazy imports {report['lazy_imports']})")
+        for problem in report['over_budget']:
+            logger.warning(f"Start-up over budget: {problem}")
+        return report
+
+def print_startup_profile(top=10):
+    """Import-time breakdown of this module, checked against the imports budget"""
+    entries = import_breakdown('agent')
+    total = entries[0]['cumulative']
+    print(f"import agent: {total:.3f}s")
+    for entry in entries[1:top + 1]:
+        print(f"  {entry['cumulative']:8.3f}s  {entry['module']}")
+    for name in ('socketio',):
+        print(f"  {import_breakdown(name, depth=0)[0]['cumulative']:8.3f}s  {name} (deferred)")
+    
+    budget = startup.budget.get('imports')
+    if budget is not None and total > budget:
+        print(f"Over the imports budget of {budget:.2f}s")
+        return False
+    return True
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Championship device agent')
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='Print an import-time breakdown and check the start-up budget, then exit')
+    args = parser.parse_args()
+    config = get_config()
+    startup.budget = dict(config.get('startup', {}).get('budget') or {})
+    startup.mark('config')
+    configure_logging(config.get('logging'), 'agent')
+    if args.startup_profile:
+        sys.exit(0 if print_startup_profile() else 1)
+    
+    # Load socketio while the agent detects its device and loads its traces
+    socketio.prefetch()
+    
     print("\n" + "="*60)
     print("  SNAPDRAGON vs INTEL PERFORMANCE CHAMPIONSHIP")
     print("  Device Agent v1.0")
     print("="*60 + "\n")
     
-    agent = DeviceAgent()
+    agent = DeviceAgent(config=config)
+    startup.mark('init')
     agent.run()
 
 if __name__ == '__main__':
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Asset Pipeline for Snapdragon vs Intel Performance Championship
+Fingerprinted, precompressed dashboard assets served from memory
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 256
+
+
+class AssetPipeline:
+    """Builds an in-memory asset table once at startup
+
+    Every file under `root` is read, hashed and published under a
+    content-addressed name (css/main.css -> css/main.1a2b3c4d5e.css) that
+    can be cached forever. Text assets are precompressed with gzip, and with
+    brotli when the module is installed, so requests never touch the disk or
+    compress on the fly. The original names keep working but must revalidate.
+    """
+
+    def __init__(self, root: str, prefix: str = 'assets', hash_length: int = 10):
+        self.root = Path(root)
+        self.prefix = prefix.strip('/')
+        self.hash_length = hash_length
+        self.manifest: Dict[str, str] = {}
+        self._assets: Dict[str, Dict] = {}
+        self._routes: Dict[str, Tuple[Dict, bool]] = {}
+
+    def build(self) -> Dict[str, str]:
+        """Hash and compress every asset; returns the logical -> fingerprinted manifest"""
+        assets, routes, manifest = {}, {}, {}
+        for file in sorted(p for p in self.root.rglob('*') if p.is_file()):
+            logical = file.relative_to(self.root).as_posix()
+            asset = self._load(file, logical)
+            assets[logical] = asset
+            manifest[logical] = asset['fingerprinted']
+            routes[logical] = (asset, False)
+            routes[asset['fingerprinted']] = (asset, True)
+
+        self._assets, self._routes, self.manifest = assets, routes, manifest
+        saved = sum(a['size'] - min(len(b) for b in a['bodies'].values()) for a in assets.values())
+        logger.info(f"Asset pipeline: {len(assets)} files, {saved / 1024:.1f} KB saved by precompression")
+        return manifest
+
+    def _load(self, file: Path, logical: str) -> Dict:
+        data = file.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:self.hash_length]
+        stem, dot, suffix = logical.rpartition('.')
+        fingerprinted = f"{stem}.{digest}.{suffix}" if dot and '/' not in suffix else f"{logical}.{digest}"
+        content_type = mimetypes.guess_type(logical)[0] or 'application/octet-stream'
+
+        bodies = {'identity': data}
+        if len(data) >= MIN_COMPRESS_SIZE and content_type.startswith(COMPRESSIBLE_TYPES):
+            candidates = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                candidates['br'] = brotli.compress(data, quality=11)
+            # Only keep encodings that actually pay for themselves
+            bodies.update({name: body for name, body in candidates.items()
+                           if len(body) < len(data) * 0.9})
+
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        return {
+            'logical': logical,
+            'fingerprinted': fingerprinted,
+            'digest': digest,
+            'content_type': content_type,
+            'size': len(data),
+            'bodies': bodies
+        }
+
+    def url(self, logical: str) -> str:
+        """Template helper: the cache-forever URL for an asset, or its plain path if unknown"""
+        return f"{self.prefix}/{self.manifest.get(logical, logical)}"
+
+    @staticmethod
+    def _negotiate(asset: Dict, accept_encoding: str) -> str:
+        accepted = set()
+        for part in (accept_encoding or '').split(','):
+            name, _, params = part.strip().partition(';')
+            if name and params.replace(' ', '') not in ('q=0', 'q=0.0'):
+                accepted.add(name.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in asset['bodies'] and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+
+    def respond(self, path: str, accept_encoding: str = '',
+                if_none_match: Optional[str] = None) -> Tuple[int, bytes, Dict[str, str]]:
+        """Framework-neutral response for an asset request: (status, body, headers)"""
+        route = self._routes.get(path.lstrip('/'))
+        if route is None:
+            return 404, b'Not Found', {'Content-Type': 'text/plain; charset=utf-8'}
+
+        asset, fingerprinted = route
+        encoding = self._negotiate(asset, accept_encoding)
+        etag = f'"{asset["digest"]}"' if encoding == 'identity' else f'"{asset["digest"]}-{encoding}"'
+        headers = {
+            'ETag': etag,
+            'Cache-Control': IMMUTABLE if fingerprinted else REVALIDATE,
+            'Vary': 'Accept-Encoding'
+        }
+
+        if if_none_match:
+            tags = {tag.strip()[2:] if tag.strip().startswith('W/') else tag.strip()
+                    for tag in if_none_match.split(',')}
+            if '*' in tags or etag in tags:
+                return 304, b'', headers
+
+        headers['Content-Type'] = asset['content_type']
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return 200, asset['bodies'][encoding], headers
+
+    def stats(self) -> Dict:
+        return {
+            'files': len(self._assets),
+            'brotli': brotli is not None,
+            'bytes': sum(a['size'] for a in self._assets.values()),
+            'compressed_bytes': {
+                encoding: sum(len(a['bodies'].get(encoding, a['bodies']['identity']))
+                              for a in self._assets.values())
+                for encoding in (('gzip', 'br') if brotli is not None else ('gzip',))
+            }
+        }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Async Championship Server for Snapdragon vs Intel Performance Championship
+python-socketio AsyncServer on aiohttp serving the same events and routes as server.py
+"""
+
+import asyncio
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+import socketio
+from aiohttp import web
+
+import server as core
+from session_log import parse_speed
+from state_backend import parse_backend
+from structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_DIR = Path(__file__).parent / 'dashboard'
+
+
+class AsyncTransport:
+    """Schedules emits and room changes on the AsyncServer's event loop
+
+    Event handlers run on the loop itself; the metrics tick, health check and
+    other background threads do not. Either way the coroutine is queued and
+    the caller returns immediately, so a slow client never blocks a handler.
+    """
+
+    def __init__(self, sio: socketio.AsyncServer, loop: asyncio.AbstractEventLoop):
+        self.sio = sio
+        self.loop = loop
+        self._tasks = set()
+
+    def _submit(self, coro):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def emit(self, event, data, to=None):
+        core.EVENTS_OUT.labels(event).inc()
+        self._submit(self.sio.emit(event, data, to=to))
+
+    def enter_room(self, sid, room):
+        self._submit(self.sio.enter_room(sid, room))
+
+    def leave_room(self, sid, room):
+        self._submit(self.sio.leave_room(sid, room))
+
+    def send_queue_depths(self):
+        """Packets waiting in each client's Engine.IO send queue"""
+        return [s.queue.qsize() for s in list(self.sio.eio.sockets.values())]
+
+    def send_queue_depth(self, sid):
+        """Packets waiting in one client's Engine.IO send queue"""
+        socket = self.sio.eio.sockets.get(self.sio.manager.eio_sid_from_sid(sid, '/'))
+        return socket.queue.qsize() if socket else 0
+
+
+def _socket_handler(event, handler):
+    """Adapt a server.py handler(sid, *args) to AsyncServer's calling convention"""
+    if event == 'connect':
+        async def on_connect(sid, environ, auth=None):
+            handler(sid, auth)
+        return on_connect
+
+    async def on_event(sid, *args):
+        handler(sid, *args)
+    return on_event
+
+
+def _api_handler(view):
+    async def api(request):
+        # Views may touch SQLite, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        return web.json_response(await loop.run_in_executor(None, view, request.query))
+    return api
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    response = await handler(request)
+    # The Engine.IO websocket handler returns nothing once the socket closes
+    if response is not None:
+        response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def create_app(replay: Optional[str] = None, speed: float = 1.0) -> web.Application:
+    """aiohttp application with the dashboard, JSON API and Socket.IO events"""
+    sio = socketio.AsyncServer(async_mode='aiohttp',
+                               cors_allowed_origins='*',
+                               logger=False,
+                               engineio_logger=False)
+    app = web.Application(middlewares=[cors_middleware])
+    sio.attach(app)
+
+    for event, handler in core.SOCKET_EVENTS.items():
+        sio.on(event, _socket_handler(event, handler))
+
+    # The dashboard template only depends on config, so render it once
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(str(DASHBOARD_DIR)))
+    index_html = environment.get_template('index.html').render(config=core.config,
+                                                               asset_url=core.assets.url)
+
+    async def index(request):
+        return web.Response(text=index_html, content_type='text/html',
+                            headers={'Cache-Control': 'no-cache'})
+
+    async def send_asset(request):
+        status, body, headers = core.assets.respond(request.match_info['path'],
+                                                    request.headers.get('Accept-Encoding', ''),
+                                                    request.headers.get('If-None-Match'))
+        return web.Response(body=body, status=status, headers=headers)
+
+    async def metrics(request):
+        return web.Response(body=core.instruments.render().encode(),
+                            headers={'Content-Type': core.instruments.CONTENT_TYPE})
+
+    app.router.add_get('/', index)
+    app.router.add_get('/metrics', metrics)
+    app.router.add_get('/assets/{path:.+}', send_asset)
+    for path, view in core.API_ROUTES.items():
+        app.router.add_get(path, _api_handler(view))
+
+    async def on_startup(app):
+        core.transport = AsyncTransport(sio, asyncio.get_running_loop())
+        core.start_background_tasks()
+        if replay:
+            core.start_replay(replay, speed)
+
+    app.on_startup.append(on_startup)
+    app['sio'] = sio
+    return app
+
+
+def main():
+    """Run the championship server on asyncio"""
+    parser = argparse.ArgumentParser(description='Performance Championship Server (asyncio mode)')
+    parser.add_argument('--port', type=int, default=core.config['network']['server_port'])
+    parser.add_argument('--record', nargs='?', const='', metavar='PATH',
+                        help='Record all Socket.IO traffic (default path under session_log.directory)')
+    parser.add_argument('--replay', metavar='PATH', help='Replay a recorded session instead of live agents')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help='Replay speed multiplier, or "max"')
+    parser.add_argument('--backend', type=parse_backend, metavar='SPEC',
+                        help='State backend shared with other workers: "memory" or "sqlite[:PATH]"')
+    parser.add_argument('--worker-id', help='Name of this worker on the state backend')
+    args = parser.parse_args()
+    
+    configure_logging(core.config.get('logging'), f"server-{args.worker_id}" if args.worker_id else 'server')
+    if args.record is not None:
+        core.start_recording(args.record or None)
+    core.configure_backend(args.backend, args.worker_id)
+
+    logger.info(f"Starting async Performance Championship Server on port {args.port}")
+    web.run_app(create_app(args.replay, args.speed), host='0.0.0.0', port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
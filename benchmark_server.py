@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Server Benchmark for Snapdragon vs Intel Performance Championship
+Compares serving modes, and 1..N workers on a shared state backend, under many dashboard connections
+"""
+
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import statistics
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+import psutil
+import socketio
+
+SERVER_SCRIPTS = {
+    'threading': ['server.py', '--no-debug'],
+    'async': ['async_server.py']
+}
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+class ProcessSampler:
+    """Peak memory, thread count and mean CPU of the server process trees"""
+
+    def __init__(self, pids: List[int]):
+        self.processes = [psutil.Process(pid) for pid in pids]
+        self.rss = []
+        self.threads = []
+        self.cpu = []
+
+    def sample(self):
+        processes = []
+        for process in self.processes:
+            processes += [process] + process.children(recursive=True)
+        self.rss.append(sum(p.memory_info().rss for p in processes) / 1024 / 1024)
+        self.threads.append(sum(p.num_threads() for p in processes))
+        self.cpu.append(sum(p.cpu_percent() for p in processes))
+
+    def summary(self) -> Dict:
+        return {
+            'peak_rss_mb': round(max(self.rss, default=0), 1),
+            'peak_threads': max(self.threads, default=0),
+            'avg_cpu_percent': round(statistics.mean(self.cpu[1:]), 1) if len(self.cpu) > 1 else 0.0
+        }
+
+
+async def run_load(urls: List[str], clients: int, agents: int, rate: float, duration: float,
+                   sampler: ProcessSampler) -> Dict:
+    """Connect dashboards and agents round-robin over the servers, stream metrics and measure delivery"""
+    latencies: List[float] = []
+    connect_times: List[float] = []
+    frames = [0] * clients
+    updates = [0] * clients
+    seen = [set() for _ in range(clients)]
+    measuring = True
+    failures = 0
+    limit = asyncio.Semaphore(50)
+
+    async def connect_dashboard(index):
+        nonlocal failures
+        client = socketio.AsyncClient(reconnection=False)
+
+        @client.on('metrics_frame')
+        async def on_frame(frame):
+            if not measuring:
+                return
+            frames[index] += 1
+            updates[index] += len(frame['devices'])
+            seen[index].update(frame['devices'])
+            latencies.append(time.time() - frame['timestamp'])
+
+        async with limit:
+            started = time.perf_counter()
+            try:
+                await client.connect(urls[index % len(urls)], transports=['websocket'], wait_timeout=30)
+                connect_times.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+        return client
+
+    async def run_agent(index):
+        client = socketio.AsyncClient(reconnection=False)
+        await client.connect(urls[index % len(urls)], transports=['websocket'], auth={'role': 'agent'})
+        platform = 'snapdragon' if index % 2 == 0 else 'intel'
+        await client.emit('device_register', {'device_type': platform,
+                                              'device_id': f"bench-{platform}-{index}"})
+        deadline = time.time() + duration
+        while time.time() < deadline:
+            await client.emit('metrics_update', {'metrics': {
+                'cpu': {'percent': 20 + index},
+                'memory': {'percent': 40},
+                'temperature': 50 + index,
+                'battery': {'percent': 90},
+                'fan_rpm': 0
+            }})
+            await asyncio.sleep(1 / rate)
+        return client
+
+    dashboards = await asyncio.gather(*(connect_dashboard(i) for i in range(clients)))
+    load = asyncio.gather(*(run_agent(i) for i in range(agents)))
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        sampler.sample()
+        await asyncio.sleep(1)
+    # Frames still draining while clients disconnect would inflate the rates
+    measuring = False
+    agent_clients = await load
+
+    for client in list(dashboards) + list(agent_clients):
+        if client.connected:
+            await client.disconnect()
+
+    delivered = [count for count in frames]
+    return {
+        'clients': clients,
+        'connect_failures': failures,
+        'connect_p50_ms': round(percentile(connect_times, 0.5) * 1000, 1),
+        'connect_p95_ms': round(percentile(connect_times, 0.95) * 1000, 1),
+        'frames_per_client': round(statistics.mean(delivered), 1) if delivered else 0,
+        # Device updates that reached dashboards, and how many agents each dashboard saw
+        'updates_per_second': round(sum(updates) / duration, 1),
+        'devices_seen_pct': round(100 * statistics.mean(len(s) for s in seen) / agents, 1) if clients and agents else 0,
+        'latency_p50_ms': round(percentile(latencies, 0.5) * 1000, 1),
+        'latency_p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 1)
+    }
+
+
+def benchmark_mode(mode: str, args, workers: int = 1) -> Dict:
+    """Start one server mode (as `workers` processes on one SQLite backend), load it, and stop it"""
+    ports = [args.port + i for i in range(workers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = ['--backend', f"sqlite:{Path(tmp) / 'state.db'}"] if args.workers else []
+        processes = [subprocess.Popen([sys.executable] + SERVER_SCRIPTS[mode] + ['--port', str(port)] + shared +
+                                      (['--worker-id', f"worker-{i}"] if shared else []),
+                                      cwd=Path(__file__).parent,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                     for i, port in enumerate(ports)]
+        try:
+            for port in ports:
+                if not wait_for_port(port):
+                    raise RuntimeError(f"{mode} server did not start on port {port}")
+            sampler = ProcessSampler([process.pid for process in processes])
+            sampler.sample()
+            result = asyncio.run(run_load([f"http://127.0.0.1:{port}" for port in ports], args.clients,
+                                          args.agents, args.rate, args.duration, sampler))
+            result.update(sampler.summary())
+            result.update({'mode': mode, 'workers': workers})
+            return result
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+
+def main():
+    """Benchmark threading vs asyncio serving modes, optionally across worker counts"""
+    parser = argparse.ArgumentParser(description='Championship server concurrency benchmark')
+    parser.add_argument('--modes', nargs='+', choices=list(SERVER_SCRIPTS), default=list(SERVER_SCRIPTS))
+    parser.add_argument('--clients', type=int, default=200, help='Concurrent dashboard connections')
+    parser.add_argument('--agents', type=int, default=4, help='Simulated agents streaming metrics')
+    parser.add_argument('--rate', type=float, default=2.0, help='Metrics updates per agent per second')
+    parser.add_argument('--duration', type=float, default=20.0, help='Seconds of load per mode')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='Worker counts to compare (e.g. 1 2 4), sharing a SQLite state backend')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--json', type=str, help='Also write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        for workers in args.workers or [1]:
+            print(f"⏱️  Benchmarking {mode} mode x{workers}: {args.clients} dashboards, {args.agents} agents...")
+            results.append(benchmark_mode(mode, args, workers))
+
+    columns = ['mode', 'workers', 'connect_failures', 'connect_p95_ms', 'updates_per_second',
+               'devices_seen_pct', 'latency_p50_ms', 'latency_p99_ms', 'peak_rss_mb', 'peak_threads',
+               'avg_cpu_percent']
+    print()
+    print('  '.join(f"{c:>16}" for c in columns))
+    for result in results:
+        print('  '.join(f"{str(result[c]):>16}" for c in columns))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Broadcast Scheduler for Snapdragon vs Intel Performance Championship
+Coalesces per-device metrics into one dashboard frame per tick
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from sim_clock import Clock, get_clock
+from structured_logging import RateLimitedLogger
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastScheduler:
+    """Latest-value-wins metrics buffer flushed on a fixed tick
+
+    Agents may report far faster than dashboards can draw. Each update only
+    replaces the pending entry for its device, so a tick sends a single frame
+    holding the newest metrics of every device that changed, however many
+    updates arrived in between. Flush hooks (e.g. commentary) run once per
+    frame instead of once per update.
+    """
+
+    def __init__(self, emit_fn: Callable[[str, Dict], None], interval: float = 1.0,
+                 event: str = 'metrics_frame', clock: Optional[Clock] = None):
+        self.emit_fn = emit_fn
+        self.interval = interval
+        self.event = event
+        self.clock = clock or get_clock()
+        self._errors = RateLimitedLogger(logger, clock=self.clock)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._hooks: List[Callable[[Dict], None]] = []
+        self._thread = None
+        self._stats = {
+            'ticks': 0,
+            'frames': 0,
+            'updates': 0,
+            'coalesced': 0,
+            'max_queue_depth': 0,
+            'last_fanout_ms': 0.0,
+            'max_fanout_ms': 0.0,
+            'total_fanout_ms': 0.0
+        }
+
+    def submit(self, device_id: str, payload: Dict):
+        """Queue the latest payload for a device, replacing any unsent one"""
+        with self._lock:
+            if device_id in self._pending:
+                self._stats['coalesced'] += 1
+            self._pending[device_id] = payload
+            self._stats['updates'] += 1
+            self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], len(self._pending))
+
+    def add_hook(self, hook: Callable[[Dict], None]):
+        """Run hook(frame) after every frame is sent"""
+        self._hooks.append(hook)
+
+    def flush(self) -> Optional[Dict]:
+        """Send everything pending as one frame; returns the frame, if any"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._stats['ticks'] += 1
+        if not pending:
+            return None
+
+        frame = {
+            'devices': pending,
+            'timestamp': self.clock.time()
+        }
+        # Fan-out cost is real serialization/socket time, even under time-warp
+        started = time.perf_counter()
+        self.emit_fn(self.event, frame)
+        fanout_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._stats['frames'] += 1
+            self._stats['last_fanout_ms'] = round(fanout_ms, 3)
+            self._stats['max_fanout_ms'] = round(max(self._stats['max_fanout_ms'], fanout_ms), 3)
+            self._stats['total_fanout_ms'] += fanout_ms
+
+        for hook in self._hooks:
+            try:
+                hook(frame)
+            except Exception as e:
+                self._errors.error('hook', f"Broadcast hook failed: {e}")
+        return frame
+
+    def start(self):
+        """Start the tick thread"""
+        if self._thread is None:
+            self._thread = self.clock.start_thread(self._run, name='broadcast-tick')
+
+    def _run(self):
+        while True:
+            self.clock.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                self._errors.error('tick', f"Broadcast tick failed: {e}")
+
+    def stats(self) -> Dict:
+        """Tick counters, current queue depth and fan-out cost"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._pending)
+        frames = stats['frames']
+        stats['avg_fanout_ms'] = round(stats.pop('total_fanout_ms') / frames, 3) if frames else 0.0
+        stats['coalesce_ratio'] = round(stats['updates'] / frames, 2) if frames else 0.0
+        stats['interval'] = self.interval
+        return stats
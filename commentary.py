@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Commentary Engine for Snapdragon vs Intel Performance Championship
+Data-driven commentary rules with hysteresis, cooldowns and deduplication
+"""
+
+import operator
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne
+}
+
+
+def compile_path(path: str) -> Callable[[Dict], Optional[float]]:
+    """Getter for a dotted metrics path such as 'battery.percent'"""
+    keys = tuple(path.split('.'))
+
+    def get(metrics):
+        value = metrics
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        return value
+    return get
+
+
+class Rule:
+    """One compiled rule: fires when `metric op threshold` becomes true
+
+    It re-arms only once the value is back past `clear` (the hysteresis
+    band; defaults to the threshold), so a reading that hovers around the
+    threshold yields one line rather than one per tick.
+    """
+
+    def __init__(self, spec: Dict):
+        self.id = spec['id']
+        if spec.get('op') not in OPERATORS:
+            raise ValueError(f"Commentary rule {self.id}: unknown operator {spec.get('op')!r}")
+        self.platform = spec.get('platform')
+        self.metric = spec['metric']
+        self.get = compile_path(self.metric)
+        self.compare = OPERATORS[spec['op']]
+        self.threshold = spec['threshold']
+        self.clear = spec.get('clear', self.threshold)
+        self.cooldown = spec.get('cooldown', 0)
+        self.text = spec['text']
+        self.last_fired: Optional[float] = None
+
+
+class CommentaryEngine:
+    """Evaluates rules against each coalesced metrics frame and keeps the feed
+
+    Rules are compiled once into a per-platform table, so a device only
+    sees the rules for its platform (plus platform-less ones). A line is
+    suppressed while its rule is cooling down, or if the same text was
+    said within `dedup_window` seconds (e.g. two identical devices).
+    """
+
+    def __init__(self, rules: List[Dict], feed_size: int = 20, dedup_window: float = 60.0):
+        self.rules = [Rule(spec) for spec in rules]
+        self.dedup_window = dedup_window
+        self.feed: deque = deque(maxlen=feed_size)
+        self._table: Dict[Optional[str], List[Rule]] = {}
+        for rule in self.rules:
+            self._table.setdefault(rule.platform, []).append(rule)
+        self._by_platform: Dict[str, List[Rule]] = {}
+        self._active: Dict[Tuple[str, str], bool] = {}
+        self._recent: Dict[str, float] = {}
+        self.stats = {'fired': 0, 'cooldown': 0, 'duplicate': 0}
+
+    def rules_for(self, platform: str) -> List[Rule]:
+        rules = self._by_platform.get(platform)
+        if rules is None:
+            rules = self._by_platform[platform] = self._table.get(platform, []) + self._table.get(None, [])
+        return rules
+
+    def evaluate(self, updates: Iterable[Dict], now: float) -> List[Dict]:
+        """New feed entries for a frame's device updates ({'device', 'device_id', 'metrics'})"""
+        entries = []
+        for update in updates:
+            metrics = update.get('metrics') or {}
+            for rule in self.rules_for(update['device']):
+                value = rule.get(metrics)
+                if value is None:
+                    continue
+                key = (rule.id, update['device_id'])
+                if self._active.get(key):
+                    if not rule.compare(value, rule.clear):
+                        self._active[key] = False
+                    continue
+                if not rule.compare(value, rule.threshold):
+                    continue
+
+                # Held back by the cooldown: stays armed and fires once it ends
+                if rule.last_fired is not None and now - rule.last_fired < rule.cooldown:
+                    self.stats['cooldown'] += 1
+                    continue
+                self._active[key] = True
+                text = rule.text.format(value=round(value, 1), device_id=update['device_id'])
+                said = self._recent.get(text)
+                if said is not None and now - said < self.dedup_window:
+                    self.stats['duplicate'] += 1
+                    continue
+
+                rule.last_fired = now
+                self._recent[text] = now
+                self.stats['fired'] += 1
+                entry = {
+                    'text': text,
+                    'rule': rule.id,
+                    'device_id': update['device_id'],
+                    'timestamp': datetime.fromtimestamp(now).isoformat(),
+                    'type': 'auto'
+                }
+                self.feed.append(entry)
+                entries.append(entry)
+
+        if len(self._recent) > 4 * (self.feed.maxlen or 20):
+            self._recent = {text: t for text, t in self._recent.items() if now - t < self.dedup_window}
+        return entries
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Configuration Loader for Snapdragon vs Intel Performance Championship
+Lazily loaded, schema-validated config.json with safe hot reloads
+"""
+
+import os
+import copy
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sim_clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+# config.json next to this module, not in whatever directory we were started from
+DEFAULT_PATH = Path(os.environ.get('CHAMPIONSHIP_CONFIG', Path(__file__).parent / 'config.json'))
+
+NUMBER = (int, float)
+
+# Sections that running processes read at use time, so changing them is safe
+# without a restart. Everything else (network, devices, storage...) is not.
+RELOADABLE = ('demo_scenarios', 'demo_phases', 'ui.chart_update_rate', 'simulation.update_interval',
+              'commentary', 'tournament', 'race', 'scoring')
+
+
+class ConfigError(ValueError):
+    """config.json is missing, unparseable or fails validation"""
+
+
+class Field:
+    """Schema for one config value
+
+    `fields` describes the keys of a dict value, `each` the schema every
+    value of a dict (keyed by name) or item of a list must match.
+    """
+
+    def __init__(self, kind, required: bool = True, positive: bool = False,
+                 choices: Optional[Sequence] = None, fields: Optional[Dict] = None,
+                 each: Optional[Dict] = None):
+        self.kind = kind
+        self.required = required
+        self.positive = positive
+        self.choices = choices
+        self.fields = fields
+        self.each = each
+
+
+def Section(required: bool = True, **fields) -> Field:
+    return Field(dict, required=required, fields=fields)
+
+
+SCHEMA = Section(
+    network=Section(server_ip=Field(str), server_port=Field(int, positive=True)),
+    devices=Field(dict, each={'battery_capacity_wh': Field(NUMBER, required=False, positive=True),
+                              'ai_tops': Field(NUMBER, required=False, positive=True)}),
+    simulation=Section(update_interval=Field(NUMBER, positive=True),
+                       workload_profiles=Field(dict, each={'cpu_multiplier': Field(NUMBER),
+                                                           'temp_increase': Field(NUMBER)})),
+    ui=Section(chart_update_rate=Field(NUMBER, positive=True)),
+    demo_scenarios=Field(dict, each={'duration': Field(NUMBER, positive=True)}),
+    demo_phases=Field(list, each={'name': Field(str), 'duration': Field(NUMBER, positive=True),
+                                  'scenario': Field(str, required=False)}),
+    liveness=Section(required=False, heartbeat_timeout=Field(NUMBER, required=False, positive=True)),
+    race=Section(required=False, timeout_grace=Field(NUMBER, required=False)),
+    scoring=Section(required=False, confidence=Field(NUMBER, required=False, positive=True),
+                    resamples=Field(int, required=False, positive=True),
+                    min_runs=Field(int, required=False, positive=True)),
+    state_backend=Section(required=False, type=Field(str, required=False, choices=('memory', 'sqlite'))),
+    commentary=Section(required=False,
+                       feed_size=Field(int, required=False, positive=True),
+                       dedup_window=Field(NUMBER, required=False),
+                       rules=Field(list, required=False,
+                                   each={'id': Field(str), 'metric': Field(str),
+                                         'op': Field(str, choices=('>', '>=', '<', '<=', '==', '!=')),
+                                         'threshold': Field(NUMBER), 'text': Field(str),
+                                         'cooldown': Field(NUMBER, required=False)})),
+    tournament=Section(required=False, warmup_timeout=Field(NUMBER, required=False, positive=True),
+                       cooldown_timeout=Field(NUMBER, required=False, positive=True),
+                       poll_interval=Field(NUMBER, required=False, positive=True)),
+    startup=Section(required=False, budget=Field(dict, required=False)),
+    logging=Section(required=False,
+                    level=Field(str, required=False, choices=('DEBUG', 'INFO', 'WARNING', 'ERROR')),
+                    max_bytes=Field(int, required=False, positive=True),
+                    backup_count=Field(int, required=False),
+                    queue_size=Field(int, required=False, positive=True),
+                    debug_sample_every=Field(int, required=False, positive=True),
+                    error_interval=Field(NUMBER, required=False),
+                    levels=Field(dict, required=False))
+)
+
+
+def _type_name(kind) -> str:
+    if kind is NUMBER:
+        return 'a number'
+    return {dict: 'an object', list: 'a list', str: 'a string', int: 'an integer',
+            bool: 'true/false'}.get(kind, kind.__name__)
+
+
+def _check(value, field: Field, path: str, errors: List[str]):
+    # bool is an int subclass, but "duration": true is a mistake, not a 1
+    if isinstance(value, bool) != (field.kind is bool) or not isinstance(value, field.kind):
+        errors.append(f"{path} must be {_type_name(field.kind)} (got {json.dumps(value)})")
+        return
+    if field.positive and value <= 0:
+        errors.append(f"{path} must be greater than 0 (got {json.dumps(value)})")
+    if field.choices is not None and value not in field.choices:
+        errors.append(f"{path} must be one of {', '.join(map(str, field.choices))} (got {json.dumps(value)})")
+
+    if field.fields:
+        for key, child in field.fields.items():
+            child_path = f"{path}.{key}" if path else key
+            if key in value:
+                _check(value[key], child, child_path, errors)
+            elif child.required:
+                errors.append(f"{child_path} is required")
+    if field.each:
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, item in items:
+            item_path = f"{path}[{key}]" if isinstance(key, int) else f"{path}.{key}"
+            _check(item, Field(dict, fields=field.each), item_path, errors)
+
+
+def validate(config: Dict, path: str = 'config.json') -> Dict:
+    """Raise ConfigError listing every problem, or return config unchanged"""
+    errors: List[str] = []
+    _check(config, SCHEMA, '', errors)
+    if errors:
+        raise ConfigError(f"{path} is invalid:\n  " + '\n  '.join(errors))
+    return config
+
+
+def load_config(path: Optional[Path] = None) -> Dict:
+    """Read, parse and validate a config file (uncached)"""
+    path = Path(path or DEFAULT_PATH)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        raise ConfigError(f"{path} not found")
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{path} is not valid JSON: line {e.lineno} column {e.colno}: {e.msg}")
+    return validate(config, str(path))
+
+
+_cache: Dict[Path, Dict] = {}
+_cache_lock = threading.Lock()
+
+
+def get_config(path: Optional[Path] = None) -> Dict:
+    """The config for path, loaded on first use and shared by every caller
+
+    Hot reloads update this same dict in place, so modules that keep a
+    reference see reloadable changes without re-reading the file.
+    """
+    path = Path(path or DEFAULT_PATH).resolve()
+    with _cache_lock:
+        config = _cache.get(path)
+        if config is None:
+            config = _cache[path] = load_config(path)
+        return config
+
+
+def _lookup(config: Dict, dotted: str):
+    value = config
+    for key in dotted.split('.'):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _assign(config: Dict, dotted: str, value):
+    *parents, last = dotted.split('.')
+    for key in parents:
+        config = config.setdefault(key, {})
+    if value is None:
+        config.pop(last, None)
+    else:
+        config[last] = value
+
+
+def _without(config: Dict, paths: Sequence[str]) -> Dict:
+    stripped = copy.deepcopy(config)
+    for dotted in paths:
+        _assign(stripped, dotted, None)
+    return stripped
+
+
+def apply_reload(live: Dict, fresh: Dict) -> Tuple[List[str], List[str]]:
+    """Copy reloadable changes from fresh into live; returns (applied, needing a restart)"""
+    applied = []
+    for dotted in RELOADABLE:
+        value = _lookup(fresh, dotted)
+        if value != _lookup(live, dotted):
+            _assign(live, dotted, copy.deepcopy(value))
+            applied.append(dotted)
+
+    old, new = _without(live, RELOADABLE), _without(fresh, RELOADABLE)
+    restart = sorted(key for key in set(old) | set(new) if old.get(key) != new.get(key))
+    return applied, restart
+
+
+class ConfigWatcher:
+    """Polls the config file's mtime and hot-reloads safe changes
+
+    mtime polling rather than inotify: it works the same on the Windows
+    demo laptops, and a check every few seconds costs one stat() call. A
+    file that fails to parse or validate is logged and ignored, leaving the
+    running config untouched.
+    """
+
+    def __init__(self, path: Optional[Path] = None, interval: float = 2.0,
+                 clock: Optional[Clock] = None):
+        self.path = Path(path or DEFAULT_PATH).resolve()
+        self.config = get_config(self.path)
+        self.interval = interval
+        self.clock = clock or get_clock()
+        self._mtime = self._stat()
+        self._listeners: List[Callable[[List[str]], None]] = []
+        self._thread = None
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def on_reload(self, callback: Callable[[List[str]], None]):
+        """Call callback(applied paths) after each reload that changed something"""
+        self._listeners.append(callback)
+
+    def check(self) -> List[str]:
+        """Reload if the file changed; returns the reloadable paths that were applied"""
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return []
+        self._mtime = mtime
+        try:
+            fresh = load_config(self.path)
+        except ConfigError as e:
+            logger.error(f"Ignoring config change: {e}")
+            return []
+
+        applied, restart = apply_reload(self.config, fresh)
+        if restart:
+            logger.warning(f"Config sections {', '.join(restart)} changed; restart to apply them")
+        if applied:
+            logger.info(f"Hot-reloaded config: {', '.join(applied)}")
+            for callback in self._listeners:
+                try:
+                    callback(applied)
+                except Exception as e:
+                    logger.error(f"Config reload listener failed: {e}")
+        return applied
+
+    def start(self):
+        if self._thread is None:
+            self._thread = self.clock.start_thread(self._run, name='config-watcher')
+        return self
+
+    def _run(self):
+        while True:
+            self.clock.sleep(self.interval)
+            self.check()
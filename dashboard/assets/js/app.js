@@ -12,6 +12,11 @@ let currentTest = null;
 let professionalMode = false;
 let performanceChart = null;
 
+// Last broadcast applied, so a reconnect only fetches what was missed
+let lastSeq = null;
+let serverEpoch = null;
+const broadcastHandlers = {};
+
 // Loading messages for entertainment
 const LOADING_MESSAGES = [
     "Initializing quantum advantage...",
@@ -81,7 +86,9 @@ function hideLoadingScreen() {
 function initializeSocket() {
     // Connect to server
     socket = io('http://localhost:5000', {
-        transports: ['websocket', 'polling']
+        transports: ['websocket', 'polling'],
+        // Re-evaluated on every reconnect
+        auth: (cb) => cb({ role: 'dashboard', last_seq: lastSeq, epoch: serverEpoch })
     });
     
     // Connection event handlers
@@ -90,6 +97,34 @@ function initializeSocket() {
         addCommentary('SYSTEM', 'Connected to Championship Server');
     });
     
+    // Full state: first connection, a server restart, or too long away to replay
+    socket.on('server_status', (data) => {
+        serverEpoch = data.epoch;
+        lastSeq = data.seq;
+        applyPlatformSummary(data.platforms);
+        currentTest = data.demo_state && data.demo_state.active ? data.demo_state.current_test : null;
+        disableScenarioButtons(currentTest !== null);
+        
+        // Fill the chart with the history we missed
+        if (window.chartUtils) {
+            window.chartUtils.backfillPerformanceChart(performanceChart);
+        }
+    });
+    
+    // Short reconnect: just the broadcasts sent while we were away
+    socket.on('replay', (data) => {
+        serverEpoch = data.epoch;
+        console.log(`Replaying ${data.events.length} missed events`);
+        // Device cards were greyed out on disconnect; restore them first
+        applyPlatformSummary(data.platforms);
+        data.events.forEach(([event, payload]) => applyBroadcast(event, payload));
+    });
+    
+    // Only sent to the dashboard that asked for the demo
+    socket.on('demo_rejected', (data) => {
+        addCommentary('SYSTEM', `Demo not started - ${data.reason}`);
+    });
+    
     socket.on('disconnect', () => {
         console.log('❌ Disconnected from Championship Server');
         addCommentary('SYSTEM', 'Disconnected from Championship Server');
@@ -98,32 +133,34 @@ function initializeSocket() {
     });
     
     // Device status updates
-    socket.on('device_status', (data) => {
+    onBroadcast('device_status', (data) => {
         console.log('Device status update:', data);
         updateDeviceStatus(data.device, data.status === 'connected');
     });
     
-    // Metrics updates
-    socket.on('metrics_broadcast', (data) => {
-        updateDeviceMetrics(data.device, data.metrics);
+    // Metrics updates (one coalesced frame per server tick)
+    onBroadcast('metrics_frame', (frame) => {
+        Object.values(frame.devices).forEach((data) => {
+            updateDeviceMetrics(data.device, data.metrics);
+        });
     });
     
     // Demo events
-    socket.on('demo_started', (data) => {
+    onBroadcast('demo_started', (data) => {
         console.log('Demo started:', data);
         currentTest = data.scenario;
         addCommentary('DEMO', `Starting ${data.scenario} test - ${data.loading_message}`);
         disableScenarioButtons(true);
     });
     
-    socket.on('demo_stopped', (data) => {
+    onBroadcast('demo_stopped', (data) => {
         console.log('Demo stopped');
         currentTest = null;
         disableScenarioButtons(false);
     });
     
     // Test progress updates
-    socket.on('test_progress', (data) => {
+    onBroadcast('test_progress', (data) => {
         console.log('Test progress:', data);
         if (data.progress % 25 === 0) {
             addCommentary(data.device_type.toUpperCase(), 
@@ -131,19 +168,60 @@ function initializeSocket() {
         }
     });
     
+    // Sustained generation per-image latency
+    onBroadcast('image_generated', (data) => {
+        addCommentary(data.device.toUpperCase(),
+            `Image #${data.image} in ${data.latency}s (${data.elapsed}s elapsed)`);
+    });
+    
     // Commentary updates
-    socket.on('commentary_update', (data) => {
+    onBroadcast('commentary_update', (data) => {
         addCommentary(data.type || 'AUTO', data.text);
     });
     
+    // Tournament progress (phases run back to back on the server)
+    onBroadcast('tournament_update', (data) => {
+        const phase = data.phase ? ` - ${data.phase}` : '';
+        addCommentary('TOURNAMENT', `${data.state.replace('_', ' ').toUpperCase()}${phase}`);
+        if (data.standings && (data.state === 'done' || data.state === 'stopped')) {
+            const standings = Object.entries(data.standings).map(([device, wins]) => `${device}: ${wins}`).join(', ');
+            addCommentary('TOURNAMENT', `Final standings - ${standings || 'no winners'}`);
+        }
+        disableScenarioButtons(!['done', 'stopped'].includes(data.state));
+    });
+    
     // Winner declaration
-    socket.on('winner_declared', (data) => {
+    onBroadcast('winner_declared', (data) => {
         console.log('Winner declared:', data);
         showVictoryModal(data.winner, data.message);
         disableScenarioButtons(false);
     });
 }
 
+// Register a handler for a sequenced dashboard broadcast
+function onBroadcast(event, handler) {
+    broadcastHandlers[event] = handler;
+    socket.on(event, (data) => applyBroadcast(event, data));
+}
+
+// Apply a broadcast once, whether it arrived live or in a replay
+function applyBroadcast(event, data) {
+    if (data && typeof data.seq === 'number') {
+        if (lastSeq !== null && data.seq <= lastSeq) return;
+        lastSeq = data.seq;
+    }
+    if (broadcastHandlers[event]) {
+        broadcastHandlers[event](data);
+    }
+}
+
+// Device card status from the server's per-platform summary
+function applyPlatformSummary(platforms) {
+    Object.entries(platforms || {}).forEach(([platform, summary]) => {
+        updateDeviceStatus(platform, summary.connected > 0);
+    });
+}
+
 // Initialize UI event handlers
 function initializeUIHandlers() {
     // Professional mode toggle
@@ -168,6 +246,15 @@ function initializeUIHandlers() {
             startDemo(scenario);
         });
     });
+    
+    // Every demo phase, back to back
+    document.getElementById('btnTournament').addEventListener('click', () => {
+        if (!connectedDevices.snapdragon || !connectedDevices.intel) {
+            alert('Both devices must be connected to start a tournament!');
+            return;
+        }
+        socket.emit('start_tournament');
+    });
 }
 
 // Update device connection status
@@ -330,6 +417,9 @@ function startDemo(scenario) {
         case 'ai_showdown':
             message = 'AI Performance Showdown initiated! 45 TOPS vs 11 TOPS - The math is clear, but let\'s watch anyway...';
             break;
+        case 'sustained_generation':
+            message = 'Sustained Generation marathon started! Anyone can sprint - let\'s see who keeps the pace...';
+            break;
         case 'battery_race':
             message = 'Battery Efficiency Race started! Place your bets on who reaches for the charger first...';
             break;
@@ -342,7 +432,7 @@ function startDemo(scenario) {
 
 // Disable/enable scenario buttons
 function disableScenarioButtons(disabled) {
-    document.querySelectorAll('.btn-scenario').forEach(btn => {
+    document.querySelectorAll('.btn-scenario, .btn-tournament').forEach(btn => {
         btn.disabled = disabled;
         if (disabled) {
             btn.style.opacity = '0.5';
@@ -251,8 +251,48 @@ function initializeScoreChart() {
     });
 }
 
+// Backfill the live CPU chart from server-side history so late joiners see the race so far
+function backfillPerformanceChart(chart, windowSeconds = 120) {
+    if (!chart) return Promise.resolve();
+    
+    const params = new URLSearchParams({
+        metric: 'cpu.percent',
+        window: windowSeconds,
+        max_points: chartConfig.maxDataPoints
+    });
+    
+    return fetch(`/api/history?${params}`)
+        .then(response => response.json())
+        .then(history => {
+            const byPlatform = {};
+            Object.entries(history.series).forEach(([deviceId, metrics]) => {
+                const platform = history.platforms[deviceId];
+                const points = metrics['cpu.percent'] || [];
+                // One dataset per platform: keep its longest-running device
+                if (platform && (!byPlatform[platform] || points.length > byPlatform[platform].length)) {
+                    byPlatform[platform] = points;
+                }
+            });
+            
+            const longest = Object.values(byPlatform).reduce((a, b) => (b.length > a.length ? b : a), []);
+            if (longest.length === 0) return;
+            
+            chart.data.labels = longest.map(([t]) => new Date(t * 1000).toLocaleTimeString('en-US', {
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit'
+            }));
+            ['snapdragon', 'intel'].forEach((platform, index) => {
+                chart.data.datasets[index].data = (byPlatform[platform] || []).map(([, , , avg]) => avg);
+            });
+            chart.update('none');
+        })
+        .catch(error => console.warn('History backfill failed:', error));
+}
+
 // Export functions
 window.chartUtils = {
     initializeAdvancedCharts,
+    backfillPerformanceChart,
     chartConfig
 };
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Device Registry for Snapdragon vs Intel Performance Championship
+Tracks any number of agents by device id and Socket.IO session
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+
+class DeviceRegistry:
+    """Per-device state with O(1) lookup by device id or Socket.IO sid
+
+    Devices are grouped by platform ('snapdragon', 'intel', ...) so multi-unit
+    booths and fleet comparisons can aggregate without scanning every device.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._devices: Dict[str, Dict] = {}
+        self._by_sid: Dict[str, str] = {}
+        self._by_platform: Dict[str, set] = {}
+
+    def register(self, sid: str, platform: str, device_id: Optional[str] = None,
+                 hostname: Optional[str] = None, now: Optional[str] = None) -> Dict:
+        """Register (or re-register) a device for a session"""
+        device_id = device_id or f"{platform}-{sid[:8]}"
+        with self._lock:
+            device = self._devices.get(device_id)
+            if device is None:
+                device = {
+                    'device_id': device_id,
+                    'platform': platform,
+                    'metrics': {}
+                }
+                self._devices[device_id] = device
+                self._by_platform.setdefault(platform, set()).add(device_id)
+
+            # A reconnect replaces the old session for the same device
+            if device.get('sid') and self._by_sid.get(device['sid']) == device_id:
+                del self._by_sid[device['sid']]
+            device.update({
+                'sid': sid,
+                'hostname': hostname,
+                'connected': True,
+                'last_seen': now,
+                'worker': None
+            })
+            self._by_sid[sid] = device_id
+            return device
+
+    def mirror(self, record: Dict, worker: str) -> Optional[Dict]:
+        """Apply a device's state as published by the server worker holding its session
+
+        Mirrored devices have no local sid. A disconnect only applies when it
+        comes from the worker the device was last seen on, so a late report
+        from a previous worker can't mark a device that moved as offline.
+        """
+        device_id = record['device_id']
+        with self._lock:
+            device = self._devices.get(device_id)
+            if device is None:
+                device = {
+                    'device_id': device_id,
+                    'platform': record['platform'],
+                    'metrics': {}
+                }
+                self._devices[device_id] = device
+                self._by_platform.setdefault(record['platform'], set()).add(device_id)
+            elif device['connected'] and not record.get('connected') and device.get('worker') != worker:
+                return None
+
+            if device.get('sid') and self._by_sid.get(device['sid']) == device_id:
+                del self._by_sid[device['sid']]
+            device.update(record)
+            device.update({'sid': None, 'worker': worker})
+            return device
+
+    def get(self, device_id: str) -> Optional[Dict]:
+        return self._devices.get(device_id)
+
+    def get_by_sid(self, sid: str) -> Optional[Dict]:
+        device_id = self._by_sid.get(sid)
+        return self._devices.get(device_id) if device_id else None
+
+    def touch(self, device: Dict, now: str, metrics: Optional[Dict] = None):
+        """Record a heartbeat (and optionally fresh metrics) for a device"""
+        device['last_seen'] = now
+        if metrics is not None:
+            device['metrics'] = metrics
+
+    def set_connected(self, device: Dict, connected: bool):
+        """Flip liveness without dropping the session (missed or resumed heartbeats)"""
+        with self._lock:
+            device['connected'] = connected
+
+    def mark_disconnected(self, device: Dict):
+        with self._lock:
+            device['connected'] = False
+            if self._by_sid.get(device.get('sid')) == device['device_id']:
+                del self._by_sid[device['sid']]
+
+    def disconnect_sid(self, sid: str) -> Optional[Dict]:
+        """Mark the device behind a closed session as disconnected"""
+        with self._lock:
+            device = self.get_by_sid(sid)
+            if device:
+                self.mark_disconnected(device)
+            return device
+
+    def devices(self) -> List[Dict]:
+        with self._lock:
+            return list(self._devices.values())
+
+    def connected(self, platform: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            ids = self._by_platform.get(platform, set()) if platform else self._devices.keys()
+            return [self._devices[i] for i in ids if self._devices[i]['connected']]
+
+    def platforms(self) -> List[str]:
+        return sorted(self._by_platform)
+
+    def platform_summary(self) -> Dict[str, Dict]:
+        """Aggregate connected-device counts and mean metrics per platform"""
+        summary = {}
+        with self._lock:
+            for platform, ids in self._by_platform.items():
+                devices = [self._devices[i] for i in ids]
+                live = [d for d in devices if d['connected']]
+                summary[platform] = {
+                    'devices': len(devices),
+                    'connected': len(live),
+                    'cpu': _mean(d['metrics'].get('cpu', {}).get('percent') for d in live),
+                    'temperature': _mean(d['metrics'].get('temperature') for d in live),
+                    'battery': _mean(d['metrics'].get('battery', {}).get('percent') for d in live)
+                }
+        return summary
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """JSON-safe copy of every device, keyed by device id"""
+        with self._lock:
+            return {device_id: {k: v for k, v in device.items() if k != 'sid'}
+                    for device_id, device in self._devices.items()}
+
+
+def _mean(values) -> Optional[float]:
+    values = [v for v in values if isinstance(v, (int, float))]
+    return round(sum(values) / len(values), 1) if values else None
@@ -11,20 +11,13 @@ import time
 import queue
 from pathlib import Path
 from typing import Optional
-import sys
-import os
 
-# Import PIL for image handling
-try:
-    from PIL import Image, ImageTk, ImageDraw
-except ImportError:
-    print("Installing Pillow...")
-    os.system(f"{sys.executable} -m pip install Pillow")
-    from PIL import Image, ImageTk, ImageDraw
+# Import PIL for image handling (Pillow is in requirements.txt)
+from PIL import Image, ImageTk, ImageDraw
 
 # Import SD generator
 from sd_generator import StableDiffusionGenerator
-from platform_detector import PlatformDetector
+from platform_detector import detect_platform_type
 
 class ImageGenerationWindow:
     def __init__(self, platform_type: str = 'auto'):
@@ -37,8 +30,7 @@ class ImageGenerationWindow:
         
         # Auto-detect platform if needed
         if self.platform_type == 'auto':
-            detector = PlatformDetector()
-            self.platform_type = detector.platform_info.get('platform_type', 'intel')
+            self.platform_type = detect_platform_type()
         
         # Platform-specific colors
         if self.platform_type == 'snapdragon':
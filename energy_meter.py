@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Energy Accounting for Snapdragon vs Intel Performance Championship
+Samples battery power at high frequency and integrates joules over test windows
+"""
+
+import os
+import glob
+import random
+import logging
+import platform
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from sim_clock import Clock, get_clock
+from startup_profile import lazy_import, module_available
+
+# Windows-specific imports, deferred until a WMI source is opened (the COM
+# import is slow and this module is on the agent's start-up path)
+WINDOWS_WMI_AVAILABLE = platform.system() == 'Windows' and \
+    module_available('wmi') and module_available('pythoncom')
+wmi = lazy_import('wmi')
+pythoncom = lazy_import('pythoncom')
+
+logger = logging.getLogger(__name__)
+
+SYSFS_POWER_SUPPLY = '/sys/class/power_supply'
+DEFAULT_CAPACITY_WH = 60.0
+
+
+def integrate_trapezoid(samples: List[Tuple[float, float]]) -> float:
+    """Integrate (timestamp, watts) samples into joules using the trapezoidal rule"""
+    joules = 0.0
+    for (t0, w0), (t1, w1) in zip(samples, samples[1:]):
+        joules += (w0 + w1) * (t1 - t0) / 2
+    return joules
+
+
+def integration_error_bound(samples: List[Tuple[float, float]]) -> float:
+    """Half the left/right Riemann sum spread, taken per interval so swings don't cancel"""
+    spread = sum(abs(w1 - w0) * (t1 - t0) for (t0, w0), (t1, w1) in zip(samples, samples[1:]))
+    return spread / 2
+
+
+class PowerSource:
+    """Base class for battery power readers
+
+    Sources of kind 'power' return instantaneous watts from read(); sources of
+    kind 'percent' return the battery charge percentage instead.
+    """
+    name = 'none'
+    kind = 'power'
+
+    def open(self):
+        """Acquire resources on the sampling thread"""
+
+    def close(self):
+        """Release resources on the sampling thread"""
+
+    def read(self) -> Optional[float]:
+        raise NotImplementedError
+
+    def is_charging(self) -> bool:
+        return False
+
+    def capacity_wh(self) -> Optional[float]:
+        """Design capacity reported by the hardware, if known"""
+        return None
+
+
+class SysfsPowerSource(PowerSource):
+    """Linux battery power from /sys/class/power_supply (power_now or current_now x voltage_now)"""
+    name = 'sysfs'
+
+    def __init__(self, battery_dir: str):
+        self.battery_dir = battery_dir
+
+    def _read_value(self, attribute: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.battery_dir, attribute), 'r') as f:
+                return f.read().strip()
+        except (OSError, ValueError):
+            return None
+
+    def _read_int(self, attribute: str) -> Optional[int]:
+        value = self._read_value(attribute)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def read(self) -> Optional[float]:
+        # Values are reported in micro-units; some drivers sign them by direction
+        power = self._read_int('power_now')
+        if power is not None:
+            return abs(power) / 1e6
+        current = self._read_int('current_now')
+        voltage = self._read_int('voltage_now')
+        if current is not None and voltage is not None:
+            return abs(current) * voltage / 1e12
+        return None
+
+    def is_charging(self) -> bool:
+        return self._read_value('status') == 'Charging'
+
+    def capacity_wh(self) -> Optional[float]:
+        energy = self._read_int('energy_full_design')
+        if energy:
+            return energy / 1e6
+        charge = self._read_int('charge_full_design')
+        voltage = self._read_int('voltage_min_design')
+        if charge and voltage:
+            return charge * voltage / 1e12
+        return None
+
+    @classmethod
+    def find(cls) -> Optional['SysfsPowerSource']:
+        """Return a source for the first battery exposing power readings"""
+        for battery_dir in sorted(glob.glob(os.path.join(SYSFS_POWER_SUPPLY, '*'))):
+            source = cls(battery_dir)
+            if source._read_value('type') != 'Battery':
+                continue
+            if source.read() is not None:
+                return source
+        return None
+
+
+class WmiPowerSource(PowerSource):
+    """Windows battery discharge rate from the root\\wmi BatteryStatus class"""
+    name = 'wmi'
+
+    def __init__(self):
+        self._wmi = None
+
+    def open(self):
+        pythoncom.CoInitialize()
+        self._wmi = wmi.WMI(namespace="root\\wmi")
+
+    def close(self):
+        self._wmi = None
+        pythoncom.CoUninitialize()
+
+    def _status(self):
+        status = self._wmi.BatteryStatus() if self._wmi else None
+        return status[0] if status else None
+
+    def read(self) -> Optional[float]:
+        status = self._status()
+        if status is None or status.DischargeRate is None:
+            return None
+        # DischargeRate is reported in milliwatts
+        return status.DischargeRate / 1000.0
+
+    def is_charging(self) -> bool:
+        status = self._status()
+        return bool(status and status.Charging)
+
+    @classmethod
+    def find(cls) -> Optional['WmiPowerSource']:
+        if not WINDOWS_WMI_AVAILABLE:
+            return None
+        source = cls()
+        try:
+            source.open()
+            if source.read() is not None:
+                return source
+        except Exception as e:
+            logger.debug(f"WMI battery power not available: {e}")
+        finally:
+            source.close()
+        return None
+
+
+class BatteryPercentSource(PowerSource):
+    """Coarse fallback using psutil battery percentage"""
+    name = 'psutil_percent'
+    kind = 'percent'
+
+    def read(self) -> Optional[float]:
+        battery = psutil.sensors_battery()
+        return float(battery.percent) if battery else None
+
+    def is_charging(self) -> bool:
+        battery = psutil.sensors_battery()
+        return bool(battery and battery.power_plugged)
+
+    @classmethod
+    def find(cls) -> Optional['BatteryPercentSource']:
+        return cls() if psutil.sensors_battery() else None
+
+
+class SimulatedPowerSource(PowerSource):
+    """Power model for machines without a battery, driven by the agent's load"""
+    name = 'simulated'
+
+    def __init__(self, idle_watts: float, load_watts: float, load_fn: Callable[[], float]):
+        self.idle_watts = idle_watts
+        self.load_watts = load_watts
+        self.load_fn = load_fn
+
+    def read(self) -> Optional[float]:
+        load = min(max(self.load_fn(), 0.0), 1.0)
+        watts = self.idle_watts + (self.load_watts - self.idle_watts) * load
+        return watts * random.uniform(0.97, 1.03)
+
+
+def detect_power_source(device_config: Dict, load_fn: Callable[[], float]) -> PowerSource:
+    """Pick the most precise power source available on this machine"""
+    if platform.system() == 'Linux':
+        source = SysfsPowerSource.find()
+        if source:
+            return source
+    elif platform.system() == 'Windows':
+        source = WmiPowerSource.find()
+        if source:
+            return source
+
+    source = BatteryPercentSource.find()
+    if source:
+        return source
+
+    profile = device_config.get('power_profile', {})
+    return SimulatedPowerSource(profile.get('idle_watts', 5.0),
+                                profile.get('load_watts', 20.0),
+                                load_fn)
+
+
+class EnergyMeter:
+    """Samples a power source on a background thread and integrates energy per window"""
+
+    def __init__(self, source: PowerSource, sample_interval: float = 0.1,
+                 capacity_wh: Optional[float] = None, clock: Optional[Clock] = None):
+        self.source = source
+        self.clock = clock or get_clock()
+        self.sample_interval = sample_interval
+        self.capacity_wh = source.capacity_wh() or capacity_wh or DEFAULT_CAPACITY_WH
+        self.samples: List[Tuple[float, float]] = []
+        self.charging = False
+        self._stop_event = self.clock.event()
+        self._thread = None
+
+    def start(self):
+        """Open a new measurement window"""
+        self.samples = []
+        self.charging = False
+        self._stop_event.clear()
+        self._thread = self.clock.start_thread(self._sample_loop)
+
+    def stop(self, images: int = 0) -> Dict:
+        """Close the measurement window and return its energy report"""
+        self._stop_event.set()
+        if self._thread:
+            self.clock.join(self._thread)
+            self._thread = None
+        return self.report(images)
+
+    def _take_sample(self):
+        try:
+            value = self.source.read()
+            if self.source.is_charging():
+                self.charging = True
+        except Exception as e:
+            logger.debug(f"Power sample failed: {e}")
+            return
+        if value is not None:
+            self.samples.append((self.clock.monotonic(), value))
+
+    def _sample_loop(self):
+        self.source.open()
+        try:
+            while True:
+                self._take_sample()
+                if self._stop_event.wait(self.sample_interval):
+                    self._take_sample()
+                    break
+        finally:
+            self.source.close()
+
+    def report(self, images: int = 0) -> Dict:
+        """Summarize the current window as joules, average watts and error bounds"""
+        samples = self.samples
+        duration = samples[-1][0] - samples[0][0] if len(samples) > 1 else 0.0
+        capacity_j = self.capacity_wh * 3600
+
+        if self.source.kind == 'percent':
+            # Only whole-window percentage deltas are trustworthy; each reading is
+            # quantized, so the delta is uncertain by one resolution step
+            readings = [value for _, value in samples]
+            resolution = 1.0 if all(float(p).is_integer() for p in readings) else 0.1
+            drop = readings[0] - readings[-1] if readings else 0.0
+            joules = max(drop, 0.0) / 100 * capacity_j
+            error = resolution / 100 * capacity_j
+            method = 'percent_delta'
+        else:
+            joules = integrate_trapezoid(samples)
+            error = integration_error_bound(samples)
+            method = 'trapezoid'
+
+        report = {
+            'joules': round(joules, 2),
+            'error_joules': round(error, 2),
+            'avg_watts': round(joules / duration, 2) if duration else 0.0,
+            'error_watts': round(error / duration, 2) if duration else None,
+            'duration': round(duration, 2),
+            'samples': len(samples),
+            'source': self.source.name,
+            'method': method,
+            'charging': self.charging,
+            'battery_drain': round(joules / capacity_j * 100, 2)
+        }
+        if images:
+            report['images'] = images
+            report['joules_per_image'] = round(joules / images, 2)
+            report['error_joules_per_image'] = round(error / images, 2)
+        return report
+
+
+def combine_reports(reports: List[Dict]) -> Dict:
+    """One energy report covering several separately metered runs"""
+    if not reports:
+        return {'joules': 0.0, 'error_joules': 0.0, 'avg_watts': 0.0, 'error_watts': None,
+                'duration': 0.0, 'samples': 0, 'battery_drain': 0.0, 'runs': 0}
+    joules = sum(report['joules'] for report in reports)
+    error = sum(report['error_joules'] for report in reports)
+    duration = sum(report['duration'] for report in reports)
+    return {
+        'joules': round(joules, 2),
+        'error_joules': round(error, 2),
+        'avg_watts': round(joules / duration, 2) if duration else 0.0,
+        'error_watts': round(error / duration, 2) if duration else None,
+        'duration': round(duration, 2),
+        'samples': sum(report['samples'] for report in reports),
+        'source': reports[0]['source'],
+        'method': reports[0]['method'],
+        'charging': any(report['charging'] for report in reports),
+        'battery_drain': round(sum(report['battery_drain'] for report in reports), 2),
+        'runs': len(reports)
+    }
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Server Instrumentation for Snapdragon vs Intel Performance Championship
+Counters, gauges and histograms rendered in the Prometheus text format
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) from 50 us to 2.5 s
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    """Monotonic counter
+
+    Increments are deliberately unlocked: the hot path is a single add, and
+    a scrape that occasionally misses an increment under contention is an
+    acceptable trade for never blocking a handler.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Point-in-time value, set directly or computed at scrape time"""
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class Histogram:
+    """Fixed-bucket histogram with preallocated (non-cumulative) counts"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time spent in the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs as exposed to Prometheus"""
+        total, buckets = 0, []
+        for bound, count in zip(self.bounds + (float('inf'),), list(self.counts)):
+            total += count
+            buckets.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return buckets
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    """One named metric and its labelled children"""
+
+    def __init__(self, name: str, help: str, kind: str, factory: Callable,
+                 labelnames: Sequence[str] = (), fn: Optional[Callable] = None):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.factory = factory
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """Child for a label combination, created on first use"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            # setdefault keeps a single child if two threads race to create it
+            child = self._children.setdefault(values, self.factory())
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if self.fn is not None:
+            value = self.fn()
+            samples = value.items() if isinstance(value, dict) else [((), value)]
+            for labels, sample in samples:
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(sample)}")
+            return lines
+
+        for labels, child in list(self._children.items()):
+            if isinstance(child, Histogram):
+                for le, count in child.cumulative():
+                    bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                    lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+                label_text = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_text} {_format_value(child.sum)}")
+                lines.append(f"{self.name}_count{label_text} {sum(child.counts)}")
+            else:
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(child.value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families under a common namespace
+
+    Unlabelled metrics are returned as their single child, so call sites
+    hold a Counter/Gauge/Histogram directly and pay no lookup per update.
+    """
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, namespace: str = ''):
+        self.namespace = namespace
+        self._families: Dict[str, MetricFamily] = {}
+
+    def _register(self, name: str, help: str, kind: str, factory: Callable,
+                  labelnames: Sequence[str], fn: Optional[Callable] = None):
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        if full_name in self._families:
+            raise ValueError(f"Metric {full_name} already registered")
+        family = MetricFamily(full_name, help, kind, factory, labelnames, fn)
+        self._families[full_name] = family
+        if fn is not None:
+            return family
+        return family if labelnames else family.labels()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        return self._register(name, help, 'counter', Counter, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = (),
+              fn: Optional[Callable] = None):
+        """A gauge; with fn, its value (or {label values: value}) is computed per scrape"""
+        return self._register(name, help, 'gauge', Gauge, labelnames, fn)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  labelnames: Sequence[str] = ()):
+        return self._register(name, help, 'histogram', lambda: Histogram(buckets), labelnames)
+
+    def render(self) -> str:
+        """The whole registry in the Prometheus text exposition format"""
+        lines = []
+        for family in list(self._families.values()):
+            lines.extend(family.render())
+        return '\n'.join(lines) + '\n'
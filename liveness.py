@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Liveness Tracking for Snapdragon vs Intel Performance Championship
+Heartbeat deadlines on a monotonic clock, expired from a min-heap on time
+"""
+
+import heapq
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sim_clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+
+class LivenessTracker:
+    """Per-device heartbeat deadlines with transition-only notifications
+
+    Every heartbeat pushes a new deadline onto a heap (O(log n)); superseded
+    entries are skipped lazily when they surface and the heap is compacted
+    when stale entries pile up. A watcher thread sleeps exactly until the
+    earliest deadline, so a silent device is flagged when its timeout
+    elapses rather than on the next polling pass.
+    """
+
+    def __init__(self, timeout: float = 10.0, clock: Optional[Clock] = None):
+        self.timeout = timeout
+        self.clock = clock or get_clock()
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._alive: Dict[str, bool] = {}
+        self._sequence = 0
+        self._wakeup = self.clock.event()
+        self._thread = None
+        self._latencies: List[float] = []
+        self._stats = {'heartbeats': 0, 'expired': 0, 'revived': 0}
+
+    def touch(self, device_id: str, now: Optional[float] = None) -> bool:
+        """Record a heartbeat; True if the device was considered dead (a transition)"""
+        now = self.clock.monotonic() if now is None else now
+        with self._lock:
+            was_empty = not self._deadlines
+            deadline = now + self.timeout
+            self._deadlines[device_id] = deadline
+            self._sequence += 1
+            heapq.heappush(self._heap, (deadline, self._sequence, device_id))
+            self._stats['heartbeats'] += 1
+
+            revived = self._alive.get(device_id) is False
+            self._alive[device_id] = True
+            if revived:
+                self._stats['revived'] += 1
+
+            if len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._compact()
+        if was_empty:
+            self._wakeup.set()
+        return revived
+
+    def forget(self, device_id: str):
+        """Stop tracking a device that disconnected cleanly"""
+        with self._lock:
+            self._deadlines.pop(device_id, None)
+            self._alive.pop(device_id, None)
+
+    def is_alive(self, device_id: str) -> bool:
+        return self._alive.get(device_id, False)
+
+    def _compact(self):
+        self._heap = [(deadline, sequence, device_id)
+                      for deadline, sequence, device_id in self._heap
+                      if self._deadlines.get(device_id) == deadline]
+        heapq.heapify(self._heap)
+
+    def expire(self, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Mark devices whose deadline passed; returns (device_id, detection latency)"""
+        now = self.clock.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _, device_id = heapq.heappop(self._heap)
+                if self._deadlines.get(device_id) != deadline or not self._alive.get(device_id):
+                    continue
+                self._alive[device_id] = False
+                latency = now - deadline
+                self._latencies.append(latency)
+                if len(self._latencies) > 1000:
+                    del self._latencies[:500]
+                self._stats['expired'] += 1
+                expired.append((device_id, latency))
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        with self._lock:
+            while self._heap and self._deadlines.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def start(self, on_expire: Callable[[str, float], None]):
+        """Watch deadlines on a background thread, calling on_expire(device_id, latency)"""
+        if self._thread is None:
+            self._thread = self.clock.start_thread(self._watch, args=(on_expire,), name='liveness')
+
+    def _watch(self, on_expire: Callable[[str, float], None]):
+        while True:
+            deadline = self.next_deadline()
+            # Deadlines only move later, so the earliest one never needs revisiting early
+            self._wakeup.wait(None if deadline is None else max(deadline - self.clock.monotonic(), 0.0))
+            self._wakeup.clear()
+            for device_id, latency in self.expire():
+                try:
+                    on_expire(device_id, latency)
+                except Exception as e:
+                    logger.error(f"Liveness callback failed for {device_id}: {e}")
+
+    def stats(self) -> Dict:
+        """Heartbeat counters and how late expirations were detected"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self._stats)
+            stats.update({
+                'tracked': len(self._deadlines),
+                'alive': sum(1 for alive in self._alive.values() if alive),
+                'heap_size': len(self._heap),
+                'timeout': self.timeout
+            })
+        if latencies:
+            stats['detection_latency_ms'] = {
+                'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+                'p95': round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2)
+            }
+        return stats
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Trace-Driven Performance Model for Snapdragon vs Intel Performance Championship
+Replays recorded per-step generation timings, including warm-up and throttling shapes
+"""
+
+import json
+import random
+import bisect
+import argparse
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACES_DIR = Path(__file__).parent / 'perf_traces'
+
+
+class PerformanceModel:
+    """Per-step timing model fitted from recorded generation traces
+
+    A trace is a list of runs, each with the busy time that preceded it
+    (start_offset) and its measured per-step durations. Fitting splits every
+    step time into three factors that are sampled independently on replay:
+
+    - throttle: run speed relative to a cold device, by sustained-load offset
+    - warm-up: slowdown of the first steps of a run relative to its steady pace
+    - residual: the remaining step-to-step noise, resampled empirically
+    """
+
+    def __init__(self, platform: str, trace: Dict, warmup_steps: int = 5,
+                 throttle_bucket: float = 30.0):
+        self.platform = platform
+        self.trace = trace
+        self.warmup_steps = warmup_steps
+        self.throttle_bucket = throttle_bucket
+        self._fit()
+
+    # Fitting
+
+    def _fit(self):
+        runs = [run for run in self.trace.get('runs', []) if run.get('step_times')]
+        if not runs:
+            raise ValueError(f"Trace for {self.platform} has no runs")
+
+        self.steps = statistics.mode(len(run['step_times']) for run in runs)
+        self.load_model_seconds = self.trace.get('load_model_seconds', 2.0)
+
+        # Steady pace of each run, ignoring its warm-up steps
+        levels = []
+        for run in runs:
+            steady = run['step_times'][self.warmup_steps:] or run['step_times']
+            levels.append(statistics.median(steady))
+
+        # Throttling: run pace relative to cold runs, binned by sustained-load offset
+        bins: Dict[int, List[float]] = {}
+        for run, level in zip(runs, levels):
+            bins.setdefault(int(run.get('start_offset', 0.0) // self.throttle_bucket), []).append(level)
+        first_bin = min(bins)
+        self.base_step_time = statistics.median(bins[first_bin])
+        self.throttle_offsets = [(index + 0.5) * self.throttle_bucket for index in sorted(bins)]
+        self.throttle_factors = [statistics.median(bins[index]) / self.base_step_time
+                                 for index in sorted(bins)]
+
+        # Warm-up: median per-step slowdown at the start of runs
+        self.warmup = []
+        for index in range(self.warmup_steps):
+            ratios = [run['step_times'][index] / level
+                      for run, level in zip(runs, levels) if index < len(run['step_times'])]
+            self.warmup.append(statistics.median(ratios) if ratios else 1.0)
+
+        # Residual noise of steady steps
+        self.residuals = [step / level
+                          for run, level in zip(runs, levels)
+                          for step in run['step_times'][self.warmup_steps:]] or [1.0]
+
+    def throttle_factor(self, offset: float) -> float:
+        """Interpolated slowdown after `offset` seconds of sustained load"""
+        offsets, factors = self.throttle_offsets, self.throttle_factors
+        if offset <= offsets[0]:
+            return factors[0]
+        if offset >= offsets[-1]:
+            return factors[-1]
+        index = bisect.bisect_right(offsets, offset)
+        span = offsets[index] - offsets[index - 1]
+        weight = (offset - offsets[index - 1]) / span
+        return factors[index - 1] + (factors[index] - factors[index - 1]) * weight
+
+    # Sampling
+
+    def sample_step_time(self, step_index: int, offset: float = 0.0) -> float:
+        """Sample one native step at the given step index and sustained-load offset"""
+        warmup = self.warmup[step_index] if step_index < len(self.warmup) else 1.0
+        return (self.base_step_time * self.throttle_factor(offset) * warmup *
+                random.choice(self.residuals))
+
+    def sample_run(self, steps: Optional[int] = None, start_offset: float = 0.0) -> List[float]:
+        """Sample per-step times for one generation
+
+        Runs are sampled at the trace's native step count and, if a different
+        count is requested, re-bucketed so the total time and its front-loaded
+        warm-up shape are preserved.
+        """
+        native = []
+        offset = start_offset
+        for index in range(self.steps):
+            step_time = self.sample_step_time(index, offset)
+            native.append(step_time)
+            offset += step_time
+
+        steps = steps or self.steps
+        if steps == self.steps:
+            return native
+
+        # Interpolate the cumulative time curve at the requested step boundaries
+        cumulative = [0.0]
+        for step_time in native:
+            cumulative.append(cumulative[-1] + step_time)
+
+        def at(fraction):
+            position = fraction * self.steps
+            index = min(int(position), self.steps - 1)
+            return cumulative[index] + native[index] * (position - index)
+
+        boundaries = [at(i / steps) for i in range(steps)] + [cumulative[-1]]
+        return [b - a for a, b in zip(boundaries, boundaries[1:])]
+
+    # Refitting
+
+    def add_run(self, step_times: List[float], start_offset: float = 0.0):
+        """Record a measured run and refit the model"""
+        self.trace.setdefault('runs', []).append({
+            'start_offset': round(start_offset, 2),
+            'step_times': [round(t, 4) for t in step_times]
+        })
+        self.trace['source'] = 'measured'
+        self.trace['updated'] = datetime.now().isoformat()
+        self._fit()
+
+    def save(self, path: Optional[Path] = None):
+        """Write the (possibly refitted) trace back to disk"""
+        path = Path(path) if path else TRACES_DIR / f"{self.platform}.json"
+        path.parent.mkdir(exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.trace, f, indent=2)
+
+    def summary(self) -> Dict:
+        return {
+            'platform': self.platform,
+            'source': self.trace.get('source'),
+            'runs': len(self.trace.get('runs', [])),
+            'steps': self.steps,
+            'base_step_time': round(self.base_step_time, 4),
+            'expected_run_time': round(self.base_step_time * (sum(self.warmup) + self.steps - len(self.warmup)), 2),
+            'warmup': [round(w, 3) for w in self.warmup],
+            'throttle': [{'offset': o, 'factor': round(f, 3)}
+                         for o, f in zip(self.throttle_offsets, self.throttle_factors)]
+        }
+
+    @classmethod
+    def from_file(cls, path: Path, platform: Optional[str] = None) -> 'PerformanceModel':
+        with open(path, 'r') as f:
+            trace = json.load(f)
+        return cls(platform or trace.get('platform', Path(path).stem), trace)
+
+    @classmethod
+    def constant(cls, platform: str, step_time: float, steps: int) -> 'PerformanceModel':
+        """Flat model used when no trace has been recorded for a platform"""
+        trace = {'platform': platform, 'source': 'constant',
+                 'runs': [{'start_offset': 0.0, 'step_times': [step_time] * steps}]}
+        return cls(platform, trace)
+
+
+_models: Dict[str, PerformanceModel] = {}
+
+
+def load_performance_model(platform: str) -> PerformanceModel:
+    """Load (and cache) the model for a platform from perf_traces/"""
+    if platform not in _models:
+        path = TRACES_DIR / f"{platform}.json"
+        if path.exists():
+            _models[platform] = PerformanceModel.from_file(path, platform)
+        else:
+            _models[platform] = PerformanceModel.constant(platform, 1.0, 20)
+    return _models[platform]
+
+
+def main():
+    """Inspect or refit performance models"""
+    parser = argparse.ArgumentParser(description='Trace-driven performance model')
+    parser.add_argument('--platform', choices=['snapdragon', 'intel'], required=True)
+    parser.add_argument('--add-runs', type=str,
+                       help='JSON file with measured runs ([{"start_offset": s, "step_times": [...]}])')
+    parser.add_argument('--sample', type=int, default=0,
+                       help='Sample this many runs and print their total times')
+
+    args = parser.parse_args()
+    model = load_performance_model(args.platform)
+
+    if args.add_runs:
+        with open(args.add_runs, 'r') as f:
+            for run in json.load(f):
+                model.add_run(run['step_times'], run.get('start_offset', 0.0))
+        model.save()
+        print(f"✅ Refitted {args.platform} model from {len(model.trace['runs'])} runs")
+
+    print(json.dumps(model.summary(), indent=2))
+
+    offset = 0.0
+    for index in range(args.sample):
+        run = model.sample_run(start_offset=offset)
+        offset += sum(run)
+        print(f"  Run {index + 1}: {sum(run):.1f}s")
+
+
+if __name__ == '__main__':
+    main()
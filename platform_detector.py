@@ -5,6 +5,7 @@ Automatically identifies hardware platform and capabilities
 """
 
 import platform
+import re
 import subprocess
 import json
 import psutil
@@ -12,6 +13,36 @@ import sys
 import os
 from typing import Dict, Optional
 
+
+def cpu_name() -> str:
+    """CPU name without spawning a process (no wmic, no uname -p)"""
+    if os.name == 'nt':
+        return os.environ.get('PROCESSOR_IDENTIFIER', '')
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith(('model name', 'Hardware')):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return ''
+
+
+def detect_platform_type() -> str:
+    """Fast platform check for start-up paths; PlatformDetector runs the full probe"""
+    machine = platform.machine().lower()
+    if 'arm' in machine or 'aarch64' in machine:
+        return 'snapdragon'
+    name = cpu_name().lower()
+    if 'snapdragon' in name or 'qualcomm' in name:
+        return 'snapdragon'
+    if 'authenticamd' in name or re.search(r'\bamd\b', name):
+        return 'amd'
+    if 'x86' in machine or 'amd64' in machine or 'intel' in name:
+        return 'intel'
+    return 'unknown'
+
+
 class PlatformDetector:
     def __init__(self):
         self.platform_info = {}
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Race State Machine for Snapdragon vs Intel Performance Championship
+One run-scoped race: participants, completion tracking, timeout and scoring
+"""
+
+import math
+import uuid
+import threading
+from typing import Callable, Dict, List, Optional
+
+from scoring import compare_platforms
+
+# Headline metric per scenario and whether lower values are better
+SCENARIO_METRICS = {
+    'ai_showdown': ('time', True),
+    'sustained_generation': ('images_per_minute', False),
+    'battery_race': ('battery_drain', True),
+    'thermal_test': ('max_temperature', True)
+}
+
+RUNNING = 'running'
+FINISHED = 'finished'
+TIMED_OUT = 'timed_out'
+CANCELLED = 'cancelled'
+
+
+def result_score(scenario: str, result: Optional[Dict]) -> Optional[float]:
+    """The scenario's headline metric from a device result, if present"""
+    metric, _ = SCENARIO_METRICS.get(scenario, (None, True))
+    value = result.get(metric) if metric and isinstance(result, dict) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        return None
+    return float(value)
+
+
+def result_samples(scenario: str, result: Optional[Dict]) -> List[float]:
+    """Repeated measurements of the headline metric ('runs'), else the single score"""
+    runs = result.get('runs') if isinstance(result, dict) else None
+    if runs:
+        return [float(v) for v in runs
+                if isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)]
+    score = result_score(scenario, result)
+    return [score] if score is not None else []
+
+
+def score_race(scenario: str, results: Dict[str, Dict], platforms: Dict[str, str],
+               confidence: float = 0.95, resamples: int = 2000, min_runs: int = 3,
+               seed: Optional[int] = None) -> Dict:
+    """Compare platforms on the scenario metric, pooling every device's runs
+
+    Scores are per-platform medians. The leader only becomes the winner when
+    its advantage is statistically significant (see scoring.compare_platforms).
+    """
+    metric, lower_better = SCENARIO_METRICS.get(scenario, (None, True))
+    samples: Dict[str, List[float]] = {}
+    for device_id, result in results.items():
+        samples.setdefault(platforms[device_id], []).extend(result_samples(scenario, result))
+
+    comparison = compare_platforms(samples, lower_better, confidence=confidence,
+                                   resamples=resamples, min_runs=min_runs, seed=seed)
+    outcome = {
+        'metric': metric,
+        'lower_is_better': lower_better,
+        'scores': {platform: stats['median'] for platform, stats in comparison['stats'].items()},
+        'winner': comparison['leader'] if comparison['significant'] else None
+    }
+    outcome.update(comparison)
+    return outcome
+
+
+class Race:
+    """A single run of one scenario across a fixed set of participants
+
+    Completion is tracked with a pending set, so recording a result is O(1)
+    and exactly one caller observes the transition out of RUNNING - whether
+    by the last result, a timeout or a participant dropping out.
+    """
+
+    def __init__(self, scenario: str, participants: Dict[str, str], started_at: float,
+                 timeout: float, race_id: Optional[str] = None,
+                 scorer: Callable[[str, Dict, Dict], Dict] = score_race):
+        self.race_id = race_id or uuid.uuid4().hex[:12]
+        self.scenario = scenario
+        self.platforms = dict(participants)
+        self.started_at = started_at
+        self.deadline = started_at + timeout
+        self.scorer = scorer
+        self.state = RUNNING
+        self.finished_at: Optional[float] = None
+        self.results: Dict[str, Dict] = {}
+        self.dropped: set = set()
+        self._pending = set(participants)
+        self._lock = threading.Lock()
+
+    @property
+    def participants(self) -> List[str]:
+        return list(self.platforms)
+
+    @property
+    def pending(self) -> List[str]:
+        return sorted(self._pending)
+
+    def _close(self, state: str, now: float) -> bool:
+        if self.state != RUNNING:
+            return False
+        self.state = state
+        self.finished_at = now
+        return True
+
+    def record(self, device_id: str, result: Dict, now: float) -> bool:
+        """Store a participant's result; True if this completed the race"""
+        with self._lock:
+            if self.state != RUNNING or device_id not in self._pending:
+                return False
+            self._pending.discard(device_id)
+            self.results[device_id] = result
+            return not self._pending and self._close(FINISHED, now)
+
+    def drop(self, device_id: str, now: float) -> bool:
+        """A participant left mid-race; True if the others had all finished"""
+        with self._lock:
+            if self.state != RUNNING or device_id not in self._pending:
+                return False
+            self._pending.discard(device_id)
+            self.dropped.add(device_id)
+            return not self._pending and self._close(FINISHED, now)
+
+    def check_timeout(self, now: float) -> bool:
+        """True (once) if the deadline passed with results still outstanding"""
+        with self._lock:
+            return now >= self.deadline and self._close(TIMED_OUT, now)
+
+    def cancel(self, now: float) -> bool:
+        with self._lock:
+            return self._close(CANCELLED, now)
+
+    def outcome(self) -> Dict:
+        """Scores and winner from the results received so far"""
+        outcome = self.scorer(self.scenario, self.results, self.platforms)
+        outcome['missing'] = self.pending + sorted(self.dropped)
+        return outcome
+
+    def snapshot(self) -> Dict:
+        """JSON-safe view for dashboards"""
+        return {
+            'race_id': self.race_id,
+            'scenario': self.scenario,
+            'state': self.state,
+            'participants': self.platforms,
+            'pending': self.pending,
+            'finished': sorted(self.results),
+            'started_at': self.started_at,
+            'deadline': self.deadline
+        }
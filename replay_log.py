@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Replay Log for Snapdragon vs Intel Performance Championship
+Sequence-numbered dashboard broadcasts kept for reconnect catch-up
+"""
+
+import uuid
+import threading
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ReplayLog:
+    """Bounded log of sequenced broadcasts
+
+    Every broadcast is stamped with the next sequence number and sent while
+    the log's lock is held, so clients observe sequence numbers in order. A
+    reconnecting client reports the last number it applied (and the epoch
+    it came from); if that point is still in the log it gets just the
+    events after it, otherwise it needs a full snapshot. The epoch changes
+    on every server start, so numbers from a previous run never match.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.epoch = uuid.uuid4().hex[:8]
+        self.lock = threading.RLock()
+        self._entries: deque = deque(maxlen=capacity)
+        self._seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, event: str, payload: Dict, send: Callable[[str, Dict], None]) -> int:
+        """Stamp, record and send one broadcast; returns its sequence number"""
+        with self.lock:
+            self._seq += 1
+            stamped = dict(payload, seq=self._seq)
+            self._entries.append((self._seq, event, stamped))
+            send(event, stamped)
+            return self._seq
+
+    def since(self, last_seq: Optional[int], epoch: Optional[str] = None) -> Optional[List[Tuple[str, Dict]]]:
+        """Events after last_seq as (event, payload), or None if a snapshot is needed"""
+        if not isinstance(last_seq, int) or isinstance(last_seq, bool) or epoch != self.epoch:
+            return None
+        with self.lock:
+            if last_seq > self._seq:
+                return None
+            oldest = self._entries[0][0] if self._entries else self._seq + 1
+            # Everything after last_seq must still be in the log
+            if last_seq + 1 < oldest:
+                return None
+            # Entries are contiguous, so the start index is a subtraction
+            start = last_seq + 1 - oldest
+            return [(event, payload) for _, event, payload in islice(self._entries, start, None)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Results Store for Snapdragon vs Intel Performance Championship
+Persists races, per-device results and telemetry summaries to SQLite
+"""
+
+import json
+import queue
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from race import SCENARIO_METRICS, result_score
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    race_id TEXT PRIMARY KEY,
+    scenario TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    winner TEXT,
+    message TEXT,
+    participants TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    race_id TEXT,
+    scenario TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    score REAL,
+    result TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS telemetry (
+    race_id TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    min REAL,
+    max REAL,
+    avg REAL,
+    samples INTEGER,
+    PRIMARY KEY (race_id, device_id, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_races_scenario_time ON races (scenario, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_results_race ON results (race_id);
+CREATE INDEX IF NOT EXISTS idx_results_device ON results (scenario, device_id, score);
+CREATE INDEX IF NOT EXISTS idx_results_platform ON results (scenario, platform, score);
+"""
+
+
+class ResultsStore:
+    """SQLite (WAL) history of every race, written in batches off the caller's thread
+
+    Socket.IO handlers only enqueue statements; a single writer thread commits
+    them in transactions of up to batch_size. Reads open their own connection,
+    which WAL lets run alongside the writer. Leaderboards and percentiles are
+    answered from the (scenario, device|platform, score) indexes rather than
+    by scanning and decoding stored result JSON.
+    """
+
+    def __init__(self, path: str = 'results.db', batch_size: int = 100,
+                 flush_interval: float = 0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True,
+                                        name='results-writer')
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    # Writes (queued)
+
+    def _enqueue(self, sql: str, params: Sequence):
+        self._queue.put((sql, tuple(params)))
+
+    def start_race(self, race_id: str, scenario: str, started_at: float,
+                   participants: List[str]):
+        self._enqueue('INSERT OR REPLACE INTO races (race_id, scenario, started_at, participants) '
+                      'VALUES (?, ?, ?, ?)',
+                      (race_id, scenario, started_at, json.dumps(participants)))
+
+    def record_result(self, race_id: Optional[str], scenario: str, device_id: str,
+                      platform: str, result: Dict, recorded_at: float):
+        self._enqueue('INSERT INTO results (race_id, scenario, device_id, platform, recorded_at, score, result) '
+                      'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                      (race_id, scenario, device_id, platform, recorded_at,
+                       result_score(scenario, result), json.dumps(result, default=str)))
+
+    def finish_race(self, race_id: str, finished_at: float, winner: Optional[str],
+                    message: str, telemetry: Optional[Dict[str, Dict[str, Dict]]] = None):
+        """Close a race; telemetry maps device_id -> metric -> {min, max, avg, samples}"""
+        self._enqueue('UPDATE races SET finished_at = ?, winner = ?, message = ? WHERE race_id = ?',
+                      (finished_at, winner, message, race_id))
+        for device_id, metrics in (telemetry or {}).items():
+            for metric, stats in metrics.items():
+                self._enqueue('INSERT OR REPLACE INTO telemetry VALUES (?, ?, ?, ?, ?, ?, ?)',
+                              (race_id, device_id, metric, stats['min'], stats['max'],
+                               stats['avg'], stats['samples']))
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            try:
+                with conn:
+                    for sql, params in batch:
+                        conn.execute(sql, params)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(batch)} result rows: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued write is committed"""
+        self._queue.join()
+
+    # Reads
+
+    def leaderboard(self, scenario: str, by: str = 'device', limit: int = 10) -> List[Dict]:
+        """Best, average and run count per device (or platform), best first"""
+        column = 'platform' if by == 'platform' else 'device_id'
+        lower_better = SCENARIO_METRICS.get(scenario, (None, True))[1]
+        best = 'MIN(score)' if lower_better else 'MAX(score)'
+        order = 'ASC' if lower_better else 'DESC'
+        rows = self._reader().execute(
+            f'SELECT {column} AS name, {best} AS best, AVG(score) AS average, COUNT(score) AS runs '
+            f'FROM results WHERE scenario = ? AND score IS NOT NULL '
+            f'GROUP BY {column} ORDER BY best {order} LIMIT ?',
+            (scenario, limit)).fetchall()
+        return [{column: row['name'], 'best': row['best'], 'average': round(row['average'], 3),
+                 'runs': row['runs']} for row in rows]
+
+    def percentiles(self, scenario: str, platform: Optional[str] = None,
+                    points: Sequence[float] = (50, 90, 99)) -> Dict:
+        """Nearest-rank score percentiles, read by offset along the score index"""
+        where = 'scenario = ? AND score IS NOT NULL'
+        params: List = [scenario]
+        if platform:
+            where += ' AND platform = ?'
+            params.append(platform)
+
+        conn = self._reader()
+        count = conn.execute(f'SELECT COUNT(*) FROM results WHERE {where}', params).fetchone()[0]
+        values = {}
+        for point in points:
+            if not count:
+                values[f"p{point:g}"] = None
+                continue
+            rank = min(max(int(-(-point * count // 100)) - 1, 0), count - 1)
+            row = conn.execute(f'SELECT score FROM results WHERE {where} '
+                               f'ORDER BY score LIMIT 1 OFFSET ?', params + [rank]).fetchone()
+            values[f"p{point:g}"] = row[0]
+        return {'scenario': scenario, 'platform': platform, 'count': count,
+                'metric': SCENARIO_METRICS.get(scenario, (None,))[0], 'percentiles': values}
+
+    def races(self, scenario: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Most recent races with their results"""
+        conn = self._reader()
+        if scenario:
+            rows = conn.execute('SELECT * FROM races WHERE scenario = ? ORDER BY started_at DESC LIMIT ?',
+                                (scenario, limit)).fetchall()
+        else:
+            rows = conn.execute('SELECT * FROM races ORDER BY started_at DESC LIMIT ?',
+                                (limit,)).fetchall()
+
+        races = []
+        for row in rows:
+            race = dict(row)
+            race['participants'] = json.loads(race['participants'] or '[]')
+            race['results'] = [
+                {'device_id': r['device_id'], 'platform': r['platform'], 'score': r['score'],
+                 'recorded_at': r['recorded_at'], 'result': json.loads(r['result'])}
+                for r in conn.execute('SELECT * FROM results WHERE race_id = ? ORDER BY recorded_at',
+                                      (race['race_id'],))
+            ]
+            races.append(race)
+        return races
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Statistical Scoring for Snapdragon vs Intel Performance Championship
+Medians, bootstrap confidence intervals and a significance gate for winners
+"""
+
+import math
+import random
+import statistics
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Linear-interpolated percentile of already sorted values"""
+    position = (len(sorted_values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def _resample_median(values: Sequence[float], rng: random.Random) -> float:
+    return statistics.median(rng.choices(values, k=len(values)))
+
+
+def bootstrap_ci(values: Sequence[float], confidence: float = 0.95, resamples: int = 2000,
+                 rng: Optional[random.Random] = None) -> Tuple[float, float]:
+    """Percentile-bootstrap confidence interval of the median"""
+    rng = rng or random.Random()
+    medians = sorted(_resample_median(values, rng) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return percentile(medians, tail), percentile(medians, 1 - tail)
+
+
+def ratio_ci(better: Sequence[float], worse: Sequence[float], lower_is_better: bool,
+             confidence: float = 0.95, resamples: int = 2000,
+             rng: Optional[random.Random] = None) -> Tuple[Optional[float], Optional[float], float]:
+    """Bootstrap interval of the advantage ratio of `better` over `worse`
+
+    The ratio is oriented so values above 1 favour `better` (worse/better for
+    times, better/worse for rates). Also returns the share of resamples in
+    which `better` actually came out ahead. Resamples with a zero median on
+    the dividing side have no ratio and only count towards that share; if
+    none is left the interval is (None, None).
+    """
+    rng = rng or random.Random()
+    ratios = []
+    ahead = 0
+    for _ in range(resamples):
+        a = _resample_median(better, rng)
+        b = _resample_median(worse, rng)
+        if lower_is_better:
+            a, b = b, a
+        ahead += a > b
+        if b:
+            ratios.append(a / b)
+    if not ratios:
+        return None, None, ahead / resamples
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    return percentile(ratios, tail), percentile(ratios, 1 - tail), ahead / resamples
+
+
+def compare_platforms(samples: Dict[str, List[float]], lower_is_better: bool,
+                      confidence: float = 0.95, resamples: int = 2000, min_runs: int = 3,
+                      seed: Optional[int] = None) -> Dict:
+    """Rank platforms by median and decide whether the leader's margin is real
+
+    A winner is only named when both leading platforms have at least
+    `min_runs` samples and the confidence interval of the advantage ratio
+    lies entirely above 1. Tied medians, and a median of 0 (no ratio), never
+    produce a winner. Non-finite samples are ignored, so every number in the
+    outcome is JSON-safe.
+    """
+    rng = random.Random(seed)
+    stats = {}
+    for platform, values in samples.items():
+        values = [v for v in values if math.isfinite(v)]
+        if not values:
+            continue
+        low, high = bootstrap_ci(values, confidence, resamples, rng)
+        stats[platform] = {
+            'runs': len(values),
+            'median': round(statistics.median(values), 3),
+            'ci': [round(low, 3), round(high, 3)]
+        }
+
+    outcome = {
+        'stats': stats,
+        'confidence': confidence,
+        'leader': None,
+        'runner_up': None,
+        'ratio': None,
+        'ratio_ci': None,
+        'p_superior': None,
+        'tie': False,
+        'significant': False,
+        'reason': None
+    }
+    if len(stats) < 2:
+        outcome['reason'] = 'fewer than two platforms reported'
+        return outcome
+
+    ranked = sorted(stats, key=lambda p: stats[p]['median'], reverse=not lower_is_better)
+    leader, runner_up = ranked[0], ranked[1]
+    best, second = stats[leader]['median'], stats[runner_up]['median']
+    outcome['leader'], outcome['runner_up'] = leader, runner_up
+    if best and second:
+        outcome['ratio'] = round(second / best if lower_is_better else best / second, 2)
+
+    low, high, p_superior = ratio_ci([v for v in samples[leader] if math.isfinite(v)],
+                                     [v for v in samples[runner_up] if math.isfinite(v)],
+                                     lower_is_better, confidence, resamples, rng)
+    if low is not None:
+        outcome['ratio_ci'] = [round(low, 2), round(high, 2)]
+    outcome['p_superior'] = round(p_superior, 3)
+    outcome['tie'] = best == second
+
+    if min(stats[leader]['runs'], stats[runner_up]['runs']) < min_runs:
+        outcome['reason'] = f'need at least {min_runs} runs per platform'
+    elif outcome['tie']:
+        outcome['reason'] = 'medians are tied'
+    elif outcome['ratio'] is None or low is None:
+        outcome['reason'] = 'insufficient data: a median of 0 has no ratio'
+    elif low <= 1:
+        outcome['reason'] = f'difference is within the {confidence:.0%} confidence interval'
+    else:
+        outcome['significant'] = True
+    return outcome
@@ -4,8 +4,6 @@ Stable Diffusion Generator with Platform-Specific Optimizations
 Provides real image generation with visual progress display
 """
 
-import os
-import sys
 import json
 import time
 import threading
@@ -15,29 +13,26 @@ from typing import Dict, Optional, Callable, Tuple
 import io
 import base64
 
-# Import PIL for image handling
-try:
-    from PIL import Image, ImageDraw, ImageFont
-except ImportError:
-    print("Installing Pillow...")
-    os.system(f"{sys.executable} -m pip install Pillow")
-    from PIL import Image, ImageDraw, ImageFont
+# Import PIL for image handling; a missing Pillow fails here, not mid-demo via pip
+from PIL import Image, ImageDraw, ImageFont
 
 # Platform detection
-from platform_detector import PlatformDetector
+from platform_detector import detect_platform_type
+from sim_clock import Clock, VirtualClock, get_clock, set_clock
+from perf_model import load_performance_model
 
 class StableDiffusionGenerator:
-    def __init__(self, platform_type: str = 'auto'):
+    def __init__(self, platform_type: str = 'auto', clock: Optional[Clock] = None):
         """Initialize SD generator with platform-specific settings"""
         self.platform_type = platform_type
+        self.clock = clock or get_clock()
         self.model_loaded = False
         self.current_image = None
         self.progress_queue = queue.Queue()
         
         # Auto-detect platform if needed
         if self.platform_type == 'auto':
-            detector = PlatformDetector()
-            self.platform_type = detector.platform_info.get('platform_type', 'intel')
+            self.platform_type = detect_platform_type()
         
         # Platform-specific configurations
         self.configs = {
@@ -60,6 +55,11 @@ class StableDiffusionGenerator:
         }
         
         self.config = self.configs.get(self.platform_type, self.configs['intel'])
+        
+        # Recorded timing traces drive the simulated step times
+        self.perf_model = load_performance_model(self.platform_type)
+        self.busy_seconds = 0.0
+        self.last_busy_end = None
         print(f"🎨 Initialized SD Generator for {self.platform_type.upper()}")
     
     def load_model(self):
@@ -68,7 +68,7 @@ class StableDiffusionGenerator:
         
         # Simulate model loading
         # In production, this would load the actual SD model
-        time.sleep(2)  # Simulate loading time
+        self.clock.sleep(self.perf_model.load_model_seconds)  # Simulate loading time
         
         self.model_loaded = True
         print("✅ Model loaded successfully")
@@ -190,9 +190,15 @@ class StableDiffusionGenerator:
         print(f"\n🎨 Generating image: '{prompt}'")
         print(f"⚙️ Settings: {self.config['num_inference_steps']} steps on {self.config['device']}")
         
-        start_time = time.time()
+        start_time = self.clock.time()
         steps = self.config['num_inference_steps']
         
+        # Sustained load carries over between images; idle time cools it off
+        if self.last_busy_end is not None:
+            idle = self.clock.monotonic() - self.last_busy_end
+            self.busy_seconds = max(0.0, self.busy_seconds - idle)
+        step_times = self.perf_model.sample_run(steps, start_offset=self.busy_seconds)
+        
         # Simulate generation with progress updates
         for step in range(1, steps + 1):
             # Generate progress image
@@ -207,17 +213,15 @@ class StableDiffusionGenerator:
                     'image': progress_img
                 })
             
-            # Simulate processing time
-            # Snapdragon is faster (NPU acceleration)
-            if self.platform_type == 'snapdragon':
-                time.sleep(0.4)  # 20 steps * 0.4 = 8 seconds
-            else:
-                time.sleep(1.0)  # 30 steps * 1.0 = 30 seconds
+            # Simulate processing time from the platform's timing traces
+            self.clock.sleep(step_times[step - 1])
         
         # Generate final image
         final_image = self.generate_final_image(prompt)
         
-        generation_time = time.time() - start_time
+        generation_time = self.clock.time() - start_time
+        self.busy_seconds += generation_time
+        self.last_busy_end = self.clock.monotonic()
         
         print(f"✅ Generation complete in {generation_time:.1f} seconds")
         
@@ -244,9 +248,7 @@ class StableDiffusionGenerator:
             image, time_taken = self.generate(prompt, negative_prompt, seed, progress_update)
             self.current_image = image
         
-        thread = threading.Thread(target=_generate)
-        thread.start()
-        return thread
+        return self.clock.start_thread(_generate, daemon=False)
     
     def get_progress(self):
         """Get current progress from queue"""
@@ -312,9 +314,14 @@ def main():
                        help='Text prompt for generation')
     parser.add_argument('--benchmark', action='store_true',
                        help='Run benchmark comparison')
+    parser.add_argument('--time-warp', action='store_true',
+                       help='Run simulated timings on a virtual clock')
     
     args = parser.parse_args()
     
+    if args.time_warp:
+        set_clock(VirtualClock())
+    
     if args.benchmark:
         benchmark_comparison()
     else:
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Send Queues for Snapdragon vs Intel Performance Championship
+Per-client bounded outboxes with latest-wins and drop-oldest backpressure
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sim_clock import Clock, get_clock
+from structured_logging import RateLimitedLogger
+
+logger = logging.getLogger(__name__)
+
+LATEST_WINS = 'latest_wins'
+DROP_OLDEST = 'drop_oldest'
+RELIABLE = 'reliable'
+
+
+class ClientSendQueue:
+    """Outbound messages for one client, bounded by count and bytes
+
+    Latest-wins messages replace their pending predecessor (moving to the
+    back, so sequence numbers stay in order). When the queue is over a
+    bound, the oldest droppable message goes first; reliable messages are
+    never dropped, even if they alone exceed the bounds.
+    """
+
+    def __init__(self, max_messages: int = 64, max_bytes: int = 256 * 1024):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._messages: OrderedDict = OrderedDict()
+        self._latest: Dict[Tuple, int] = {}
+        self._next_id = 0
+        self._bytes = 0
+        self.stats = {'enqueued': 0, 'sent': 0, 'replaced': 0, 'dropped': 0}
+
+    def put(self, event: str, payload: Dict, size: int, policy: str = RELIABLE,
+            key: Optional[Tuple] = None, now: float = 0.0) -> List[str]:
+        """Queue a message; returns the events of any messages dropped to make room"""
+        with self._lock:
+            self.stats['enqueued'] += 1
+            if policy == LATEST_WINS:
+                previous = self._latest.pop(key, None)
+                if previous is not None:
+                    self._bytes -= self._messages.pop(previous)[2]
+                    self.stats['replaced'] += 1
+
+            message_id = self._next_id
+            self._next_id += 1
+            self._messages[message_id] = (event, payload, size, now, policy, key)
+            self._bytes += size
+            if policy == LATEST_WINS:
+                self._latest[key] = message_id
+            return self._shed()
+
+    def _shed(self) -> List[str]:
+        dropped = []
+        while len(self._messages) > self.max_messages or self._bytes > self.max_bytes:
+            victim = next((mid for mid, m in self._messages.items() if m[4] != RELIABLE), None)
+            if victim is None:
+                break
+            event, _, size, _, policy, key = self._messages.pop(victim)
+            self._bytes -= size
+            if policy == LATEST_WINS:
+                self._latest.pop(key, None)
+            dropped.append(event)
+        self.stats['dropped'] += len(dropped)
+        return dropped
+
+    def take(self, limit: int) -> List[Tuple[str, Dict]]:
+        """Remove and return up to `limit` of the oldest messages"""
+        taken = []
+        with self._lock:
+            while self._messages and len(taken) < limit:
+                _, (event, payload, size, _, policy, key) = self._messages.popitem(last=False)
+                self._bytes -= size
+                if policy == LATEST_WINS:
+                    self._latest.pop(key, None)
+                taken.append((event, payload))
+            self.stats['sent'] += len(taken)
+        return taken
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def lag(self, now: float) -> Dict:
+        """How far behind this client is"""
+        with self._lock:
+            oldest = next(iter(self._messages.values()), None)
+            stats = dict(self.stats)
+            stats.update({
+                'depth': len(self._messages),
+                'bytes': self._bytes,
+                'oldest_ms': round((now - oldest[3]) * 1000, 1) if oldest else 0.0
+            })
+        return stats
+
+
+class Outbox:
+    """Fans broadcasts into every client's queue and pumps them out
+
+    Broadcasting only enqueues, so its cost no longer depends on how fast
+    any client reads. A pump thread hands each client at most `window`
+    messages beyond what its transport still has buffered; a client that
+    stops reading backs up in its own bounded queue, where stale
+    replaceable messages are shed, instead of in the transport.
+    """
+
+    def __init__(self, send_fn: Callable[[str, Dict, str], None],
+                 depth_fn: Callable[[str], int] = lambda sid: 0,
+                 policies: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+                 max_messages: int = 64, max_bytes: int = 256 * 1024, window: int = 8,
+                 poll_interval: float = 0.05, clock: Optional[Clock] = None):
+        self.send_fn = send_fn
+        self.depth_fn = depth_fn
+        self.policies = policies or {}
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.window = window
+        self.poll_interval = poll_interval
+        self.clock = clock or get_clock()
+        self._errors = RateLimitedLogger(logger, clock=self.clock)
+        self._queues: Dict[str, ClientSendQueue] = {}
+        self._wakeup = self.clock.event()
+        self._thread = None
+        self._on_drop: Optional[Callable[[str, str], None]] = None
+
+    def add_client(self, sid: str):
+        self._queues[sid] = ClientSendQueue(self.max_messages, self.max_bytes)
+
+    def remove_client(self, sid: str):
+        self._queues.pop(sid, None)
+
+    def on_drop(self, callback: Callable[[str, str], None]):
+        """Call callback(sid, event) for every message shed from a queue"""
+        self._on_drop = callback
+
+    def broadcast(self, event: str, payload: Dict):
+        """Queue a message for every client according to its event's policy"""
+        policy, key_field = self.policies.get(event, (RELIABLE, None))
+        key = (event, payload.get(key_field) if key_field else None)
+        size = len(json.dumps(payload, default=str))
+        now = self.clock.monotonic()
+        for sid, queue in list(self._queues.items()):
+            for dropped in queue.put(event, payload, size, policy, key, now):
+                if self._on_drop:
+                    self._on_drop(sid, dropped)
+        self._wakeup.set()
+
+    def pump(self) -> bool:
+        """Send what each client has room for; True if any client is still backed up"""
+        backed_up = False
+        for sid, queue in list(self._queues.items()):
+            if not len(queue):
+                continue
+            room = self.window - self.depth_fn(sid)
+            for event, payload in queue.take(max(room, 0)):
+                self.send_fn(event, payload, sid)
+            backed_up = backed_up or len(queue) > 0
+        return backed_up
+
+    def start(self):
+        """Start the pump thread"""
+        if self._thread is None:
+            self._thread = self.clock.start_thread(self._run, name='outbox-pump')
+
+    def _run(self):
+        backed_up = False
+        while True:
+            # Wake on new messages; poll only while a slow client still has a backlog
+            self._wakeup.wait(self.poll_interval if backed_up else None)
+            self._wakeup.clear()
+            try:
+                backed_up = self.pump()
+            except Exception as e:
+                self._errors.error('pump', f"Outbox pump failed: {e}")
+
+    def lag(self) -> Dict[str, Dict]:
+        """Per-client queue depth, bytes, age of the oldest message and counters"""
+        now = self.clock.monotonic()
+        return {sid: queue.lag(now) for sid, queue in list(self._queues.items())}
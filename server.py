@@ -4,52 +4,251 @@ Snapdragon vs Intel Performance Championship Server
 Main coordination server for the demo system
 """
 
-import json
+import math
 import time
-import threading
+import random
+import argparse
+import tempfile
 from datetime import datetime
-from flask import Flask, render_template, send_from_directory
-from flask_socketio import SocketIO, emit
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from flask import Flask, Response, render_template, request, jsonify
+from flask_socketio import SocketIO
 from flask_cors import CORS
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from asset_pipeline import AssetPipeline
+from broadcast_scheduler import BroadcastScheduler
+from commentary import CommentaryEngine
+from config_loader import ConfigWatcher, get_config
+from device_registry import DeviceRegistry
+from instrumentation import MetricsRegistry
+from liveness import LivenessTracker
+from race import RUNNING, Race, result_score, score_race
+from replay_log import ReplayLog
+from results_store import ResultsStore
+from send_queue import Outbox
+from session_log import ReplayTransport, SessionLog, SessionRecorder, SessionReplayer, parse_speed
+from sim_clock import get_clock
+from state_backend import InProcessBackend, create_backend, parse_backend
+from structured_logging import SampledLogger, configure_logging, log_stats
+from timeseries_store import TimeSeriesStore
+from tournament import DONE, STOPPED, Tournament
+
+# Logging is configured by the entry point (configure_logging), not on import
 logger = logging.getLogger(__name__)
 
-# Load configuration
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# Load configuration (validated; reloadable sections are updated in place)
+config = get_config()
+
+# Per-event debug lines, sampled so turning on DEBUG does not flood the log
+event_debug = SampledLogger(logger, config.get('logging', {}).get('debug_sample_every', 100))
 
 # Initialize Flask app
+# Assets are served by the pipeline below, not Flask's disk-backed static route
 app = Flask(__name__, 
-            static_folder='dashboard/assets',
+            static_folder=None,
             template_folder='dashboard')
 app.config['SECRET_KEY'] = 'snapdragon-championship-2025'
 CORS(app)
 
+# Fingerprint and precompress dashboard assets once at startup
+assets = AssetPipeline('dashboard/assets')
+assets.build()
+
 # Initialize SocketIO with WebSocket transport
 socketio = SocketIO(app, 
                     cors_allowed_origins="*",
                     async_mode='threading',
-                    logger=True,
+                    logger=logging.getLogger('socketio'),  # level set under logging.levels
                     engineio_logger=False)
 
-# Connected devices tracking
-connected_devices = {
-    'snapdragon': {'connected': False, 'last_seen': None, 'metrics': {}},
-    'intel': {'connected': False, 'last_seen': None, 'metrics': {}}
-}
+# Prometheus-style server internals, served at /metrics
+instruments = MetricsRegistry('championship')
+EVENTS_IN = instruments.counter('events_in_total', 'Socket.IO events received', ('event',))
+EVENTS_OUT = instruments.counter('events_out_total', 'Socket.IO emits (dashboard broadcasts count once per dashboard)', ('event',))
+HANDLER_SECONDS = instruments.histogram('handler_seconds', 'Socket.IO handler latency', labelnames=('event',))
+HANDLER_ERRORS = instruments.counter('handler_errors_total', 'Socket.IO handlers that raised', ('event',))
+FANOUT_SECONDS = instruments.histogram('broadcast_fanout_seconds', 'Time to emit one metrics frame to every dashboard')
+COMMENTARY_SECONDS = instruments.histogram('commentary_eval_seconds', 'Commentary rule evaluation per metrics frame')
+
+class SocketIOTransport:
+    """Outbound events and room membership through Flask-SocketIO (threading mode)
+
+    The handlers below take the client sid explicitly and only reach clients
+    through `transport`, so async_server.py can serve the same events by
+    installing its own transport.
+    """
+
+    def __init__(self, socketio):
+        self.socketio = socketio
+
+    def emit(self, event, data, to=None):
+        EVENTS_OUT.labels(event).inc()
+        self.socketio.emit(event, data, to=to)
+
+    def enter_room(self, sid, room):
+        self.socketio.server.enter_room(sid, room, namespace='/')
+
+    def leave_room(self, sid, room):
+        self.socketio.server.leave_room(sid, room, namespace='/')
+
+    def send_queue_depths(self):
+        """Packets waiting in each client's Engine.IO send queue"""
+        return [s.queue.qsize() for s in list(self.socketio.server.eio.sockets.values())]
+
+    def send_queue_depth(self, sid):
+        """Packets waiting in one client's Engine.IO send queue"""
+        eio_sid = self.socketio.server.manager.eio_sid_from_sid(sid, '/')
+        socket = self.socketio.server.eio.sockets.get(eio_sid)
+        return socket.queue.qsize() if socket else 0
+
+transport = SocketIOTransport(socketio)
+
+# Injectable clock (sim_clock.VirtualClock time-warps rehearsals)
+clock = get_clock()
+
+def now_iso():
+    """Current time on the server clock as an ISO string"""
+    return datetime.fromtimestamp(clock.time()).isoformat()
+
+# Connected devices tracking (any number of agents per platform)
+registry = DeviceRegistry()
+
+# Heartbeat deadlines on the monotonic clock
+liveness = LivenessTracker(timeout=config.get('liveness', {}).get('heartbeat_timeout', 10), clock=clock)
+
+# Metric history for chart backfill (bounded ring buffers with rollups)
+history = TimeSeriesStore()
+
+# Persistent race history (SQLite, batched writes)
+results_store = ResultsStore(config.get('storage', {}).get('results_db', 'results.db'))
+
+# Per-role rooms: agents only get their own commands, dashboards get broadcasts
+AGENTS_ROOM = 'agents'
+DASHBOARDS_ROOM = 'dashboards'
+
+# Sequenced dashboard broadcasts; reconnecting dashboards replay what they missed
+replay_log = ReplayLog(capacity=config.get('sync', {}).get('replay_capacity', 1000))
+RESUMES = instruments.counter('dashboard_resumes_total', 'Dashboard connections by sync method', ('method',))
+instruments.gauge('replay_log_size', 'Broadcasts held for reconnect replay', fn=lambda: len(replay_log))
+
+# Per-dashboard bounded send queues: a slow dashboard only backs up its own queue
+send_config = config.get('send_queue', {})
+outbox = Outbox(lambda event, payload, sid: transport.emit(event, payload, to=sid),
+                depth_fn=lambda sid: transport.send_queue_depth(sid),
+                policies={event: tuple(policy) for event, policy in send_config.get('policies', {}).items()},
+                max_messages=send_config.get('max_messages', 64),
+                max_bytes=send_config.get('max_bytes', 256 * 1024),
+                window=send_config.get('window', 8),
+                clock=clock)
+SEND_DROPPED = instruments.counter('send_dropped_total', 'Queued messages shed for slow dashboards', ('event',))
+outbox.on_drop(lambda sid, event: SEND_DROPPED.labels(event).inc())
+
+def outbox_summary():
+    lag = outbox.lag().values()
+    return {('max_depth',): max((c['depth'] for c in lag), default=0),
+            ('total_depth',): sum(c['depth'] for c in lag),
+            ('max_lag_ms',): max((c['oldest_ms'] for c in lag), default=0.0)}
+
+instruments.gauge('outbox', 'Per-dashboard send queue backlog', ('stat',), fn=outbox_summary)
+
+# Session recording (see session_log.py); None unless enabled
+recorder = None
+
+def emit_to(event, payload, to):
+    """Send to one client or room, recording it if a session is being captured"""
+    if recorder:
+        recorder.record('out', event, to, payload)
+    transport.emit(event, payload, to=to)
+
+def fan_out(event, stamped):
+    if recorder:
+        recorder.record('out', event, DASHBOARDS_ROOM, stamped)
+    outbox.broadcast(event, stamped)
+
+# Shared state and pub/sub between server workers (see state_backend.py);
+# a lone in-process backend unless configure_backend() picks another
+backend = InProcessBackend()
+BUS_RECEIVED = instruments.counter('bus_messages_received_total', 'Messages received from other workers', ('channel',))
+
+def emit_to_dashboards(event, payload):
+    """Broadcast a UI event to dashboards only, stamped with the next sequence number"""
+    replay_log.publish(event, payload, fan_out)
+    if backend.shared:
+        backend.publish('broadcast', {'event': event, 'payload': payload})
+
+def send_to_device(device, event, payload):
+    """Send to an agent, relaying through the backend if another worker holds its session"""
+    if device.get('worker') is None:
+        emit_to(event, payload, device['sid'])
+    else:
+        backend.publish('command', {'device_id': device['device_id'], 'event': event, 'payload': payload})
+
+def send_to_agents(event, payload):
+    emit_to(event, payload, AGENTS_ROOM)
+    if backend.shared:
+        backend.publish('command', {'device_id': None, 'event': event, 'payload': payload})
+
+def share_device(device, left=False):
+    """Publish a local device's state for the other workers to mirror"""
+    if not backend.shared:
+        return
+    record = {k: v for k, v in device.items() if k not in ('sid', 'worker')}
+    record['worker'] = backend.worker_id
+    backend.put('devices', device['device_id'], record)
+    backend.publish('device', {'device': record, 'left': left})
+
+def emit_frame(event, frame):
+    """Broadcast a coalesced metrics frame, timing the fan-out"""
+    # Frames only cover this worker's devices, so dashboards keep the latest per worker
+    frame['worker'] = backend.worker_id
+    with FANOUT_SECONDS.time():
+        emit_to_dashboards(event, frame)
+
+# Metrics fan-out: one coalesced frame per dashboard tick
+broadcaster = BroadcastScheduler(emit_frame,
+                                 interval=config['ui'].get('chart_update_rate', 1000) / 1000,
+                                 clock=clock)
+
+# Role of every open connection ('agent' or 'dashboard')
+client_roles = {}
+
+def send_queue_summary():
+    depths = transport.send_queue_depths()
+    return {('max',): max(depths, default=0), ('total',): sum(depths)}
+
+instruments.gauge('clients_connected', 'Open Socket.IO connections', ('role',),
+                  fn=lambda: {(role,): count for role, count in Counter(client_roles.values()).items()})
+instruments.gauge('client_send_queue_depth', 'Packets queued for sending across clients', ('stat',),
+                  fn=send_queue_summary)
+instruments.gauge('log_records', 'Log records queued for the writer thread, dropped or rate-limited', ('stat',),
+                  fn=lambda: {(stat,): value for stat, value in log_stats().items()})
+instruments.gauge('broadcast_queue_depth', 'Devices with metrics waiting for the next frame',
+                  fn=lambda: broadcaster.stats()['queue_depth'])
 
 # Demo state management
 demo_state = {
     'active': False,
     'current_test': None,
     'start_time': None,
-    'results': [],
-    'commentary': []
+    'race_id': None,
+    'participants': []
 }
 
+# Rule-driven commentary, evaluated once per metrics frame (see commentary.py)
+def build_commentary():
+    commentary_config = config.get('commentary', {})
+    return CommentaryEngine(commentary_config.get('rules', []),
+                            feed_size=commentary_config.get('feed_size', 20),
+                            dedup_window=commentary_config.get('dedup_window', 60))
+
+commentary = build_commentary()
+
+# The race in progress (or the last one); see race.Race
+current_race = None
+
 # Victory messages (professional humor)
 VICTORY_MESSAGES = {
     'ai_faster': [
@@ -69,9 +268,26 @@ VICTORY_MESSAGES = {
         "The sound of silence vs the roar of desperation",
         "Laptop on lap: Comfortable vs Concerning",
         "4nm efficiency vs 10nm... enthusiasm"
+    ],
+    'sustained_throughput': [
+        "Snapdragon keeps the gallery growing while Intel waits for its second wind",
+        "Sprinting is easy - sustaining it is what NPUs are for",
+        "Minute ten looks a lot like minute one on Snapdragon"
     ]
 }
 
+# Winner headline per scenario: (victory message key, template)
+# Headlines with and without the advantage ratio (None when a median is 0)
+VICTORY_FORMATS = {
+    'ai_showdown': ('ai_faster', "{winner} wins by {ratio}x! ", "{winner} wins! "),
+    'sustained_generation': ('sustained_throughput', "{winner} sustains {best} images/min vs {other} ({ratio}x)! ",
+                             "{winner} sustains {best} images/min vs {other}! "),
+    'battery_race': ('battery_efficient', "{winner} used {best}% battery vs {other}% ({ratio}x more efficient)! ",
+                     "{winner} used {best}% battery vs {other}%! "),
+    'thermal_test': ('thermal_cool', "{winner} peaked at {best}°C vs {other}°C! ",
+                     "{winner} peaked at {best}°C vs {other}°C! ")
+}
+
 # Loading messages for entertainment
 LOADING_MESSAGES = [
     "Initializing quantum advantage...",
@@ -87,237 +303,749 @@ LOADING_MESSAGES = [
 @app.route('/')
 def index():
     """Serve the main dashboard"""
-    return render_template('index.html', config=config)
+    html = render_template('index.html', config=config, asset_url=assets.url)
+    return Response(html, headers={'Cache-Control': 'no-cache'})
 
 @app.route('/assets/<path:path>')
 def send_assets(path):
-    """Serve static assets"""
-    return send_from_directory('dashboard/assets', path)
-
-@socketio.on('connect')
-def handle_connect():
-    """Handle client connection"""
-    logger.info(f"Client connected: {request.sid}")
-    emit('server_status', {
-        'connected': True,
-        'devices': connected_devices,
-        'demo_state': demo_state,
-        'timestamp': datetime.now().isoformat()
-    })
+    """Serve static assets from the precompressed in-memory pipeline"""
+    status, body, headers = assets.respond(path, request.headers.get('Accept-Encoding', ''),
+                                           request.headers.get('If-None-Match'))
+    return Response(body, status=status, headers=headers)
 
-@socketio.on('device_register')
-def handle_device_register(data):
-    """Register a device (Snapdragon or Intel laptop)"""
-    device_type = data.get('device_type')
-    if device_type in connected_devices:
-        connected_devices[device_type]['connected'] = True
-        connected_devices[device_type]['last_seen'] = datetime.now().isoformat()
-        logger.info(f"{device_type} device registered")
-        
-        # Broadcast device status update
-        socketio.emit('device_status', {
-            'device': device_type,
-            'status': 'connected',
-            'timestamp': datetime.now().isoformat()
-        })
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape target"""
+    return Response(instruments.render(), content_type=instruments.CONTENT_TYPE)
+
+def query_arg(args, name, default=None, type=str):
+    """Typed query-string lookup for both Flask and aiohttp request args"""
+    value = args.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return type(value)
+    except ValueError:
+        return default
+
+def api_broadcast_stats(args):
+    """Fan-out cost and queue depth of the metrics tick"""
+    return broadcaster.stats()
+
+def api_assets(args):
+    """Fingerprinted asset manifest and precompression savings"""
+    stats = assets.stats()
+    stats['manifest'] = assets.manifest
+    return stats
+
+def api_send_queues(args):
+    """Per-dashboard send queue lag and drop counters"""
+    return outbox.lag()
+
+def api_tournament(args):
+    """Phase, gate state and standings of the current (or last) tournament"""
+    return tournament.snapshot() if tournament else {'state': None}
+
+def api_backend(args):
+    """This worker's id and what it has exchanged with the others"""
+    return {
+        'worker_id': backend.worker_id,
+        'backend': type(backend).__name__,
+        'shared': backend.shared,
+        'stats': getattr(backend, 'stats', {}),
+        'remote_devices': sorted(d['device_id'] for d in registry.devices() if d.get('worker'))
+    }
+
+def api_liveness(args):
+    """Heartbeat counters and disconnect detection latency"""
+    return liveness.stats()
+
+def api_history(args):
+    """Downsampled metric history, e.g. /api/history?metric=cpu.percent&window=120"""
+    end = query_arg(args, 'end', type=float) or clock.time()
+    start = query_arg(args, 'start', type=float)
+    if start is None:
+        start = end - query_arg(args, 'window', 300, type=float)
+    max_points = min(query_arg(args, 'max_points', 300, type=int), 1000)
+    
+    result = history.query(start, end,
+                           device_id=query_arg(args, 'device'),
+                           metric=query_arg(args, 'metric'),
+                           max_points=max_points)
+    result['platforms'] = {d['device_id']: d['platform'] for d in registry.devices()}
+    return result
+
+def api_leaderboard(args):
+    """Best result per device (or ?by=platform) for a scenario across all stored runs"""
+    return results_store.leaderboard(query_arg(args, 'scenario', 'ai_showdown'),
+                                     by=query_arg(args, 'by', 'device'),
+                                     limit=query_arg(args, 'limit', 10, type=int))
+
+def api_percentiles(args):
+    """Score percentiles for a scenario, e.g. ?scenario=ai_showdown&platform=intel&p=50,90"""
+    points = [float(p) for p in query_arg(args, 'p', '50,90,99').split(',') if p]
+    return results_store.percentiles(query_arg(args, 'scenario', 'ai_showdown'),
+                                     platform=query_arg(args, 'platform'),
+                                     points=points)
+
+def api_races(args):
+    """Most recent races with their per-device results"""
+    return results_store.races(query_arg(args, 'scenario'),
+                               limit=query_arg(args, 'limit', 20, type=int))
+
+# JSON endpoints served by every transport: path -> view(args)
+API_ROUTES = {
+    '/api/broadcast_stats': api_broadcast_stats,
+    '/api/liveness': api_liveness,
+    '/api/tournament': api_tournament,
+    '/api/backend': api_backend,
+    '/api/send_queues': api_send_queues,
+    '/api/assets': api_assets,
+    '/api/history': api_history,
+    '/api/leaderboard': api_leaderboard,
+    '/api/percentiles': api_percentiles,
+    '/api/races': api_races
+}
+
+for path, view in API_ROUTES.items():
+    app.add_url_rule(path, view.__name__, lambda view=view: jsonify(view(request.args)))
+
+def handle_connect(sid, auth=None):
+    """Handle client connection; agents identify with auth={'role': 'agent'}"""
+    role = (auth or {}).get('role', 'dashboard')
+    logger.info(f"Client connected: {sid} ({role})")
+    client_roles[sid] = 'agent' if role == 'agent' else 'dashboard'
+    if role == 'agent':
+        transport.enter_room(sid, AGENTS_ROOM)
+        return
+    
+    # Join and catch up atomically, so no broadcast lands between the two
+    with replay_log.lock:
+        transport.enter_room(sid, DASHBOARDS_ROOM)
+        outbox.add_client(sid)
+        missed = replay_log.since((auth or {}).get('last_seq'), (auth or {}).get('epoch'))
+        if missed is not None:
+            RESUMES.labels('delta').inc()
+            emit_to('replay', {
+                'epoch': replay_log.epoch,
+                'seq': replay_log.last_seq,
+                'platforms': registry.platform_summary(),
+                'events': missed
+            }, to=sid)
+            return
         
-        # Send welcome message
-        emit('device_welcome', {
-            'message': f"Welcome to the Championship, {config['devices'][device_type]['name']}!",
-            'specs': config['devices'][device_type]['specs']
-        })
+        RESUMES.labels('snapshot').inc()
+        emit_to('server_status', {
+            'connected': True,
+            'epoch': replay_log.epoch,
+            'seq': replay_log.last_seq,
+            'devices': registry.snapshot(),
+            'platforms': registry.platform_summary(),
+            'demo_state': demo_state,
+            'commentary': list(commentary.feed),
+            'race': current_race.snapshot() if current_race else None,
+            'timestamp': now_iso()
+        }, to=sid)
 
-@socketio.on('metrics_update')
-def handle_metrics_update(data):
-    """Receive metrics update from a device"""
+def handle_device_register(sid, data):
+    """Register a device agent (any number per platform)"""
     device_type = data.get('device_type')
-    metrics = data.get('metrics')
+    if not device_type:
+        return
     
-    if device_type in connected_devices:
-        connected_devices[device_type]['metrics'] = metrics
-        connected_devices[device_type]['last_seen'] = datetime.now().isoformat()
-        
-        # Broadcast metrics to all clients
-        socketio.emit('metrics_broadcast', {
-            'device': device_type,
-            'metrics': metrics,
-            'timestamp': datetime.now().isoformat()
+    device = registry.register(sid, device_type,
+                               device_id=data.get('device_id'),
+                               hostname=data.get('hostname'),
+                               now=now_iso())
+    logger.info(f"{device['device_id']} ({device_type}) device registered")
+    liveness.touch(device['device_id'])
+    share_device(device)
+    
+    # Agents that connected without a role are moved out of the dashboard room
+    client_roles[sid] = 'agent'
+    outbox.remove_client(sid)
+    transport.leave_room(sid, DASHBOARDS_ROOM)
+    transport.enter_room(sid, AGENTS_ROOM)
+    
+    # Broadcast device status update
+    emit_to_dashboards('device_status', {
+        'device': device_type,
+        'device_id': device['device_id'],
+        'status': 'connected',
+        'timestamp': now_iso()
+    })
+    
+    # Send welcome message
+    device_config = config['devices'].get(device_type, {})
+    emit_to('device_welcome', {
+        'message': f"Welcome to the Championship, {device_config.get('name', device['device_id'])}!",
+        'device_id': device['device_id'],
+        'specs': device_config.get('specs', {})
+    }, to=sid)
+
+def handle_metrics_update(sid, data):
+    """Receive metrics update from a device"""
+    device = registry.get_by_sid(sid)
+    if device is None:
+        return
+    
+    metrics = data.get('metrics')
+    registry.touch(device, now_iso(), metrics)
+    if liveness.touch(device['device_id']):
+        # Heartbeats resumed after a timeout
+        registry.set_connected(device, True)
+        share_device(device)
+        emit_to_dashboards('device_status', {
+            'device': device['platform'],
+            'device_id': device['device_id'],
+            'status': 'connected',
+            'timestamp': now_iso()
         })
-        
-        # Generate commentary based on metrics
-        commentary = generate_commentary(device_type, metrics)
-        if commentary:
-            add_commentary(commentary)
-
-@socketio.on('start_demo')
-def handle_start_demo(data):
-    """Start a demo scenario"""
-    scenario = data.get('scenario')
+    history.record_metrics(device['device_id'], clock.time(), metrics)
+    
+    # Queue for the next coalesced frame; newer updates replace this one
+    broadcaster.submit(device['device_id'], {
+        'device': device['platform'],
+        'device_id': device['device_id'],
+        'metrics': metrics,
+        'timestamp': now_iso()
+    })
+
+def commentate_frame(frame):
+    """Evaluate commentary rules once per frame rather than once per update"""
+    with COMMENTARY_SECONDS.time():
+        entries = commentary.evaluate(frame['devices'].values(), clock.time())
+    for entry in entries:
+        emit_to_dashboards('commentary_update', entry)
+
+broadcaster.add_hook(commentate_frame)
+
+def share_frame(frame):
+    """Other workers mirror device metrics once per tick"""
+    for device_id in frame['devices']:
+        device = registry.get(device_id)
+        if device:
+            share_device(device)
+
+broadcaster.add_hook(share_frame)
+
+def start_race(scenario, opened=None):
+    """Open a race for every connected device and send each its start command
+
+    opened(race), if given, is called before any command goes out, so a
+    race that finishes at once is already known to the caller. An unknown
+    scenario is refused (None) without touching the running race.
+    """
+    global current_race
+    if scenario not in config['demo_scenarios']:
+        logger.warning(f"Refusing to start unknown scenario {scenario!r}")
+        return None
     logger.info(f"Starting demo: {scenario}")
     
+    now = clock.time()
+    if current_race and current_race.cancel(now):
+        results_store.finish_race(current_race.race_id, now, None, 'Superseded by a new race')
+    
+    scenario_config = config['demo_scenarios'][scenario]
+    current_race = Race(scenario,
+                        {d['device_id']: d['platform'] for d in registry.connected()},
+                        started_at=now,
+                        timeout=scenario_config['duration'] + config.get('race', {}).get('timeout_grace', 60),
+                        scorer=partial(score_race, **config.get('scoring', {})))
+    
     demo_state['active'] = True
     demo_state['current_test'] = scenario
-    demo_state['start_time'] = time.time()
+    demo_state['start_time'] = now
+    demo_state['participants'] = current_race.participants
+    demo_state['race_id'] = current_race.race_id
+    results_store.start_race(current_race.race_id, scenario, now, current_race.participants)
+    if opened:
+        opened(current_race)
+    share_demo_state()
     
     # Send loading message for entertainment
-    import random
     loading_msg = random.choice(LOADING_MESSAGES)
     
-    socketio.emit('demo_started', {
+    emit_to_dashboards('demo_started', {
         'scenario': scenario,
         'loading_message': loading_msg,
-        'duration': config['demo_scenarios'][scenario]['duration'],
-        'timestamp': datetime.now().isoformat()
+        'duration': scenario_config['duration'],
+        'race_id': current_race.race_id,
+        'participants': current_race.platforms,
+        'timestamp': now_iso()
     })
     
-    # Send start command to devices
-    socketio.emit('execute_test', {
+    # Send start command to each participating agent over its own link
+    command = {
+        'scenario': scenario,
+        'config': scenario_config
+    }
+    for device in registry.connected():
+        send_to_device(device, 'execute_test', command)
+    return current_race
+
+def handle_start_demo(sid, data):
+    """Start a demo scenario by hand (ends any running tournament)"""
+    scenario = data.get('scenario') if isinstance(data, dict) else None
+    if scenario not in config['demo_scenarios']:
+        emit_to('demo_rejected', {'scenario': scenario, 'reason': f"Unknown scenario: {scenario}"}, sid)
+        return
+    stop_tournament()
+    start_race(scenario)
+
+# Automatic back-to-back run over demo_phases (see tournament.py)
+tournament = None
+
+def prepare_phase(scenario):
+    """Send agents the next scenario early, so setup overlaps scoring of the last one"""
+    if scenario not in config['demo_scenarios']:
+        return
+    command = {
         'scenario': scenario,
         'config': config['demo_scenarios'][scenario]
-    })
+    }
+    for device in registry.connected():
+        send_to_device(device, 'prepare_test', command)
+
+def connected_temperatures():
+    return {d['device_id']: (d.get('metrics') or {}).get('temperature') for d in registry.connected()}
+
+def handle_start_tournament(sid, data=None):
+    """Run every demo phase back to back"""
+    global tournament
+    if tournament and tournament.state not in (DONE, STOPPED):
+        return
+    
+    logger.info("Starting tournament")
+    tournament = Tournament(config['demo_phases'], start_race, prepare_phase, connected_temperatures,
+                            lambda update: emit_to_dashboards('tournament_update', update),
+                            declare_winner, clock=clock, **config.get('tournament', {}))
+    tournament.start()
+
+def stop_tournament():
+    if tournament:
+        tournament.stop()
 
-@socketio.on('test_complete')
-def handle_test_complete(data):
+def handle_stop_tournament(sid, data=None):
+    stop_tournament()
+
+def handle_test_ready(sid, data):
+    """An agent finished setting up for an upcoming phase"""
+    device = registry.get_by_sid(sid)
+    if device is None:
+        return
+    if tournament:
+        tournament.device_ready(device['device_id'], data.get('scenario'))
+    elif backend.shared:
+        # The tournament runs on another worker
+        backend.publish('device_event', {'event': 'test_ready', 'device_id': device['device_id'],
+                                         'platform': device['platform'], 'data': data})
+
+def handle_test_complete(sid, data):
     """Handle test completion from a device"""
-    device_type = data.get('device_type')
+    device = registry.get_by_sid(sid)
+    device_type = device['platform'] if device else data.get('device_type')
+    device_id = device['device_id'] if device else device_type
     result = data.get('result')
     
-    logger.info(f"{device_type} completed test: {result}")
+    logger.info(f"{device_id} completed test: {result}")
+    if backend.shared and not owns_race(device_id):
+        # The race runs on another worker
+        backend.publish('device_event', {'event': 'test_complete', 'device_id': device_id,
+                                         'platform': device_type, 'data': data})
+        return
+    complete_test(device_id, device_type, result)
+
+def owns_race(device_id):
+    """True if this worker's race is running and waiting on the device"""
+    return current_race is not None and current_race.state == RUNNING and device_id in current_race.platforms
+
+def complete_test(device_id, device_type, result):
+    """Record a device's result against the race, declaring the winner on the last one"""
+    race = current_race
+    now = clock.time()
+    result = result or {}
+    completed = race.record(device_id, result, now) if race else False
     
-    # Store result
-    demo_state['results'].append({
-        'device': device_type,
-        'result': result,
-        'timestamp': datetime.now().isoformat()
+    # A late or non-participant result is kept, but not under the race
+    accepted = race is not None and race.results.get(device_id) is result
+    results_store.record_result(race.race_id if accepted else None,
+                                race.scenario if race else demo_state['current_test'],
+                                device_id, device_type, result, now)
+    
+    # The race closes on its last participant's result
+    if completed:
+        declare_winner(race)
+
+def handle_image_generated(sid, data):
+    """Relay per-image latency from a sustained generation run"""
+    device = registry.get_by_sid(sid)
+    if device is None:
+        return
+    
+    emit_to_dashboards('image_generated', {
+        'device': device['platform'],
+        'device_id': device['device_id'],
+        'image': data.get('image'),
+        'latency': data.get('latency'),
+        'elapsed': data.get('elapsed'),
+        'timestamp': now_iso()
     })
+
+def handle_test_progress(sid, data):
+    """Relay agent progress to dashboards"""
+    device = registry.get_by_sid(sid)
+    if device is None:
+        return
     
-    # Check if both devices completed
-    if len([r for r in demo_state['results'] 
-            if r['timestamp'] > datetime.fromtimestamp(demo_state['start_time']).isoformat()]) >= 2:
-        declare_winner()
+    emit_to_dashboards('test_progress', dict(data, device_id=device['device_id']))
 
-@socketio.on('stop_demo')
-def handle_stop_demo():
+def handle_stop_demo(sid, data=None):
     """Stop the current demo"""
     logger.info("Stopping demo")
+    stop_tournament()
     demo_state['active'] = False
     demo_state['current_test'] = None
+    share_demo_state()
     
-    socketio.emit('demo_stopped', {
-        'timestamp': datetime.now().isoformat()
-    })
+    now = clock.time()
+    if current_race and current_race.cancel(now):
+        results_store.finish_race(current_race.race_id, now, None, 'Stopped')
+    
+    payload = {'timestamp': now_iso()}
+    emit_to_dashboards('demo_stopped', payload)
+    send_to_agents('demo_stopped', payload)
 
-def generate_commentary(device_type, metrics):
-    """Generate witty commentary based on metrics"""
-    commentary_lines = []
-    
-    # Temperature commentary
-    if 'temperature' in metrics:
-        temp = metrics['temperature']
-        if device_type == 'intel' and temp > 75:
-            commentary_lines.append(f"Intel reaching {temp}°C - Thermal throttling imminent")
-        elif device_type == 'snapdragon' and temp < 50:
-            commentary_lines.append(f"Snapdragon cruising at a cool {temp}°C")
-    
-    # Battery commentary
-    if 'battery' in metrics:
-        battery = metrics['battery']
-        if device_type == 'intel' and battery['percent'] < 70:
-            commentary_lines.append(f"Intel battery already at {battery['percent']}% - Range anxiety activated")
-        elif device_type == 'snapdragon' and battery['percent'] > 90:
-            commentary_lines.append(f"Snapdragon still at {battery['percent']}% - All-day confidence")
-    
-    # Fan commentary
-    if 'fan_rpm' in metrics:
-        rpm = metrics['fan_rpm']
-        if device_type == 'intel' and rpm > 3000:
-            commentary_lines.append(f"Intel fan at {rpm} RPM - Preparing for takeoff")
-        elif device_type == 'snapdragon' and rpm == 0:
-            commentary_lines.append("Snapdragon fan status: What fan?")
-    
-    return commentary_lines
-
-def add_commentary(lines):
-    """Add commentary lines to the feed"""
-    for line in lines:
-        entry = {
-            'text': line,
-            'timestamp': datetime.now().isoformat(),
-            'type': 'auto'
-        }
-        demo_state['commentary'].append(entry)
-        
-        # Keep only last 20 commentary lines
-        if len(demo_state['commentary']) > 20:
-            demo_state['commentary'] = demo_state['commentary'][-20:]
-        
-        # Broadcast commentary update
-        socketio.emit('commentary_update', entry)
-
-def declare_winner():
-    """Declare the winner of the current test"""
-    test = demo_state['current_test']
-    results = demo_state['results']
-    
-    # Determine winner based on test type
-    winner = None
-    message = ""
-    
-    if test == 'ai_showdown':
-        # Fastest completion time wins
-        snapdragon_time = next((r['result'].get('time') for r in results 
-                               if r['device'] == 'snapdragon'), float('inf'))
-        intel_time = next((r['result'].get('time') for r in results 
-                          if r['device'] == 'intel'), float('inf'))
-        
-        if snapdragon_time < intel_time:
-            winner = 'snapdragon'
-            ratio = round(intel_time / snapdragon_time, 1)
-            message = f"Snapdragon wins by {ratio}x! " + random.choice(VICTORY_MESSAGES['ai_faster'])
-        else:
-            winner = 'intel'
-            message = "Intel wins! (Please verify test conditions)"
+def share_demo_state():
+    if backend.shared:
+        backend.put('state', 'demo', demo_state)
+        backend.publish('demo_state', demo_state)
+
+def platform_peaks(race):
+    """Hottest max_temperature each platform reported in a thermal race"""
+    peaks = {}
+    for device_id, result in race.results.items():
+        value = result_score(race.scenario, result)
+        platform = race.platforms[device_id]
+        if value is not None and (platform not in peaks or value > peaks[platform]):
+            peaks[platform] = value
+    return peaks
+
+def has_ratio(value):
+    return value is not None and math.isfinite(value)
+
+def ratio_interval(outcome):
+    """The advantage ratio's confidence interval as text, or None if unbounded"""
+    if not outcome['ratio_ci']:
+        return None
+    low, high = outcome['ratio_ci']
+    if has_ratio(high):
+        return f"{outcome['confidence']:.0%} CI {low}-{high}x"
+    if has_ratio(low):
+        return f"{outcome['confidence']:.0%} CI {low}x or more"
+    return None
+
+def victory_message(race, outcome):
+    """Headline for a race outcome"""
+    winner = outcome['winner']
+    interval = ratio_interval(outcome)
+    if winner is None:
+        if outcome['tie']:
+            score = outcome['scores'][outcome['leader']]
+            return f"Dead heat: {outcome['leader'].capitalize()} and {outcome['runner_up'].capitalize()} both scored {score}"
+        if outcome['leader']:
+            lead = f"leads by {outcome['ratio']}x" if has_ratio(outcome['ratio']) else "leads"
+            detail = f" ({interval})" if interval else ""
+            return (f"Too close to call: {outcome['leader'].capitalize()} {lead}{detail} "
+                    f"but {outcome['reason']}")
+        if race.state == 'timed_out':
+            return "Time's up! Not enough finishers to call a winner"
+        return "No contest - at least two platforms need to finish"
+    
+    if winner != 'snapdragon':
+        return f"{winner.capitalize()} wins! (Please verify test conditions)"
+    
+    key, template, plain = VICTORY_FORMATS[race.scenario]
+    if not has_ratio(outcome['ratio']):
+        template = plain
+    # Scores are medians of the runs; the thermal headline quotes real peaks
+    scores = platform_peaks(race) if race.scenario == 'thermal_test' else outcome['scores']
+    headline = template.format(winner=winner.capitalize(),
+                               best=scores[winner],
+                               other=scores[outcome['runner_up']],
+                               ratio=outcome['ratio'])
+    runs = f"{outcome['stats'][winner]['runs']} runs"
+    uncertainty = f"({interval}, {runs}) " if interval else f"({runs}) "
+    return headline + uncertainty + random.choice(VICTORY_MESSAGES[key])
+
+def declare_winner(race):
+    """Score a closed race, announce the winner and persist it"""
+    if tournament:
+        tournament.race_closed(race)
+    outcome = race.outcome()
+    message = victory_message(race, outcome)
+    logger.info(f"Race {race.race_id} ({race.scenario}) {race.state}: {outcome['scores']}")
     
     # Broadcast winner
-    socketio.emit('winner_declared', {
-        'winner': winner,
+    emit_to_dashboards('winner_declared', {
+        'winner': outcome['winner'],
         'message': message,
-        'test': test,
-        'timestamp': datetime.now().isoformat()
+        'test': race.scenario,
+        'race_id': race.race_id,
+        'state': race.state,
+        'scores': outcome['scores'],
+        'ratio': outcome['ratio'],
+        'ratio_ci': outcome['ratio_ci'],
+        'p_superior': outcome['p_superior'],
+        'significant': outcome['significant'],
+        'tie': outcome['tie'],
+        'confidence': outcome['confidence'],
+        'stats': outcome['stats'],
+        'reason': outcome['reason'],
+        'missing': outcome['missing'],
+        'timestamp': now_iso()
     })
     
-    # Reset for next test
-    demo_state['results'] = []
+    # Persist the race with a telemetry summary of its window
+    telemetry = history.summary(race.started_at, race.finished_at, race.participants)
+    results_store.finish_race(race.race_id, race.finished_at, outcome['winner'], message, telemetry)
+    if tournament:
+        tournament.race_scored(race, outcome)
 
-@socketio.on('disconnect')
-def handle_disconnect():
+def handle_disconnect(sid):
     """Handle client disconnection"""
-    logger.info(f"Client disconnected: {request.sid}")
+    logger.info(f"Client disconnected: {sid}")
+    client_roles.pop(sid, None)
+    outbox.remove_client(sid)
+    device = registry.disconnect_sid(sid)
+    if device:
+        liveness.forget(device['device_id'])
+        share_device(device, left=True)
+        emit_to_dashboards('device_status', {
+            'device': device['platform'],
+            'device_id': device['device_id'],
+            'status': 'disconnected',
+            'timestamp': now_iso()
+        })
+        
+        if tournament:
+            tournament.device_left(device['device_id'])
+        
+        # Don't leave the race waiting on a device that is gone
+        if current_race and current_race.drop(device['device_id'], clock.time()):
+            declare_winner(current_race)
+
+def handle_heartbeat_timeout(device_id, latency):
+    """A device stopped reporting: flag it once, on the transition"""
+    device = registry.get(device_id)
+    if device is None or not device['connected'] or device.get('worker') is not None:
+        return
+    
+    logger.info(f"{device_id} missed heartbeats (detected {latency * 1000:.0f} ms after deadline)")
+    registry.set_connected(device, False)
+    share_device(device)
+    if tournament:
+        tournament.device_left(device_id)
+    emit_to_dashboards('device_status', {
+        'device': device['platform'],
+        'device_id': device_id,
+        'status': 'disconnected',
+        'reason': 'heartbeat_timeout',
+        'detection_latency': round(latency, 3),
+        'timestamp': now_iso()
+    })
 
 def periodic_health_check():
-    """Periodic health check for connected devices"""
+    """Periodic race timeout check (device liveness runs on its own deadlines)"""
     while True:
-        time.sleep(5)
-        for device_type, device_info in connected_devices.items():
-            if device_info['connected'] and device_info['last_seen']:
-                last_seen = datetime.fromisoformat(device_info['last_seen'])
-                if (datetime.now() - last_seen).seconds > 10:
-                    device_info['connected'] = False
-                    socketio.emit('device_status', {
-                        'device': device_type,
-                        'status': 'disconnected',
-                        'timestamp': datetime.now().isoformat()
-                    })
+        clock.sleep(5)
+        if current_race and current_race.check_timeout(clock.time()):
+            declare_winner(current_race)
+
+# Messages from other workers (see configure_backend)
+
+def on_remote_broadcast(message):
+    replay_log.publish(message['event'], message['payload'], fan_out)
+
+def on_remote_device(message):
+    record = message['device']
+    if registry.mirror(record, record['worker']) is None:
+        return
+    liveness.forget(record['device_id'])
+    if message['left'] and tournament:
+        tournament.device_left(record['device_id'])
+    # Don't leave a race here waiting on a device that left another worker
+    if message['left'] and current_race and current_race.drop(record['device_id'], clock.time()):
+        declare_winner(current_race)
+
+def on_remote_command(message):
+    if message['device_id'] is None:
+        emit_to(message['event'], message['payload'], AGENTS_ROOM)
+        return
+    device = registry.get(message['device_id'])
+    if device and device.get('worker') is None and device['connected']:
+        emit_to(message['event'], message['payload'], device['sid'])
+
+def on_remote_device_event(message):
+    if message['event'] == 'test_complete' and owns_race(message['device_id']):
+        complete_test(message['device_id'], message['platform'], message['data'].get('result'))
+    elif message['event'] == 'test_ready' and tournament:
+        tournament.device_ready(message['device_id'], message['data'].get('scenario'))
+
+def on_remote_demo_state(state):
+    demo_state.update(state)
+    # A race started or stopped on another worker ends ours
+    if current_race and (not state.get('active') or state.get('race_id') != current_race.race_id):
+        stop_tournament()
+        now = clock.time()
+        if current_race.cancel(now):
+            results_store.finish_race(current_race.race_id, now, None, 'Superseded on another worker')
+
+REMOTE_HANDLERS = {
+    'broadcast': on_remote_broadcast,
+    'device': on_remote_device,
+    'command': on_remote_command,
+    'device_event': on_remote_device_event,
+    'demo_state': on_remote_demo_state
+}
+
+def configure_backend(settings=None, worker_id=None):
+    """Share devices, race state and broadcasts with the other workers on a backend"""
+    global backend
+    settings = dict(config.get('state_backend', {}), **(settings or {}))
+    backend = create_backend(settings, worker_id)
+    for channel, handler in REMOTE_HANDLERS.items():
+        def on_message(message, handler=handler, received=BUS_RECEIVED.labels(channel)):
+            received.inc()
+            handler(message)
+        backend.subscribe(channel, on_message)
+    
+    # Catch up on what workers that started earlier already know
+    for record in backend.items('devices').values():
+        if record['worker'] != backend.worker_id:
+            registry.mirror(record, record['worker'])
+    demo_state.update(backend.items('state').get('demo', {}))
+    backend.start()
+    logger.info(f"Worker {backend.worker_id} on {settings.get('type', 'memory')} state backend")
+    return backend
+
+# Socket.IO events served by every transport: event -> handler(sid, *args)
+SOCKET_EVENTS = {
+    'connect': handle_connect,
+    'disconnect': handle_disconnect,
+    'device_register': handle_device_register,
+    'metrics_update': handle_metrics_update,
+    'start_demo': handle_start_demo,
+    'test_complete': handle_test_complete,
+    'image_generated': handle_image_generated,
+    'test_progress': handle_test_progress,
+    'stop_demo': handle_stop_demo,
+    'start_tournament': handle_start_tournament,
+    'stop_tournament': handle_stop_tournament,
+    'test_ready': handle_test_ready
+}
+
+def instrument(event, handler):
+    """Count and time a socket handler"""
+    events_in = EVENTS_IN.labels(event)
+    latency = HANDLER_SECONDS.labels(event)
+    errors = HANDLER_ERRORS.labels(event)
+    
+    def instrumented(sid, *args):
+        events_in.inc()
+        event_debug.debug(event, "%s from %s", event, sid)
+        if recorder:
+            recorder.record('in', event, sid, list(args))
+        started = time.perf_counter()
+        try:
+            return handler(sid, *args)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - started)
+    return instrumented
+
+# Every handler is counted and timed, whichever server mode registers it
+SOCKET_EVENTS = {event: instrument(event, handler) for event, handler in SOCKET_EVENTS.items()}
+
+for event, handler in SOCKET_EVENTS.items():
+    socketio.on_event(event, lambda *args, handler=handler: handler(request.sid, *args))
+
+def start_recording(path=None):
+    """Capture every inbound and outbound event to an append-only session log"""
+    global recorder
+    log_config = config.get('session_log', {})
+    if path is None:
+        stamp = datetime.fromtimestamp(clock.time()).strftime('%Y%m%d-%H%M%S')
+        path = str(Path(log_config.get('directory', 'sessions')) / f"session-{stamp}.jsonl")
+    recorder = SessionRecorder(path, clock=clock, index_interval=log_config.get('index_interval', 1.0))
+    logger.info(f"Recording session to {path}")
+    return recorder
+
+def isolate_results_store(path=None):
+    """Send race history to a throwaway database (by default in a temp dir)
+
+    Replays run through the real handlers; without this their races would
+    land in results.db and skew the leaderboards and percentiles.
+    """
+    global results_store
+    path = path or str(Path(tempfile.mkdtemp(prefix='championship-replay-')) / 'results.db')
+    results_store = ResultsStore(path)
+    logger.info(f"Replay results go to {path}")
+    return results_store
+
+def start_replay(path, speed=1.0):
+    """Drive the server from a recorded session instead of live agents"""
+    global transport
+    transport = ReplayTransport(transport)
+    isolate_results_store(config.get('storage', {}).get('replay_results_db'))
+    logger.info(f"Replaying {path} at {'max' if speed == float('inf') else speed}x speed")
+    return SessionReplayer(SessionLog(path), SOCKET_EVENTS, speed=speed, clock=clock).start()
+
+def apply_config_reload(applied):
+    """Pick up hot-reloaded settings that were copied out of config at startup"""
+    global commentary
+    if 'ui.chart_update_rate' in applied:
+        broadcaster.interval = config['ui']['chart_update_rate'] / 1000
+    if 'commentary' in applied:
+        feed = commentary.feed
+        commentary = build_commentary()
+        commentary.feed.extend(feed)
+
+def start_background_tasks():
+    """Liveness, race timeouts, the metrics tick and config hot reload"""
+    ConfigWatcher(clock=clock).start().on_reload(apply_config_reload)
+    liveness.start(handle_heartbeat_timeout)
+    clock.start_thread(periodic_health_check)
+    broadcaster.start()
+    outbox.start()
 
 if __name__ == '__main__':
-    # Start health check thread
-    import threading
-    health_thread = threading.Thread(target=periodic_health_check, daemon=True)
-    health_thread.start()
+    parser = argparse.ArgumentParser(description='Performance Championship Server (threading mode)')
+    parser.add_argument('--port', type=int, default=config['network']['server_port'])
+    parser.add_argument('--no-debug', action='store_true',
+                       help='Run without the Flask debugger and reloader')
+    parser.add_argument('--record', nargs='?', const='', metavar='PATH',
+                       help='Record all Socket.IO traffic (default path under session_log.directory)')
+    parser.add_argument('--replay', metavar='PATH', help='Replay a recorded session instead of live agents')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help='Replay speed multiplier, or "max"')
+    parser.add_argument('--backend', type=parse_backend, metavar='SPEC',
+                       help='State backend shared with other workers: "memory" or "sqlite[:PATH]"')
+    parser.add_argument('--worker-id', help='Name of this worker on the state backend')
+    args = parser.parse_args()
+    
+    configure_logging(config.get('logging'), f"server-{args.worker_id}" if args.worker_id else 'server')
+    if args.record is not None:
+        start_recording(args.record or None)
+    configure_backend(args.backend, args.worker_id)
+    start_background_tasks()
+    if args.replay:
+        start_replay(args.replay, args.speed)
     
     # Get server configuration
     server_ip = config['network']['server_ip']
-    server_port = config['network']['server_port']
+    server_port = args.port
     
     logger.info(f"Starting Performance Championship Server on {server_ip}:{server_port}")
     logger.info("Dashboard will be available at http://{server_ip}:{server_port}")
@@ -326,4 +1054,7 @@ if __name__ == '__main__':
     socketio.run(app, 
                  host='0.0.0.0',  # Listen on all interfaces
                  port=server_port,
-                 debug=True)
+                 debug=not args.no_debug,
+                 # The reloader would run a second copy of the recorder/replayer
+                 use_reloader=not args.no_debug and args.record is None and not args.replay,
+                 allow_unsafe_werkzeug=args.no_debug)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Session Log for Snapdragon vs Intel Performance Championship
+Append-only recording of Socket.IO traffic and time-indexed replay
+"""
+
+import json
+import queue
+import logging
+import argparse
+import threading
+from bisect import bisect_right
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sim_clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+REPLAY_SID_PREFIX = 'replay:'
+
+# (seconds since session start, 'in' | 'out', event, sid or room, data)
+Record = Tuple[float, str, str, Optional[str], object]
+
+
+class SessionRecorder:
+    """Streams every recorded event to a JSON-lines file off the caller's thread
+
+    Each line is a compact array [t, direction, event, sid, data] with t in
+    seconds since the session started. Every `index_interval` seconds of
+    session time the writer also appends "t offset" to a .idx sidecar, so a
+    reader can seek straight to any point in a long recording.
+    """
+
+    def __init__(self, path: str, clock: Optional[Clock] = None, index_interval: float = 1.0):
+        self.path = Path(path)
+        self.index_path = Path(f"{path}.idx")
+        self.clock = clock or get_clock()
+        self.index_interval = index_interval
+        self._t0 = self.clock.monotonic()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.records = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 'x': a session log is never overwritten or appended to by a later run
+        self._file = open(self.path, 'xb')
+        self._index = open(self.index_path, 'w')
+        header = {'session': self.path.stem, 'version': FORMAT_VERSION, 'started_at': self.clock.time()}
+        self._offset = self._file.write(json.dumps(header).encode() + b'\n')
+        self._file.flush()
+        self._next_index = 0.0
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name='session-writer')
+        self._writer.start()
+
+    def record(self, direction: str, event: str, sid: Optional[str], data):
+        """Queue one event; never blocks on disk"""
+        self._queue.put((round(self.clock.monotonic() - self._t0, 4), direction, event, sid, data))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            while item is not None:
+                if isinstance(item, threading.Event):
+                    self._file.flush()
+                    self._index.flush()
+                    item.set()
+                else:
+                    self._write(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            # Queue drained: make what we have visible to readers following the file
+            self._file.flush()
+            self._index.flush()
+
+    def _write(self, record: Record):
+        try:
+            line = json.dumps(record, separators=(',', ':'), default=str).encode() + b'\n'
+        except (TypeError, ValueError) as e:
+            logger.error(f"Unrecordable {record[2]} event: {e}")
+            return
+        if record[0] >= self._next_index:
+            self._index.write(f"{record[0]} {self._offset}\n")
+            self._next_index = record[0] + self.index_interval
+        self._offset += self._file.write(line)
+        self.records += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything recorded so far is on disk"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+
+class SessionLog:
+    """Reader for a recorded session; safe to use while the file is still growing"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            first = f.readline()
+            self.header = json.loads(first)
+            self._data_offset = len(first)
+        self._index_times: List[float] = []
+        self._index_offsets: List[int] = []
+        index_path = Path(f"{path}.idx")
+        if index_path.exists():
+            for line in index_path.read_text().splitlines():
+                t, offset = line.split()
+                self._index_times.append(float(t))
+                self._index_offsets.append(int(offset))
+
+    def _seek_offset(self, start: Optional[float]) -> int:
+        if start is None or not self._index_times:
+            return self._data_offset
+        position = bisect_right(self._index_times, start) - 1
+        return self._index_offsets[position] if position >= 0 else self._data_offset
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Record]:
+        """Records with start <= t <= end, seeking via the index"""
+        with open(self.path, 'rb') as f:
+            f.seek(self._seek_offset(start))
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # Partially written tail of a live recording
+                t, direction, event, sid, data = json.loads(line)
+                if start is not None and t < start:
+                    continue
+                if end is not None and t > end:
+                    break
+                yield t, direction, event, sid, data
+
+    def summary(self) -> Dict:
+        counts = Counter()
+        duration = 0.0
+        for t, direction, event, _, _ in self.records():
+            counts[f"{direction}:{event}"] += 1
+            duration = t
+        return {
+            'header': self.header,
+            'duration': duration,
+            'records': sum(counts.values()),
+            'events': dict(counts.most_common())
+        }
+
+
+class ReplayTransport:
+    """Wraps the live transport so replayed (recorded) sids can be driven safely
+
+    Replayed clients have no socket: room changes and direct emits to them
+    are dropped, while broadcasts to rooms still reach real dashboards.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    @staticmethod
+    def _is_replay(sid) -> bool:
+        return isinstance(sid, str) and sid.startswith(REPLAY_SID_PREFIX)
+
+    def emit(self, event, data, to=None):
+        if not self._is_replay(to):
+            self.inner.emit(event, data, to=to)
+
+    def enter_room(self, sid, room):
+        if not self._is_replay(sid):
+            self.inner.enter_room(sid, room)
+
+    def leave_room(self, sid, room):
+        if not self._is_replay(sid):
+            self.inner.leave_room(sid, room)
+
+    def send_queue_depths(self):
+        return self.inner.send_queue_depths()
+
+    def send_queue_depth(self, sid):
+        return 0 if self._is_replay(sid) else self.inner.send_queue_depth(sid)
+
+
+class SessionReplayer:
+    """Feeds a recording's inbound events back through the socket handlers
+
+    speed=1 reproduces the original timing, speed=N compresses it N times and
+    speed=inf sends everything back to back (for profiling the server).
+    """
+
+    def __init__(self, log: SessionLog, handlers: Dict[str, Callable], speed: float = 1.0,
+                 start: Optional[float] = None, end: Optional[float] = None,
+                 clock: Optional[Clock] = None):
+        self.log = log
+        self.handlers = handlers
+        self.speed = speed
+        self.start_at = start
+        self.end_at = end
+        self.clock = clock or get_clock()
+        self.stats: Dict = {}
+
+    def run(self) -> Dict:
+        replayed = errors = 0
+        first_t = last_t = None
+        started = self.clock.monotonic()
+        for t, direction, event, sid, args in self.log.records(self.start_at, self.end_at):
+            handler = self.handlers.get(event)
+            if direction != 'in' or handler is None:
+                continue
+            first_t = t if first_t is None else first_t
+            last_t = t
+            if self.speed != float('inf'):
+                delay = (t - first_t) / self.speed - (self.clock.monotonic() - started)
+                if delay > 0:
+                    self.clock.sleep(delay)
+            try:
+                handler(f"{REPLAY_SID_PREFIX}{sid}", *(args or []))
+                replayed += 1
+            except Exception as e:
+                errors += 1
+                logger.error(f"Replayed {event} failed: {e}")
+
+        elapsed = self.clock.monotonic() - started
+        self.stats = {
+            'events': replayed,
+            'errors': errors,
+            'recorded_seconds': round((last_t or 0) - (first_t or 0), 3),
+            'elapsed_seconds': round(elapsed, 3),
+            'events_per_second': round(replayed / elapsed, 1) if elapsed > 0 else None,
+            'speed': 'max' if self.speed == float('inf') else self.speed
+        }
+        logger.info(f"Replay finished: {self.stats}")
+        return self.stats
+
+    def start(self):
+        """Replay on a background thread"""
+        return self.clock.start_thread(self.run, name='session-replay')
+
+
+def parse_speed(value: str) -> float:
+    """'max' or a positive multiplier"""
+    if value == 'max':
+        return float('inf')
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError('speed must be positive or "max"')
+    return speed
+
+
+def main():
+    """Inspect a recording, or replay it headlessly to profile the server"""
+    parser = argparse.ArgumentParser(description='Championship session log tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    info = sub.add_parser('info', help='Summarize a recorded session')
+    info.add_argument('log')
+    replay = sub.add_parser('replay', help='Feed a session through the server handlers (no sockets)')
+    replay.add_argument('log')
+    replay.add_argument('--speed', type=parse_speed, default=float('inf'),
+                        help='Multiplier, or "max" (default) for back-to-back events')
+    replay.add_argument('--start', type=float, help='Session time to start from (seconds)')
+    replay.add_argument('--end', type=float, help='Session time to stop at (seconds)')
+    args = parser.parse_args()
+
+    log = SessionLog(args.log)
+    if args.command == 'info':
+        print(json.dumps(log.summary(), indent=2))
+        return
+
+    import server
+    server.transport = ReplayTransport(server.transport)
+    server.isolate_results_store(server.config.get('storage', {}).get('replay_results_db'))
+    replayer = SessionReplayer(log, server.SOCKET_EVENTS, speed=args.speed,
+                               start=args.start, end=args.end, clock=server.clock)
+    print(json.dumps(replayer.run(), indent=2))
+    print(server.instruments.render())
+
+
+if __name__ == '__main__':
+    main()
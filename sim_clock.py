@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Injectable Clock for Snapdragon vs Intel Performance Championship
+Real wall-clock timing for the demo floor, time-warp for tests and rehearsals
+"""
+
+import os
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+class Clock:
+    """Real time: thin wrapper over the time and threading modules"""
+    virtual = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def event(self):
+        return threading.Event()
+
+    def start_thread(self, target: Callable, args: tuple = (), daemon: bool = True,
+                     name: Optional[str] = None) -> threading.Thread:
+        thread = threading.Thread(target=target, args=args, daemon=daemon, name=name)
+        thread.start()
+        return thread
+
+    def join(self, thread: threading.Thread, timeout: Optional[float] = None):
+        thread.join(timeout)
+
+
+class _Sleeper:
+    __slots__ = ('thread', 'woken')
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.woken = False
+
+
+class VirtualEvent:
+    """threading.Event counterpart whose timed waits run on virtual time"""
+
+    def __init__(self, clock: 'VirtualClock'):
+        self._clock = clock
+        self._flag = False
+        self._sleepers = []
+
+    def is_set(self) -> bool:
+        return self._flag
+
+    def set(self):
+        with self._clock._cond:
+            self._flag = True
+            for sleeper in self._sleepers:
+                self._clock._wake(sleeper)
+            self._sleepers = []
+            self._clock._cond.notify_all()
+
+    def clear(self):
+        with self._clock._cond:
+            self._flag = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._clock._cond:
+            if self._flag:
+                return True
+            sleeper = self._clock._enqueue(timeout)
+            self._sleepers.append(sleeper)
+            self._clock._block(sleeper)
+            return self._flag
+
+
+class VirtualClock(Clock):
+    """Time-warp clock: a discrete-event scheduler over the threads that use it
+
+    Virtual time only moves when every actor thread is asleep on the clock; it
+    then jumps straight to the earliest deadline and wakes that sleeper alone.
+    Sleeps therefore cost no real time, while wake-ups happen in exactly the
+    order they would on a real clock. Actors are threads started through
+    start_thread() plus any thread that has slept on the clock; a thread that
+    blocks on something else while others need time to pass should use join(),
+    and a driver starting several actors together should do so inside hold().
+    """
+    virtual = True
+
+    def __init__(self, start_time: Optional[float] = None):
+        self._epoch = time.time() if start_time is None else start_time
+        self._now = 0.0
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+        self._deadlines = []
+        self._actors = set()
+        self._sleeping = set()
+        self._idle = set()
+        self._holds = 0
+
+    def time(self) -> float:
+        return self._epoch + self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def event(self) -> VirtualEvent:
+        return VirtualEvent(self)
+
+    def sleep(self, seconds: float):
+        with self._cond:
+            self._block(self._enqueue(max(seconds, 0.0)))
+
+    def start_thread(self, target: Callable, args: tuple = (), daemon: bool = True,
+                     name: Optional[str] = None) -> threading.Thread:
+        def run():
+            try:
+                target(*args)
+            finally:
+                with self._cond:
+                    self._actors.discard(thread)
+                    self._advance()
+
+        thread = threading.Thread(target=run, daemon=daemon, name=name)
+        with self._cond:
+            # Registered before it starts so time cannot run ahead of its first step
+            self._actors.add(thread)
+        thread.start()
+        return thread
+
+    def join(self, thread: threading.Thread, timeout: Optional[float] = None):
+        current = threading.current_thread()
+        with self._cond:
+            self._idle.add(current)
+            self._advance()
+        try:
+            thread.join(timeout)
+        finally:
+            with self._cond:
+                self._idle.discard(current)
+
+    @contextmanager
+    def hold(self):
+        """Freeze virtual time while the caller sets up actors"""
+        with self._cond:
+            self._holds += 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self._holds -= 1
+                self._advance()
+
+    # Scheduler internals; all called with self._cond held
+
+    def _enqueue(self, timeout: Optional[float]) -> _Sleeper:
+        current = threading.current_thread()
+        self._actors.add(current)
+        sleeper = _Sleeper(current)
+        self._sleeping.add(current)
+        if timeout is not None:
+            heapq.heappush(self._deadlines, (self._now + timeout, next(self._sequence), sleeper))
+        return sleeper
+
+    def _wake(self, sleeper: _Sleeper):
+        if not sleeper.woken:
+            sleeper.woken = True
+            self._sleeping.discard(sleeper.thread)
+
+    def _block(self, sleeper: _Sleeper):
+        self._advance()
+        while not sleeper.woken:
+            # The timeout only matters when an actor exits without telling us
+            self._cond.wait(0.05)
+            if not sleeper.woken:
+                self._advance()
+
+    def _advance(self):
+        """Jump to the next deadline if no actor is still running"""
+        for thread in list(self._actors):
+            if thread.ident is not None and not thread.is_alive():
+                self._actors.discard(thread)
+        if self._holds or any(t not in self._sleeping and t not in self._idle for t in self._actors):
+            return
+
+        while self._deadlines:
+            deadline, _, sleeper = heapq.heappop(self._deadlines)
+            if sleeper.woken:
+                continue
+            self._now = max(self._now, deadline)
+            self._wake(sleeper)
+            self._cond.notify_all()
+            return
+
+
+_default_clock: Optional[Clock] = None
+
+
+def get_clock() -> Clock:
+    """Process-wide clock; DEMO_TIME_WARP=1 selects the virtual clock"""
+    global _default_clock
+    if _default_clock is None:
+        _default_clock = VirtualClock() if os.environ.get('DEMO_TIME_WARP') else Clock()
+    return _default_clock
+
+
+def set_clock(clock: Clock):
+    """Replace the process-wide clock (tests and rehearsals)"""
+    global _default_clock
+    _default_clock = clock
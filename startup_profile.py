@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler for Snapdragon vs Intel Performance Championship
+Lazy imports, startup phase timing and an import-time budget for the agent
+"""
+
+import re
+import sys
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing each lazily loaded module, filled in on first use
+IMPORT_TIMES: Dict[str, float] = {}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def module_available(name: str) -> bool:
+    """True if name could be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access
+
+    prefetch() starts the import on a background thread, so a heavy module
+    the agent needs soon (socketio) loads while the main thread gets on
+    with device detection instead of ahead of it.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMES[self._name] = time.perf_counter() - start
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def prefetch(self) -> 'LazyModule':
+        threading.Thread(target=self._prefetch, daemon=True, name=f"import-{self._name}").start()
+        return self
+
+    def _prefetch(self):
+        try:
+            self.load()
+        except ImportError as e:
+            # Reported again, to the caller, on first real use
+            logger.debug(f"Prefetching {self._name} failed: {e}")
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def process_start() -> float:
+    """Wall-clock time this process was started (falls back to now)"""
+    try:
+        import psutil
+        return psutil.Process().create_time()
+    except Exception:
+        return time.time()
+
+
+class StartupProfile:
+    """Wall-clock phases from process start to connected, checked against a budget
+
+    Each mark() closes a phase that began at the previous mark (the first
+    one at process start, so it includes interpreter start-up). The budget
+    maps phase names, and 'total', to seconds.
+    """
+
+    def __init__(self, budget: Optional[Dict[str, float]] = None, started: Optional[float] = None):
+        self.budget = dict(budget or {})
+        self.started = started if started is not None else process_start()
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.started
+
+    def mark(self, phase: str, now: Optional[float] = None) -> float:
+        now = now if now is not None else time.time()
+        elapsed = max(now - self._last, 0.0)
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def over_budget(self) -> List[str]:
+        """A message for each phase (and the total) that exceeded its budget"""
+        spent = dict(self.phases)
+        spent['total'] = self.total
+        return [f"{phase} took {spent[phase]:.2f}s (budget {limit:.2f}s)"
+                for phase, limit in self.budget.items() if phase in spent and spent[phase] > limit]
+
+    def report(self) -> Dict:
+        return {
+            'phases': {phase: round(elapsed, 4) for phase, elapsed in self.phases},
+            'total': round(self.total, 4),
+            'lazy_imports': {name: round(seconds, 4) for name, seconds in IMPORT_TIMES.items()},
+            'over_budget': self.over_budget()
+        }
+
+
+def parse_importtime(text: str, root: Optional[str] = None, depth: int = 0) -> List[Dict]:
+    """Imports from `python -X importtime` output, slowest first
+
+    With root, only that top-level import and what it pulled in (the
+    interpreter's own start-up imports are listed too). depth 0 keeps
+    top-level imports, 1 adds their direct imports, and so on; cumulative
+    time includes everything below.
+    """
+    rows = []
+    for line in text.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({'module': module, 'level': (len(indent) - 1) // 2,
+                         'self': int(self_us) / 1e6, 'cumulative': int(cumulative_us) / 1e6})
+
+    if root is not None:
+        # Children are printed before their parent
+        end = max((i for i, row in enumerate(rows) if row['module'] == root and row['level'] == 0),
+                  default=None)
+        if end is None:
+            return []
+        start = end
+        while start > 0 and rows[start - 1]['level'] > 0:
+            start -= 1
+        rows = rows[start:end + 1]
+
+    entries = [row for row in rows if row['level'] <= depth]
+    return sorted(entries, key=lambda entry: entry['cumulative'], reverse=True)
+
+
+def import_breakdown(module: str, depth: int = 1) -> List[Dict]:
+    """Import-time breakdown of module, measured in a fresh interpreter
+
+    A diagnostic for --startup-profile, never run on the start-up path.
+    """
+    import subprocess
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+    return parse_importtime(result.stderr, root=module, depth=depth)
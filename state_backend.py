@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+State Backend for Snapdragon vs Intel Performance Championship
+Shared key/value state and pub/sub between server workers (in-process or SQLite)
+"""
+
+import json
+import queue
+import argparse
+import sqlite3
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from structured_logging import RateLimitedLogger
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (created);
+"""
+
+
+class StateBackend:
+    """Shared state and messaging seen by every server worker
+
+    State is a set of namespaces of JSON values. Messages are fire-and-forget:
+    a subscriber receives what other workers publish after it started, never
+    its own messages (the publisher has already applied them locally).
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or uuid.uuid4().hex[:8]
+        self._subscribers: Dict[str, List[Callable[[Dict], None]]] = {}
+
+    def subscribe(self, channel: str, callback: Callable[[Dict], None]):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, channel: str, message: Dict):
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"{channel} subscriber failed: {e}")
+
+    def put(self, namespace: str, key: str, value):
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def items(self, namespace: str) -> Dict[str, object]:
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: Dict):
+        raise NotImplementedError
+
+    @property
+    def shared(self) -> bool:
+        """True if other workers can be on the other end"""
+        return False
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class InProcessBackend(StateBackend):
+    """Plain dicts; a single worker unless peers are created with peer=...
+
+    Peers share one state dict and deliver messages to each other
+    synchronously, which lets tests run several workers in one process.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, peer: Optional['InProcessBackend'] = None):
+        super().__init__(worker_id)
+        if peer is None:
+            self._state: Dict[str, Dict[str, object]] = {}
+            self._members: List[InProcessBackend] = []
+            self._lock = threading.Lock()
+        else:
+            self._state, self._members, self._lock = peer._state, peer._members, peer._lock
+        self._members.append(self)
+
+    def put(self, namespace: str, key: str, value):
+        with self._lock:
+            self._state.setdefault(namespace, {})[key] = value
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._state.get(namespace, {}).pop(key, None)
+
+    def items(self, namespace: str) -> Dict[str, object]:
+        with self._lock:
+            return dict(self._state.get(namespace, {}))
+
+    def publish(self, channel: str, message: Dict):
+        peers = [member for member in self._members if member is not self]
+        if not peers:
+            return
+        # Peers get their own copy, as they would over a real bus
+        body = json.dumps(message, default=str)
+        for peer in peers:
+            peer._dispatch(channel, json.loads(body))
+
+    @property
+    def shared(self) -> bool:
+        return len(self._members) > 1
+
+
+class SQLiteBackend(StateBackend):
+    """Cross-process backend on one SQLite (WAL) file, for workers on the same host
+
+    Writes are queued and committed in batches by a writer thread, so a
+    handler never waits on the database. A poller thread reads messages
+    with ids past the last one it saw and hands other workers' messages to
+    subscribers; messages older than `retention` seconds are trimmed.
+    """
+
+    def __init__(self, path: str = 'state.db', worker_id: Optional[str] = None,
+                 poll_interval: float = 0.02, retention: float = 60.0, batch_size: int = 500):
+        super().__init__(worker_id)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue()
+        self._local = threading.local()
+        self._threads: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        # The poller retries every poll_interval; a locked or missing file must not flood the log
+        self._errors = RateLimitedLogger(logger)
+        self.stats = {'published': 0, 'received': 0, 'batches': 0}
+
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        # Only messages published after this worker joined are delivered to it
+        self._last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM messages').fetchone()[0]
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def put(self, namespace: str, key: str, value):
+        self._queue.put(('INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?)',
+                         (namespace, key, json.dumps(value, default=str), self.worker_id)))
+
+    def delete(self, namespace: str, key: str):
+        self._queue.put(('DELETE FROM state WHERE namespace = ? AND key = ?', (namespace, key)))
+
+    def items(self, namespace: str) -> Dict[str, object]:
+        rows = self._reader().execute('SELECT key, value FROM state WHERE namespace = ?', (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    def publish(self, channel: str, message: Dict):
+        self.stats['published'] += 1
+        self._queue.put(('INSERT INTO messages (channel, origin, body, created) VALUES (?, ?, ?, ?)',
+                         (channel, self.worker_id, json.dumps(message, default=str), time.time())))
+
+    @property
+    def shared(self) -> bool:
+        return True
+
+    def start(self):
+        """Start the writer and poller threads"""
+        if not self._threads:
+            for target, name in ((self._write_loop, 'state-writer'), (self._poll_loop, 'state-poller')):
+                thread = threading.Thread(target=target, daemon=True, name=name)
+                thread.start()
+                self._threads.append(thread)
+
+    def close(self):
+        """Stop polling; queued writes are still committed"""
+        self._stopped.set()
+        self._queue.put(None)
+
+    def _write_loop(self):
+        conn = self._connect()
+        last_trim = time.time()
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                closing = True
+                batch = [item for item in batch if item is not None]
+
+            try:
+                with conn:
+                    for sql, params in batch:
+                        conn.execute(sql, params)
+                    if time.time() - last_trim >= self.retention:
+                        last_trim = time.time()
+                        conn.execute('DELETE FROM messages WHERE created < ?', (last_trim - self.retention,))
+                self.stats['batches'] += 1
+            except sqlite3.Error as e:
+                self._errors.error('write', f"Failed to write {len(batch)} state rows: {e}")
+        conn.close()
+
+    def _poll_loop(self):
+        conn = self._connect()
+        while not self._stopped.is_set():
+            try:
+                rows = conn.execute('SELECT id, channel, origin, body FROM messages WHERE id > ? '
+                                    'ORDER BY id LIMIT ?', (self._last_id, self.batch_size)).fetchall()
+            except sqlite3.Error as e:
+                self._errors.error('poll', f"Failed to poll messages: {e}")
+                rows = []
+            for message_id, channel, origin, body in rows:
+                self._last_id = message_id
+                if origin != self.worker_id:
+                    self.stats['received'] += 1
+                    self._dispatch(channel, json.loads(body))
+            if len(rows) < self.batch_size:
+                self._stopped.wait(self.poll_interval)
+        conn.close()
+
+
+def create_backend(settings: Optional[Dict] = None, worker_id: Optional[str] = None) -> StateBackend:
+    """Backend from config: {"type": "memory"} or {"type": "sqlite", "path": ...}"""
+    settings = dict(settings or {})
+    kind = settings.pop('type', 'memory')
+    if kind == 'memory':
+        return InProcessBackend(worker_id)
+    if kind == 'sqlite':
+        return SQLiteBackend(worker_id=worker_id, **settings)
+    raise ValueError(f"Unknown state backend: {kind}")
+
+
+def parse_backend(spec: str) -> Dict:
+    """'memory' or 'sqlite[:PATH]' as backend settings (for --backend)"""
+    kind, _, path = spec.partition(':')
+    if kind == 'memory' and not path:
+        return {'type': 'memory'}
+    if kind == 'sqlite':
+        return {'type': 'sqlite', 'path': path or 'state.db'}
+    raise argparse.ArgumentTypeError('backend must be "memory" or "sqlite[:PATH]"')
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Structured Logging for Snapdragon vs Intel Performance Championship
+Queue-backed JSON-lines logging, sampled debug logs and rate-limited errors
+"""
+
+import copy
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, Optional
+
+from sim_clock import Clock, get_clock
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[QueueListener] = None
+_handler: Optional['NonBlockingQueueHandler'] = None
+_suppressed = 0
+_atexit_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread, message and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; never waits on a full queue
+
+    Unlike QueueHandler.prepare() this does not format the record (or its
+    traceback) on the calling thread: only the message arguments are merged,
+    since they may be mutated after the call. A record that finds the queue
+    full is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SampledLogger:
+    """Debug logging for per-event paths: one record per `every` calls per key
+
+    When debug is off this costs a level check; when on, only every Nth
+    call is formatted and queued. Records carry `sampled` (N) so a reader
+    can scale counts back up.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = 100):
+        self.logger = logger
+        self.every = max(int(every), 1)
+        self._counts: Dict[str, int] = {}
+
+    def debug(self, key: str, msg: str, *args, **fields) -> bool:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        if count % self.every:
+            return False
+        self.logger.debug(msg, *args, extra=dict(fields, sampled=self.every, sample_key=key))
+        return True
+
+
+class RateLimitedLogger:
+    """Logs a repeating failure at most once per `interval` seconds per key
+
+    Meant for loops that retry on error (metrics reporting, broadcast
+    ticks, pollers): the first failure is logged at once, repeats are
+    counted, and the next record that gets through says how many were held
+    back.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 60.0, clock: Optional[Clock] = None):
+        self.logger = logger
+        self.interval = interval
+        self.clock = clock
+        self._state: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key: str, msg: str, *args, **kwargs) -> bool:
+        global _suppressed
+        now = (self.clock or get_clock()).monotonic()
+        with self._lock:
+            last, suppressed = self._state.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._state[key] = (last, suppressed + 1)
+                _suppressed += 1
+                return False
+            self._state[key] = (now, 0)
+        if suppressed:
+            msg = f"{msg} ({suppressed} similar suppressed in the last {self.interval:g}s)"
+        extra = dict(kwargs.pop('extra', None) or {}, rate_key=key, suppressed=suppressed)
+        self.logger.log(level, msg, *args, extra=extra, **kwargs)
+        return True
+
+    def error(self, key: str, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.ERROR, key, msg, *args, **kwargs)
+
+    def warning(self, key: str, msg: str, *args, **kwargs) -> bool:
+        return self.log(logging.WARNING, key, msg, *args, **kwargs)
+
+
+def configure_logging(settings: Optional[Dict] = None, name: str = 'championship') -> QueueListener:
+    """Route all logging through a queue to the console and a rotating JSON-lines file
+
+    The only handler on the root logger is a NonBlockingQueueHandler; a
+    QueueListener thread does the formatting and I/O. Replaces any earlier
+    configuration, including logging.basicConfig().
+    """
+    global _listener, _handler, _atexit_registered
+    settings = settings or {}
+    stop_logging()
+
+    level = settings.get('level', 'INFO')
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    console.setLevel(settings.get('console_level', level))
+    handlers = [console]
+
+    directory = settings.get('directory', 'logs')
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(Path(directory) / f"{name}.jsonl",
+                                           maxBytes=settings.get('max_bytes', 10 * 1024 * 1024),
+                                           backupCount=settings.get('backup_count', 5),
+                                           encoding='utf-8', delay=True)
+        file_handler.setFormatter(JsonFormatter())
+        file_handler.setLevel(level)
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(settings.get('queue_size', 10000))
+    _handler = NonBlockingQueueHandler(log_queue)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(min(handler.level for handler in handlers))
+    for logger_name, logger_level in settings.get('levels', {}).items():
+        logging.getLogger(logger_name).setLevel(logger_level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+    return _listener
+
+
+def stop_logging():
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def log_stats() -> Dict[str, int]:
+    """Records waiting for the writer, dropped on a full queue and rate-limited"""
+    return {
+        'queued': _handler.queue.qsize() if _handler else 0,
+        'dropped': _handler.dropped if _handler else 0,
+        'suppressed': _suppressed
+    }
@@ -4,12 +4,17 @@ Integration Test Suite for Snapdragon vs Intel Demo System
 Verifies all components work together properly
 """
 
+import os
 import sys
 import time
+import gzip
 import json
+import queue
+import logging
 import subprocess
 import threading
 import socket
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -21,6 +26,32 @@ try:
     from platform_detector import PlatformDetector
     from sd_generator import StableDiffusionGenerator
     from download_models import ModelDownloader
+    from energy_meter import (EnergyMeter, SimulatedPowerSource, combine_reports,
+                              integrate_trapezoid, integration_error_bound)
+    from thermal_monitor import ThermalMonitor
+    from throughput_tracker import SustainedThroughputTracker
+    from sim_clock import VirtualClock, get_clock, set_clock
+    from perf_model import PerformanceModel, load_performance_model
+    from device_registry import DeviceRegistry
+    from broadcast_scheduler import BroadcastScheduler
+    from timeseries_store import TimeSeriesStore
+    from results_store import ResultsStore
+    from race import Race
+    from liveness import LivenessTracker
+    from asset_pipeline import AssetPipeline
+    from instrumentation import MetricsRegistry
+    from replay_log import ReplayLog
+    from send_queue import Outbox, LATEST_WINS, DROP_OLDEST
+    from session_log import SessionLog, SessionRecorder, SessionReplayer
+    from tournament import Tournament
+    from state_backend import InProcessBackend, SQLiteBackend
+    from commentary import CommentaryEngine
+    from config_loader import ConfigError, ConfigWatcher, apply_reload, load_config, validate
+    from startup_profile import StartupProfile, lazy_import, parse_importtime
+    from structured_logging import (NonBlockingQueueHandler, RateLimitedLogger, SampledLogger,
+                                    configure_logging, stop_logging)
+    from platform_detector import detect_platform_type
+    from scoring import compare_platforms
     print("✅ Core imports successful")
 except ImportError as e:
     print(f"❌ Import error: {e}")
@@ -99,6 +130,805 @@ class IntegrationTester:
         
         return True
     
+    def test_energy_meter(self) -> bool:
+        """Test energy integration and per-image reporting"""
+        # 10 W for 2 s, then a 10 -> 20 W ramp over 1 s = 35 J
+        samples = [(0.0, 10.0), (2.0, 10.0), (3.0, 20.0)]
+        if abs(integrate_trapezoid(samples) - 35.0) > 1e-9:
+            return False
+        # 10 <-> 20 W swings each add 5 J of uncertainty rather than cancelling out
+        if abs(integration_error_bound([(0.0, 10.0), (1.0, 20.0), (2.0, 10.0)]) - 10.0) > 1e-9:
+            return False
+        
+        clock = get_clock()
+        source = SimulatedPowerSource(5.0, 15.0, lambda: 1.0)
+        meter = EnergyMeter(source, sample_interval=0.01, capacity_wh=50.0, clock=clock)
+        reports = []
+        
+        def measure():
+            # Two separately metered runs, as the battery race repeats them
+            for _ in range(2):
+                meter.start()
+                clock.sleep(0.2)
+                reports.append(meter.stop(images=2))
+        
+        clock.join(clock.start_thread(measure))
+        report = reports[0]
+        combined = combine_reports(reports)
+        
+        print(f"    {report['joules']} J over {report['duration']}s "
+              f"({report['avg_watts']} W, {report['joules_per_image']} J/image)")
+        
+        return (report['samples'] > 2 and 14 < report['avg_watts'] < 16 and
+                combined['runs'] == 2 and
+                abs(combined['joules'] - reports[0]['joules'] - reports[1]['joules']) < 0.02 and
+                abs(combined['battery_drain'] - reports[0]['battery_drain'] - reports[1]['battery_drain']) < 0.02)
+    
+    def test_thermal_monitor(self) -> bool:
+        """Test throttling detection on a synthetic frequency drop"""
+        monitor = ThermalMonitor(throttle_drop=0.10, curve_bucket=10)
+        for second in range(30):
+            throttled = second >= 12
+            monitor.record(second,
+                           2400 if throttled else 3400,
+                           85 if throttled else 70,
+                           75.0 if throttled else 100.0)
+        
+        summary = monitor.summary()
+        print(f"    Time to throttle: {summary['time_to_throttle']}s, "
+              f"steady state {summary['steady_state_pct_of_peak']}% of peak")
+        
+        return (len(summary['throttle_events']) == 1 and
+                summary['time_to_throttle'] == 12 and
+                summary['steady_state_pct_of_peak'] == 75.0 and
+                len(summary['curve']) == 3)
+    
+    def test_throughput_tracker(self) -> bool:
+        """Test images/minute trend and drop-off detection"""
+        tracker = SustainedThroughputTracker(window=60, dropoff_threshold=0.15)
+        elapsed = 0.0
+        # 10 s images for two minutes, then 20 s images for two minutes
+        while elapsed < 240:
+            latency = 10.0 if elapsed < 120 else 20.0
+            elapsed += latency
+            tracker.record(elapsed, latency)
+        tracker.finish(240)
+        
+        summary = tracker.summary()
+        print(f"    {summary['images_per_minute']} images/min, "
+              f"drop-off at {summary['dropoff_point']}s")
+        
+        return (summary['images'] == 18 and
+                summary['dropoff_point'] == 120 and
+                summary['peak_images_per_minute'] == 6.0)
+    
+    def test_virtual_clock(self) -> bool:
+        """Test time-warp sleeps keep real-clock event ordering"""
+        clock = VirtualClock(start_time=0)
+        events = []
+        
+        def worker(name, period, count):
+            for _ in range(count):
+                clock.sleep(period)
+                events.append((round(clock.monotonic(), 2), name))
+        
+        started = time.time()
+        with clock.hold():
+            threads = [clock.start_thread(worker, args=('fast', 0.4, 5)),
+                       clock.start_thread(worker, args=('slow', 1.0, 2))]
+        for thread in threads:
+            clock.join(thread)
+        
+        print(f"    {clock.monotonic():.1f}s virtual in {time.time() - started:.3f}s real")
+        
+        return events == [(0.4, 'fast'), (0.8, 'fast'), (1.0, 'slow'), (1.2, 'fast'),
+                          (1.6, 'fast'), (2.0, 'slow'), (2.0, 'fast')]
+    
+    def test_perf_model(self) -> bool:
+        """Test trace replay, step re-bucketing and refitting"""
+        with open('config.json', 'r') as f:
+            expected = json.load(f)['demo_scenarios']['ai_showdown']['expected_times']
+        
+        for platform in ['snapdragon', 'intel']:
+            model = load_performance_model(platform)
+            runs = [sum(model.sample_run()) for _ in range(50)]
+            low, high = expected[platform]
+            mean_time = sum(runs) / len(runs)
+            print(f"    {platform}: {mean_time:.1f}s mean over {len(runs)} sampled runs")
+            if not low <= mean_time <= high:
+                return False
+            
+            # Throttled runs must be slower than cold ones
+            if model.throttle_factor(300) < model.throttle_factor(0):
+                return False
+        
+        # Re-bucketing to a different step count keeps the run's shape
+        model = PerformanceModel.constant('test', 1.0, 30)
+        if abs(sum(model.sample_run(20)) - 30.0) > 1e-6:
+            return False
+        
+        # Refitting picks up new measurements
+        model.add_run([2.0] * 30, start_offset=120.0)
+        return model.throttle_factor(500) == 2.0
+    
+    def test_device_registry(self) -> bool:
+        """Test multi-device registration, sid lookup and platform aggregation"""
+        registry = DeviceRegistry()
+        for index in range(12):
+            platform = 'snapdragon' if index % 2 == 0 else 'intel'
+            device = registry.register(f"sid-{index}", platform, device_id=f"{platform}-{index}")
+            registry.touch(device, 'now', {'cpu': {'percent': 10 * (index % 4)}, 'temperature': 50})
+        
+        # Reconnecting an existing device moves it to its new session
+        registry.register('sid-new', 'snapdragon', device_id='snapdragon-0')
+        if registry.get_by_sid('sid-0') or registry.get_by_sid('sid-new')['device_id'] != 'snapdragon-0':
+            return False
+        
+        registry.disconnect_sid('sid-1')
+        summary = registry.platform_summary()
+        print(f"    {summary}")
+        
+        return (summary['snapdragon']['connected'] == 6 and
+                summary['intel']['connected'] == 5 and
+                len(registry.connected()) == 11)
+    
+    def test_broadcast_scheduler(self) -> bool:
+        """Test that metrics updates are coalesced into one frame per tick"""
+        sent = []
+        scheduler = BroadcastScheduler(lambda event, frame: sent.append(frame), interval=1.0)
+        for update in range(50):
+            scheduler.submit(f"device-{update % 5}", {'cpu': update})
+        
+        depth = scheduler.stats()['queue_depth']
+        scheduler.flush()
+        scheduler.flush()  # Nothing pending: no frame
+        stats = scheduler.stats()
+        print(f"    {stats['updates']} updates -> {stats['frames']} frame(s), max depth {stats['max_queue_depth']}")
+        
+        return (depth == 5 and len(sent) == 1 and
+                sent[0]['devices']['device-4'] == {'cpu': 49} and
+                stats['coalesced'] == 45 and stats['queue_depth'] == 0)
+    
+    def test_timeseries_store(self) -> bool:
+        """Test bounded ring buffers, rollups and downsampled history queries"""
+        store = TimeSeriesStore(raw_capacity=100, rollup_capacity=100)
+        for second in range(1000):
+            for tick in range(2):
+                store.record_metrics('snapdragon-1', second + tick / 2,
+                                     {'cpu': {'percent': float(second % 60)}, 'temperature': 45})
+        
+        raw = store.samples('snapdragon-1', 'cpu.percent')
+        fine = store.query(990, 999, metric='cpu.percent')
+        coarse = store.query(0, 999, metric='cpu.percent', max_points=20)
+        fine_points = fine['series']['snapdragon-1']['cpu.percent']
+        coarse_points = coarse['series']['snapdragon-1']['cpu.percent']
+        print(f"    raw={len(raw)}, 1s points={len(fine_points)}, "
+              f"coarse resolution={coarse['resolution']}s points={len(coarse_points)}")
+        
+        # Last 60 s bucket starts at 960: cpu cycles 0..39 within it
+        return (len(raw) == 100 and raw[0][0] == 950.0 and
+                fine['resolution'] == 1 and len(fine_points) == 10 and
+                coarse['resolution'] == 60 and len(coarse_points) == 17 and
+                coarse_points[-1] == [960.0, 0.0, 39.0, 19.5] and
+                store.metrics() == ['cpu.percent', 'temperature'])
+    
+    def test_results_store(self) -> bool:
+        """Test persisted race history, leaderboards and percentiles"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResultsStore(str(Path(tmp) / 'results.db'), batch_size=16)
+            for race in range(10):
+                race_id = f"race-{race}"
+                store.start_race(race_id, 'ai_showdown', race * 300.0, ['sd-1', 'in-1'])
+                store.record_result(race_id, 'ai_showdown', 'sd-1', 'snapdragon', {'time': 9.0 + race / 10}, race * 300.0 + 10)
+                store.record_result(race_id, 'ai_showdown', 'in-1', 'intel', {'time': 30.0 + race}, race * 300.0 + 31)
+                store.finish_race(race_id, race * 300.0 + 31, 'snapdragon', 'Snapdragon wins',
+                                  {'sd-1': {'temperature': {'min': 40, 'max': 48, 'avg': 44, 'samples': 15}}})
+            store.flush()
+            
+            # A fresh store on the same file sees everything (survives restarts)
+            reopened = ResultsStore(str(Path(tmp) / 'results.db'))
+            board = reopened.leaderboard('ai_showdown', by='platform')
+            intel = reopened.percentiles('ai_showdown', platform='intel', points=(50, 90))
+            latest = reopened.races(limit=1)[0]
+            print(f"    leaderboard={[(b['platform'], b['best']) for b in board]}, intel={intel['percentiles']}")
+            
+            return (board[0]['platform'] == 'snapdragon' and board[0]['runs'] == 10 and
+                    intel['count'] == 10 and intel['percentiles'] == {'p50': 34.0, 'p90': 38.0} and
+                    latest['race_id'] == 'race-9' and latest['winner'] == 'snapdragon' and
+                    len(latest['results']) == 2)
+    
+    def test_race(self) -> bool:
+        """Test race completion, dropouts, timeouts and per-scenario scoring"""
+        participants = {'sd-1': 'snapdragon', 'sd-2': 'snapdragon', 'in-1': 'intel'}
+        
+        battery = Race('battery_race', participants, started_at=0.0, timeout=240)
+        completions = [battery.record('sd-1', {'battery_drain': 2.0, 'runs': [2.0, 1.9, 2.1]}, 100),
+                       battery.record('sd-1', {'battery_drain': 9.0}, 101),  # duplicate ignored
+                       battery.record('in-1', {'battery_drain': 6.0, 'runs': [6.0, 5.8, 6.3]}, 102),
+                       battery.drop('sd-2', 103)]
+        outcome = battery.outcome()
+        print(f"    battery_race: {outcome['scores']} winner={outcome['winner']} ratio={outcome['ratio']}")
+        
+        sustained = Race('sustained_generation', participants, started_at=0.0, timeout=360)
+        sustained.record('sd-1', {'images_per_minute': 6.0, 'runs': [6.1, 5.9, 6.0, 5.8]}, 300)
+        sustained.record('in-1', {'images_per_minute': 2.0, 'runs': [2.1, 2.0, 1.8, 1.9]}, 300)
+        timed_out = [sustained.check_timeout(359), sustained.check_timeout(360), sustained.check_timeout(361)]
+        late = sustained.record('sd-2', {'images_per_minute': 7.0}, 362)
+        
+        return (completions == [False, False, False, True] and battery.state == 'finished' and
+                outcome['winner'] == 'snapdragon' and outcome['ratio'] == 3.0 and
+                outcome['missing'] == ['sd-2'] and
+                timed_out == [False, True, False] and not late and
+                sustained.outcome()['winner'] == 'snapdragon')
+    
+    def test_statistical_scoring(self) -> bool:
+        """Test bootstrap intervals and the significance gate on winners"""
+        clear = compare_platforms({'snapdragon': [9.1, 9.4, 8.8, 9.0, 9.6],
+                                   'intel': [29.0, 31.5, 30.2, 28.8, 30.9]},
+                                  lower_is_better=True, resamples=500, seed=1)
+        noisy = compare_platforms({'snapdragon': [10.0, 14.0, 9.0, 13.0],
+                                   'intel': [11.0, 9.5, 14.5, 12.0]},
+                                  lower_is_better=True, resamples=500, seed=1)
+        single = compare_platforms({'snapdragon': [9.0], 'intel': [30.0]},
+                                   lower_is_better=True, resamples=500, seed=1)
+        # Plugged in: a percent source reports 0% drain
+        tied_zero = compare_platforms({'intel': [0.0, 0.0, 0.0], 'snapdragon': [0.0, 0.0, 0.0]},
+                                      lower_is_better=True, resamples=500, seed=1)
+        one_zero = compare_platforms({'snapdragon': [0.0, 0.0, 0.0], 'intel': [2.0, 2.5, 3.0]},
+                                     lower_is_better=True, resamples=500, seed=1)
+        print(f"    clear: {clear['ratio']}x CI {clear['ratio_ci']}, noisy: {noisy['reason']}, single: {single['reason']}")
+        print(f"    tied zero: {tied_zero['reason']} CI {tied_zero['ratio_ci']}, "
+              f"one zero: {one_zero['reason']} CI {one_zero['ratio_ci']}")
+        
+        payload = json.dumps([tied_zero, one_zero], allow_nan=False)
+        return (clear['significant'] and clear['leader'] == 'snapdragon' and
+                clear['ratio_ci'][0] > 1 and clear['ratio_ci'][0] <= clear['ratio'] <= clear['ratio_ci'][1] and
+                not noisy['significant'] and not single['significant'] and
+                single['ratio'] == 3.33 and
+                not tied_zero['significant'] and tied_zero['tie'] and
+                not one_zero['significant'] and not one_zero['tie'] and one_zero['ratio'] is None and
+                one_zero['ratio_ci'] is None and one_zero['p_superior'] == 1.0 and bool(payload))
+    
+    def test_liveness(self) -> bool:
+        """Test heartbeat deadlines, transition-only expiry and heap compaction"""
+        tracker = LivenessTracker(timeout=10)
+        tracker.touch('sd-1', now=0)
+        tracker.touch('intel-1', now=0)
+        tracker.touch('sd-1', now=8)
+        
+        early = tracker.expire(now=9.9)
+        first = tracker.expire(now=10.25)
+        repeat = tracker.expire(now=30)
+        revived = tracker.touch('intel-1', now=31)
+        heartbeat = tracker.touch('intel-1', now=32)
+        
+        for i in range(500):
+            tracker.touch('sd-1', now=32 + i * 0.01)
+        stats = tracker.stats()
+        print(f"    expired: {first}, heap: {stats['heap_size']}, latency: {stats['detection_latency_ms']}")
+        
+        return (early == [] and [d for d, _ in first] == ['intel-1'] and
+                abs(first[0][1] - 0.25) < 1e-9 and
+                repeat == [('sd-1', 30 - 18)] and
+                revived and not heartbeat and tracker.is_alive('intel-1') and
+                stats['heap_size'] < 100 and stats['expired'] == 2 and stats['revived'] == 2)
+    
+    def test_asset_pipeline(self) -> bool:
+        """Test fingerprinting, precompression and conditional asset requests"""
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'js').mkdir()
+            (Path(tmp) / 'js' / 'app.js').write_text('console.log("snapdragon");\n' * 50)
+            pipeline = AssetPipeline(tmp)
+            manifest = pipeline.build()
+            fingerprinted = manifest['js/app.js']
+            
+            status, body, headers = pipeline.respond(fingerprinted, 'gzip, deflate')
+            plain_status, plain_body, plain_headers = pipeline.respond('js/app.js', 'identity')
+            cached_status, _, _ = pipeline.respond(fingerprinted, 'gzip', headers['ETag'])
+            missing_status, _, _ = pipeline.respond('js/missing.js')
+            print(f"    {fingerprinted}: {len(plain_body)} -> {len(body)} bytes gzip")
+            
+            return (fingerprinted.startswith('js/app.') and fingerprinted.endswith('.js') and
+                    pipeline.url('js/app.js') == f"assets/{fingerprinted}" and
+                    status == 200 and headers['Content-Encoding'] == 'gzip' and
+                    gzip.decompress(body) == plain_body and 'immutable' in headers['Cache-Control'] and
+                    plain_status == 200 and plain_headers['Cache-Control'] == 'no-cache' and
+                    'Content-Encoding' not in plain_headers and
+                    cached_status == 304 and missing_status == 404)
+    
+    def test_instrumentation(self) -> bool:
+        """Test counters, histogram buckets and the Prometheus text format"""
+        registry = MetricsRegistry('test')
+        events = registry.counter('events_total', 'Events', ('event',))
+        latency = registry.histogram('handler_seconds', 'Latency', buckets=(0.01, 0.1))
+        registry.gauge('clients', 'Clients', ('role',), fn=lambda: {('dashboard',): 3})
+        
+        for _ in range(3):
+            events.labels('metrics_update').inc()
+        for value in (0.005, 0.05, 0.5):
+            latency.observe(value)
+        text = registry.render()
+        print(f"    {len(text.splitlines())} lines rendered")
+        
+        expected = [
+            '# TYPE test_handler_seconds histogram',
+            'test_events_total{event="metrics_update"} 3',
+            'test_handler_seconds_bucket{le="0.01"} 1',
+            'test_handler_seconds_bucket{le="0.1"} 2',
+            'test_handler_seconds_bucket{le="+Inf"} 3',
+            'test_handler_seconds_count 3',
+            'test_clients{role="dashboard"} 3'
+        ]
+        return all(line in text.splitlines() for line in expected)
+    
+    def test_replay_log(self) -> bool:
+        """Test sequenced broadcasts, delta replay and snapshot fallback"""
+        log = ReplayLog(capacity=5)
+        sent = []
+        for i in range(8):
+            log.publish('commentary_update', {'text': f"line {i}"}, lambda event, payload: sent.append(payload))
+        
+        delta = log.since(6, log.epoch)
+        caught_up = log.since(8, log.epoch)
+        too_old = log.since(2, log.epoch)
+        other_run = log.since(6, 'previous-epoch')
+        ahead = log.since(9, log.epoch)
+        print(f"    last seq {log.last_seq}, kept {len(log)}, delta after 6: {[p['seq'] for _, p in delta]}")
+        
+        return ([p['seq'] for p in sent] == list(range(1, 9)) and
+                [p['seq'] for _, p in delta] == [7, 8] and delta[0][0] == 'commentary_update' and
+                caught_up == [] and too_old is None and other_run is None and ahead is None and
+                log.since(3, log.epoch) is not None and len(log) == 5)
+    
+    def test_send_queues(self) -> bool:
+        """Test latest-wins, drop-oldest and reliable delivery to a stalled client"""
+        sent = {'fast': [], 'slow': []}
+        stalled = {'slow': True}
+        outbox = Outbox(lambda event, payload, sid: sent[sid].append((event, payload['n'])),
+                        depth_fn=lambda sid: 100 if stalled.get(sid) else 0,
+                        policies={'metrics_frame': (LATEST_WINS, None),
+                                  'commentary_update': (DROP_OLDEST, None)},
+                        max_messages=4)
+        outbox.add_client('fast')
+        outbox.add_client('slow')
+        
+        outbox.broadcast('winner_declared', {'n': 0})
+        for n in range(1, 11):
+            outbox.broadcast('metrics_frame', {'n': n})
+            outbox.broadcast('commentary_update', {'n': n})
+            outbox.pump()
+        
+        lag = outbox.lag()['slow']
+        stalled['slow'] = False
+        outbox.pump()
+        print(f"    slow client: depth {lag['depth']}, dropped {lag['dropped']}, replaced {lag['replaced']} -> {sent['slow']}")
+        
+        return (len(sent['fast']) == 21 and
+                sent['slow'] == [('winner_declared', 0), ('commentary_update', 9),
+                                 ('metrics_frame', 10), ('commentary_update', 10)] and
+                lag['replaced'] == 9 and lag['dropped'] == 8)
+    
+    def test_role_routing(self) -> bool:
+        """Test that agents only get their commands and dashboards only get broadcasts"""
+        import server
+        with tempfile.TemporaryDirectory() as tmp:
+            server.isolate_results_store(str(Path(tmp) / 'results.db'))
+            app, sio = server.app, server.socketio
+            dashboard = sio.test_client(app)
+            snapdragon = sio.test_client(app, auth={'role': 'agent'})
+            intel = sio.test_client(app)  # no role: moved to the agents room on register
+            snapdragon.emit('device_register', {'device_type': 'snapdragon', 'device_id': 'route-sd'})
+            intel.emit('device_register', {'device_type': 'intel', 'device_id': 'route-in'})
+            
+            for client in (snapdragon, intel):
+                client.emit('metrics_update', {'metrics': {'cpu': {'percent': 50}, 'temperature': 60}})
+            server.broadcaster.flush()
+            server.prepare_phase('ai_showdown')
+            dashboard.emit('start_demo', {'scenario': 'ai_showdown'})
+            snapdragon.emit('test_complete', {'result': {'time': 9.0, 'runs': [9.0, 8.8, 9.4]}})
+            intel.emit('test_complete', {'result': {'time': 30.0, 'runs': [30.0, 31.0, 29.5]}})
+            server.outbox.pump()
+            
+            received = {name: {m['name'] for m in client.get_received()}
+                        for name, client in (('dashboard', dashboard), ('snapdragon', snapdragon), ('intel', intel))}
+            for client in (snapdragon, intel, dashboard):
+                client.disconnect()
+            server.outbox.pump()
+            server.results_store.flush()
+        
+        print(f"    dashboard: {sorted(received['dashboard'])}")
+        print(f"    agents: {sorted(received['snapdragon'])} / {sorted(received['intel'])}")
+        
+        broadcasts = {'metrics_frame', 'metrics_update', 'demo_started', 'winner_declared'}
+        commands = {'execute_test', 'prepare_test'}
+        return (broadcasts - {'metrics_update'} <= received['dashboard'] and
+                not commands & received['dashboard'] and
+                all(commands <= received[agent] and not broadcasts & received[agent]
+                    for agent in ('snapdragon', 'intel')))
+    
+    def test_session_log(self) -> bool:
+        """Test session recording, time-indexed reads and max-speed replay"""
+        clock = VirtualClock(start_time=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'session.jsonl')
+            recorder = SessionRecorder(path, clock=clock, index_interval=1.0)
+            
+            def session():
+                for i in range(20):
+                    recorder.record('in', 'metrics_update', 'agent-1', [{'metrics': {'cpu': {'percent': i}}}])
+                    recorder.record('out', 'metrics_frame', 'dashboards', {'n': i})
+                    clock.sleep(0.5)
+            
+            clock.join(clock.start_thread(session))
+            recorder.flush()
+            
+            log = SessionLog(path)
+            window = [(t, event) for t, _, event, _, _ in log.records(start=5.0, end=6.0)]
+            index_entries = len(Path(f"{path}.idx").read_text().splitlines())
+            replayed = []
+            stats = SessionReplayer(log, {
+                'metrics_update': lambda sid, data: replayed.append((sid, data['metrics']['cpu']['percent']))
+            }, speed=float('inf')).run()
+            print(f"    {log.summary()['records']} records, {index_entries} index entries, replay {stats['events_per_second']} events/s")
+            
+            return (window == [(5.0, 'metrics_update'), (5.0, 'metrics_frame'),
+                               (5.5, 'metrics_update'), (5.5, 'metrics_frame'),
+                               (6.0, 'metrics_update'), (6.0, 'metrics_frame')] and
+                    index_entries == 10 and stats['events'] == 20 and stats['errors'] == 0 and
+                    replayed[0] == ('replay:agent-1', 0) and replayed[-1][1] == 19)
+    
+    def test_tournament(self) -> bool:
+        """Test gated, pipelined phases, a hung phase timing out and standings"""
+        clock = VirtualClock(start_time=0)
+        platforms = {'sd-1': 'snapdragon', 'in-1': 'intel'}
+        temperatures = {'sd-1': 40.0, 'in-1': 45.0}
+        log = []
+        tournament = None
+        
+        def prepare(scenario):
+            log.append(('prepare', scenario, clock.time()))
+            def ack(device_id, delay):
+                clock.sleep(delay)
+                tournament.device_ready(device_id, scenario)
+            clock.start_thread(ack, args=('sd-1', 1))
+            clock.start_thread(ack, args=('in-1', 3))
+        
+        def cool():
+            while any(t > 40.0 for t in temperatures.values()):
+                clock.sleep(5)
+                for device_id in temperatures:
+                    temperatures[device_id] = max(temperatures[device_id] - 5, 40.0)
+        
+        def start_race(scenario, opened):
+            race = Race(scenario, platforms, started_at=clock.time(), timeout=60)
+            opened(race)
+            log.append(('start', scenario, clock.time()))
+            temperatures.update({'sd-1': 60.0, 'in-1': 75.0})
+            def finish(device_id, delay):
+                clock.sleep(delay)
+                if race.record(device_id, {}, clock.time()):
+                    close_race(race)
+            clock.start_thread(finish, args=('sd-1', 10))
+            if scenario == 'ai_showdown':
+                clock.start_thread(finish, args=('in-1', 30))  # intel hangs in the second phase
+            return race
+        
+        def close_race(race):
+            tournament.race_closed(race)
+            clock.start_thread(cool)
+            clock.sleep(5)  # scoring
+            log.append(('scored', race.scenario, clock.time()))
+            tournament.race_scored(race, {'winner': 'snapdragon'})
+        
+        updates = []
+        tournament = Tournament([{'name': 'AI', 'type': 'sd_generation'},
+                                 {'name': 'Battery', 'type': 'battery_stress'}],
+                                start_race, prepare, lambda: dict(temperatures), updates.append,
+                                close_race, warmup_timeout=30, cooldown_tolerance=2.0,
+                                cooldown_timeout=120, scoring_timeout=30, clock=clock)
+        clock.join(tournament.start())
+        
+        states = [u['state'] for u in updates]
+        print(f"    {log}")
+        print(f"    states: {states} standings: {updates[-1]['standings']}")
+        phase_states = [r['state'] for r in tournament.results]
+        
+        # A race that is scored before start_race() returns still counts
+        def start_and_finish(scenario, opened):
+            race = Race(scenario, platforms, started_at=clock.time(), timeout=60)
+            opened(race)
+            close_race(race)
+            return race
+        
+        instant = Tournament([{'name': 'AI', 'type': 'sd_generation'}], start_and_finish, lambda s: None,
+                             lambda: {}, lambda u: None, close_race, warmup_timeout=0,
+                             scoring_timeout=30, clock=clock)
+        tournament, started = instant, clock.time()
+        clock.join(instant.start())
+        instant_seconds = clock.time() - started
+        print(f"    instant race: {instant.results} in {instant_seconds:.0f}s")
+        
+        # A repeated scenario waits for a fresh acknowledgement, and a device
+        # that left has to prepare again
+        starts, prepared = [], []
+        def prepare_once(scenario):
+            if not prepared:
+                repeat.device_ready('sd-1', scenario)
+            prepared.append(scenario)
+        
+        def start_and_log(scenario, opened):
+            starts.append(clock.time())
+            return start_and_finish(scenario, opened)
+        
+        repeat = Tournament([{'name': 'AI', 'type': 'sd_generation'}, {'name': 'AI again', 'type': 'sd_generation'}],
+                            start_and_log, prepare_once, lambda: {'sd-1': 40.0}, lambda u: None, close_race,
+                            warmup_timeout=30, scoring_timeout=30, clock=clock)
+        tournament = repeat
+        clock.join(repeat.start())
+        repeat.device_ready('sd-1', 'ai_showdown')
+        repeat.device_left('sd-1')
+        print(f"    repeated scenario: races started {[round(t - starts[0]) for t in starts]}s after the first")
+        
+        return (len(instant.results) == 1 and len(repeat.results) == 2 and
+                starts[1] - starts[0] >= 30 and not repeat._all_ready('ai_showdown') and
+                instant.standings() == {'snapdragon': 1} and
+                instant_seconds < 30 and
+                log[:6] == [('prepare', 'ai_showdown', 0), ('start', 'ai_showdown', 3),
+                        ('prepare', 'battery_race', 33), ('scored', 'ai_showdown', 38),
+                        ('start', 'battery_race', 63), ('scored', 'battery_race', 128)] and
+                states == ['warming_up', 'racing', 'scoring', 'cooling_down', 'warming_up',
+                           'racing', 'scoring', 'done'] and
+                phase_states == ['finished', 'timed_out'] and
+                updates[-1]['standings'] == {'snapdragon': 2})
+    
+    def test_state_backend(self) -> bool:
+        """Test shared state and pub/sub between workers, and mirrored devices"""
+        first = InProcessBackend('w1')
+        second = InProcessBackend('w2', peer=first)
+        heard = []
+        first.subscribe('broadcast', lambda m: heard.append(('w1', m['n'])))
+        second.subscribe('broadcast', lambda m: heard.append(('w2', m['n'])))
+        first.publish('broadcast', {'n': 1})
+        second.put('devices', 'sd-1', {'connected': True})
+        in_process = heard == [('w2', 1)] and first.items('devices') == {'sd-1': {'connected': True}}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'state.db')
+            workers = [SQLiteBackend(path, worker_id=f"w{i}", poll_interval=0.01) for i in range(2)]
+            received = {w.worker_id: [] for w in workers}
+            for worker in workers:
+                worker.subscribe('broadcast', lambda m, w=worker.worker_id: received[w].append(m['n']))
+                worker.start()
+            for n in range(50):
+                workers[n % 2].publish('broadcast', {'n': n})
+            workers[0].put('devices', 'in-1', {'platform': 'intel'})
+            
+            deadline = time.time() + 5
+            while time.time() < deadline and (sum(map(len, received.values())) < 50 or
+                                              not workers[1].items('devices')):
+                time.sleep(0.01)
+            shared_state = workers[1].items('devices')
+            relayed = {w: list(ns) for w, ns in received.items()}
+            # A worker joining later only hears new messages
+            late = SQLiteBackend(path, worker_id='w2')
+            late_heard = []
+            late.subscribe('broadcast', lambda m: late_heard.append(m['n']))
+            late.start()
+            workers[0].publish('broadcast', {'n': 99})
+            while time.time() < deadline and not late_heard:
+                time.sleep(0.01)
+            for worker in workers + [late]:
+                worker.close()
+        print(f"    sqlite: {len(relayed['w0'])}+{len(relayed['w1'])} messages relayed, late joiner got {late_heard}")
+        
+        # Mirrored devices: a stale disconnect from a previous worker is ignored
+        registry = DeviceRegistry()
+        registry.mirror({'device_id': 'sd-1', 'platform': 'snapdragon', 'connected': True}, 'w1')
+        moved = registry.mirror({'device_id': 'sd-1', 'platform': 'snapdragon', 'connected': True}, 'w2')
+        stale = registry.mirror({'device_id': 'sd-1', 'platform': 'snapdragon', 'connected': False}, 'w1')
+        
+        return (in_process and
+                relayed == {'w0': list(range(1, 50, 2)), 'w1': list(range(0, 50, 2))} and
+                shared_state == {'in-1': {'platform': 'intel'}} and late_heard == [99] and
+                moved['worker'] == 'w2' and stale is None and
+                [d['device_id'] for d in registry.connected('snapdragon')] == ['sd-1'])
+    
+    def test_commentary(self) -> bool:
+        """Test commentary hysteresis, per-rule cooldown, dedup and the bounded feed"""
+        with open('config.json') as f:
+            rules = json.load(f)['commentary']['rules']
+        engine = CommentaryEngine(rules, feed_size=5, dedup_window=60)
+        
+        def tick(now, **devices):
+            updates = [{'device': device_id.split('-')[0], 'device_id': device_id, 'metrics': metrics}
+                       for device_id, metrics in devices.items()]
+            return [entry['rule'] for entry in engine.evaluate(updates, now)]
+        
+        # A steadily hot Intel box: one line, not one per tick
+        hot = [tick(t, **{'intel-1': {'temperature': 78}}) for t in range(10)]
+        # Hovering inside the hysteresis band (72-75) does not re-arm
+        hover = [tick(10 + t, **{'intel-1': {'temperature': temp}}) for t, temp in enumerate([74, 76, 73, 77])]
+        # Cooling past the band re-arms, but the rule's cooldown holds it back until t=30
+        rearm = [tick(t, **{'intel-1': {'temperature': temp}}) for t, temp in [(20, 70), (22, 79), (30, 79)]]
+        # Two fanless Snapdragons: the rule's cooldown holds back the second
+        fanless = tick(40, **{'snapdragon-1': {'fan_rpm': 0}, 'snapdragon-2': {'fan_rpm': 0}})
+        feed = [entry['rule'] for entry in engine.feed]
+        print(f"    fired: {engine.stats} feed: {feed}")
+        
+        # Without a cooldown, identical text is still said once per dedup window
+        quiet = CommentaryEngine([{'id': 'fanless', 'metric': 'fan_rpm', 'op': '==', 'threshold': 0,
+                                   'text': 'What fan?'}], dedup_window=60)
+        said = [len(quiet.evaluate([{'device': 'snapdragon', 'device_id': f"sd-{i}", 'metrics': {'fan_rpm': 0}}
+                                    for i in range(3)], now)) for now in (0, 61)]
+        
+        return (hot == [['intel_hot']] + [[]] * 9 and hover == [[], [], [], []] and
+                rearm == [[], [], ['intel_hot']] and fanless == ['snapdragon_fanless'] and
+                feed == ['intel_hot', 'intel_hot', 'snapdragon_fanless'] and
+                engine.stats == {'fired': 3, 'cooldown': 2, 'duplicate': 0} and
+                said == [1, 0] and quiet.stats['duplicate'] == 2)
+    
+    def test_config_loader(self) -> bool:
+        """Test config validation errors and which changes hot-reload"""
+        config = load_config('config.json')
+        
+        broken = json.loads(json.dumps(config))
+        broken['network']['server_port'] = '5000'
+        broken['demo_scenarios']['battery_race']['duration'] = 0
+        del broken['ui']
+        try:
+            validate(broken)
+            errors = []
+        except ConfigError as e:
+            errors = [line.strip() for line in str(e).splitlines()[1:]]
+        print(f"    errors: {errors}")
+        
+        fresh = json.loads(json.dumps(config))
+        fresh['ui']['chart_update_rate'] = 250
+        fresh['network']['server_port'] = 6000
+        live = json.loads(json.dumps(config))
+        applied, restart = apply_reload(live, fresh)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'config.json'
+            path.write_text(json.dumps(config))
+            watcher = ConfigWatcher(path, clock=VirtualClock(start_time=0))
+            heard = []
+            watcher.on_reload(heard.append)
+            unchanged = watcher.check()
+            
+            def rewrite(text, bump):
+                path.write_text(text)
+                mtime = path.stat().st_mtime + bump
+                os.utime(path, (mtime, mtime))
+            
+            config['simulation']['update_interval'] = 0.5
+            rewrite(json.dumps(config), 1)
+            reloaded = watcher.check()
+            # A half-written or invalid file leaves the running config alone
+            rewrite('{"network": ', 2)
+            ignored = watcher.check()
+            interval = watcher.config['simulation']['update_interval']
+        
+        return (sorted(errors) == ['demo_scenarios.battery_race.duration must be greater than 0 (got 0)',
+                                   'network.server_port must be an integer (got "5000")',
+                                   'ui is required'] and
+                applied == ['ui.chart_update_rate'] and live['ui']['chart_update_rate'] == 250 and
+                live['network']['server_port'] == config['network']['server_port'] and
+                restart == ['network'] and
+                unchanged == [] and reloaded == ['simulation.update_interval'] and
+                heard == [['simulation.update_interval']] and ignored == [] and interval == 0.5)
+    
+    def test_startup_profile(self) -> bool:
+        """Test lazy imports, start-up budgets and the importtime breakdown"""
+        # A module nothing else here imports: only loaded on first attribute access
+        sys.modules.pop('colorsys', None)
+        colorsys = lazy_import('colorsys')
+        deferred = 'colorsys' not in sys.modules
+        hls = colorsys.rgb_to_hls(1.0, 0.0, 0.0)
+        loaded = 'colorsys' in sys.modules and colorsys.loaded
+        
+        profile = StartupProfile({'imports': 1.0, 'connect': 2.0, 'total': 3.0}, started=100.0)
+        profile.mark('imports', now=100.4)
+        profile.mark('init', now=100.9)
+        profile.mark('connect', now=103.4)
+        over = profile.over_budget()
+        print(f"    {profile.report()['phases']} over: {over}")
+        
+        importtime = '\n'.join([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       100 |        100 | encodings',
+            'import time:        50 |         50 |     socketio.client',
+            'import time:       300 |        350 |   socketio',
+            'import time:        40 |         40 |   psutil',
+            'import time:        10 |        400 | agent'])
+        breakdown = [(entry['module'], entry['cumulative']) for entry in parse_importtime(importtime, 'agent', 1)]
+        
+        # The fast platform check must not spawn wmic / uname -p
+        real_run, real_popen = subprocess.run, subprocess.Popen
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError(f"spawned {args[0]}")
+        subprocess.run = subprocess.Popen = no_subprocess
+        try:
+            detected = detect_platform_type()
+        finally:
+            subprocess.run, subprocess.Popen = real_run, real_popen
+        
+        return (deferred and loaded and hls[0] == 0.0 and
+                over == ['connect took 2.50s (budget 2.00s)', 'total took 3.40s (budget 3.00s)'] and
+                breakdown == [('agent', 0.0004), ('socketio', 0.00035), ('psutil', 0.00004)] and
+                detected in ('snapdragon', 'intel', 'amd', 'unknown'))
+    
+    def test_structured_logging(self) -> bool:
+        """Test JSON-lines output with rotation, non-blocking enqueue, sampling and rate limiting"""
+        class Capture(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.records = []
+            
+            def emit(self, record):
+                self.records.append(record)
+        
+        def isolated(name, level=logging.DEBUG):
+            capture = Capture()
+            log = logging.getLogger(f"test.{name}")
+            log.handlers, log.propagate = [capture], False
+            log.setLevel(level)
+            return log, capture
+        
+        # A full queue drops (and counts) records instead of blocking the caller
+        log, _ = isolated('queue')
+        full = NonBlockingQueueHandler(queue.Queue(2))
+        log.addHandler(full)
+        for i in range(5):
+            log.info("event %d", i)
+        queued = [record.msg for record in list(full.queue.queue)]
+        
+        # Sampling: every 10th call per key, and nothing at all with debug off
+        log, capture = isolated('sampled')
+        sampler = SampledLogger(log, every=10)
+        sampled = sum(sampler.debug(key, "tick") for _ in range(25) for key in ('a', 'b'))
+        log.setLevel(logging.INFO)
+        silent = sum(sampler.debug('a', "tick") for _ in range(25))
+        
+        # Rate limiting: one line per interval, then a count of what was held back
+        log, capture = isolated('limited')
+        now = [0.0]
+        limited = RateLimitedLogger(log, interval=60, clock=type('Clock', (), {'monotonic': lambda self: now[0]})())
+        for now[0] in (0, 1, 2, 30, 61, 62):
+            limited.error('report', "Error reporting metrics: boom")
+        limited.error('other', "Different failure")
+        limited_lines = [record.getMessage() for record in capture.records]
+        
+        # End to end: root logger -> queue -> writer thread -> rotating JSON lines
+        root = logging.getLogger()
+        saved = root.handlers[:], root.level
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                configure_logging({'level': 'DEBUG', 'console_level': 'CRITICAL', 'directory': tmp,
+                                   'max_bytes': 4000, 'backup_count': 2}, 'test')
+                app = logging.getLogger('test.app')
+                for i in range(100):
+                    app.info("frame %d sent", i, extra={'frame': i})
+                try:
+                    raise ValueError("bad frame")
+                except ValueError:
+                    app.exception("Broadcast tick failed")
+            finally:
+                stop_logging()
+                root.handlers, root.level = saved
+            files = sorted(path.name for path in Path(tmp).iterdir())
+            lines = [json.loads(line) for line in (Path(tmp) / 'test.jsonl').read_text().splitlines()]
+        print(f"    files: {files} last: {lines[-1]['message']}")
+        
+        return (full.dropped == 3 and queued == ['event 0', 'event 1'] and
+                sampled == 6 and silent == 0 and
+                limited_lines == ['Error reporting metrics: boom',
+                                  'Error reporting metrics: boom (3 similar suppressed in the last 60s)',
+                                  'Different failure'] and
+                files == ['test.jsonl', 'test.jsonl.1', 'test.jsonl.2'] and
+                lines[-2]['frame'] == 99 and lines[-2]['logger'] == 'test.app' and
+                lines[-1]['level'] == 'ERROR' and 'ValueError: bad frame' in lines[-1]['exc'])
+    
     def test_config_file(self) -> bool:
         """Test configuration file"""
         config_path = Path('config.json')
@@ -253,13 +1083,40 @@ def main():
     print("  SNAPDRAGON VS INTEL DEMO - INTEGRATION TEST")
     print("=" * 60)
     
+    # Simulated sleeps run on virtual time so the suite finishes in seconds
+    set_clock(VirtualClock())
+    
     tester = IntegrationTester()
     
     # Run all tests
+    tester.test("Virtual Clock", tester.test_virtual_clock)
     tester.test("Platform Detection", tester.test_platform_detection)
     tester.test("Configuration File", tester.test_config_file)
     tester.test("Model Downloader", tester.test_model_downloader)
     tester.test("SD Generator", tester.test_sd_generator)
+    tester.test("Performance Model", tester.test_perf_model)
+    tester.test("Energy Meter", tester.test_energy_meter)
+    tester.test("Thermal Monitor", tester.test_thermal_monitor)
+    tester.test("Throughput Tracker", tester.test_throughput_tracker)
+    tester.test("Device Registry", tester.test_device_registry)
+    tester.test("Broadcast Scheduler", tester.test_broadcast_scheduler)
+    tester.test("Time-Series Store", tester.test_timeseries_store)
+    tester.test("Results Store", tester.test_results_store)
+    tester.test("Race State Machine", tester.test_race)
+    tester.test("Statistical Scoring", tester.test_statistical_scoring)
+    tester.test("Liveness Tracking", tester.test_liveness)
+    tester.test("Asset Pipeline", tester.test_asset_pipeline)
+    tester.test("Instrumentation", tester.test_instrumentation)
+    tester.test("Replay Log", tester.test_replay_log)
+    tester.test("Send Queues", tester.test_send_queues)
+    tester.test("Role Routing", tester.test_role_routing)
+    tester.test("Session Log", tester.test_session_log)
+    tester.test("Tournament", tester.test_tournament)
+    tester.test("State Backend", tester.test_state_backend)
+    tester.test("Commentary Rules", tester.test_commentary)
+    tester.test("Config Loader", tester.test_config_loader)
+    tester.test("Startup Profile", tester.test_startup_profile)
+    tester.test("Structured Logging", tester.test_structured_logging)
     tester.test("Deployment Scripts", tester.test_deployment_scripts)
     tester.test("Dashboard Files", tester.test_dashboard_files)
     tester.test("Server Port", tester.test_server_port)
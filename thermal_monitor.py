@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Thermal Throttling Detection for Snapdragon vs Intel Performance Championship
+Correlates CPU frequency, temperature and achieved work rate under sustained load
+"""
+
+from typing import Dict, List, Optional
+
+
+class ThermalMonitor:
+    """Time series of (frequency, temperature, work rate) with throttling analysis
+
+    A throttling event is a run of consecutive samples in which either the CPU
+    frequency or the achieved work rate sits more than `throttle_drop` below
+    its peak so far, while the workload itself is held constant.
+    """
+
+    def __init__(self, throttle_drop: float = 0.10, min_throttle_samples: int = 3,
+                 curve_bucket: float = 60.0):
+        self.throttle_drop = throttle_drop
+        self.min_throttle_samples = min_throttle_samples
+        self.curve_bucket = curve_bucket
+        self.samples: List[Dict] = []
+
+    def record(self, elapsed: float, freq: float, temperature: float, work_rate: float):
+        """Add one sample; elapsed is seconds since the start of the load"""
+        self.samples.append({
+            'time': round(elapsed, 2),
+            'freq': round(freq or 0.0, 1),
+            'temperature': round(temperature, 1),
+            'work_rate': round(work_rate, 2)
+        })
+
+    def _is_throttled(self, sample: Dict, peak_freq: float, peak_rate: float) -> bool:
+        floor = 1.0 - self.throttle_drop
+        freq_drop = peak_freq > 0 and sample['freq'] < peak_freq * floor
+        rate_drop = peak_rate > 0 and sample['work_rate'] < peak_rate * floor
+        return freq_drop or rate_drop
+
+    def detect_throttling(self) -> List[Dict]:
+        """Return throttling events as contiguous below-peak runs"""
+        events = []
+        peak_freq = peak_rate = 0.0
+        run = []
+
+        def close_run():
+            if len(run) >= self.min_throttle_samples:
+                events.append({
+                    'start': run[0]['time'],
+                    'end': run[-1]['time'],
+                    'min_freq': min(s['freq'] for s in run),
+                    'freq_drop_pct': round((1 - min(s['freq'] for s in run) / peak_freq) * 100, 1) if peak_freq else 0.0,
+                    'rate_drop_pct': round((1 - min(s['work_rate'] for s in run) / peak_rate) * 100, 1) if peak_rate else 0.0,
+                    'onset_temperature': run[0]['temperature']
+                })
+
+        for sample in self.samples:
+            if self._is_throttled(sample, peak_freq, peak_rate):
+                run.append(sample)
+                continue
+            close_run()
+            run = []
+            peak_freq = max(peak_freq, sample['freq'])
+            peak_rate = max(peak_rate, sample['work_rate'])
+        close_run()
+        return events
+
+    def sustained_curve(self) -> List[Dict]:
+        """Average throughput, frequency and temperature per curve bucket"""
+        buckets: Dict[int, List[Dict]] = {}
+        for sample in self.samples:
+            buckets.setdefault(int(sample['time'] // self.curve_bucket), []).append(sample)
+
+        curve = []
+        for index in sorted(buckets):
+            group = buckets[index]
+            curve.append({
+                'start': index * self.curve_bucket,
+                'throughput': round(sum(s['work_rate'] for s in group) / len(group), 2),
+                'freq': round(sum(s['freq'] for s in group) / len(group), 1),
+                'temperature': round(sum(s['temperature'] for s in group) / len(group), 1),
+                'max_temperature': round(max(s['temperature'] for s in group), 1)
+            })
+        return curve
+
+    def steady_state_rate(self, tail_fraction: float = 0.25) -> Optional[float]:
+        """Mean work rate over the final portion of the run"""
+        if not self.samples:
+            return None
+        tail = self.samples[-max(1, int(len(self.samples) * tail_fraction)):]
+        return sum(s['work_rate'] for s in tail) / len(tail)
+
+    def summary(self) -> Dict:
+        """Sustained-performance summary suitable for a test_complete payload"""
+        events = self.detect_throttling()
+        peak_rate = max((s['work_rate'] for s in self.samples), default=0.0)
+        steady_rate = self.steady_state_rate()
+
+        return {
+            'samples': len(self.samples),
+            'peak_throughput': round(peak_rate, 2),
+            'steady_state_throughput': round(steady_rate, 2) if steady_rate is not None else None,
+            'steady_state_pct_of_peak': round(steady_rate / peak_rate * 100, 1) if peak_rate and steady_rate is not None else None,
+            'time_to_throttle': events[0]['start'] if events else None,
+            'throttle_events': events,
+            'max_temperature': max((s['temperature'] for s in self.samples), default=None),
+            'curve': self.sustained_curve()
+        }
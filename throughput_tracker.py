@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Sustained Throughput Tracking for Snapdragon vs Intel Performance Championship
+Turns back-to-back image latencies into an images-per-minute trend
+"""
+
+import statistics
+from typing import Dict, List, Optional
+
+
+class SustainedThroughputTracker:
+    """Per-image latencies over a long run, bucketed into images/minute windows
+
+    The drop-off point is the start of the first window whose throughput falls
+    more than `dropoff_threshold` below the best window seen before it.
+    """
+
+    def __init__(self, window: float = 60.0, dropoff_threshold: float = 0.15):
+        self.window = window
+        self.dropoff_threshold = dropoff_threshold
+        self.images: List[Dict] = []
+        self.elapsed = 0.0
+
+    def record(self, completed_at: float, latency: float):
+        """Add one finished image; completed_at is seconds since the run started"""
+        self.images.append({
+            'index': len(self.images) + 1,
+            'completed_at': round(completed_at, 2),
+            'latency': round(latency, 2)
+        })
+        self.elapsed = max(self.elapsed, completed_at)
+
+    def finish(self, elapsed: float):
+        """Mark the total run length, including any time after the last image"""
+        self.elapsed = max(self.elapsed, elapsed)
+
+    def trend(self) -> List[Dict]:
+        """Images per minute for each window of the run"""
+        if self.elapsed <= 0:
+            return []
+
+        # A short trailing remainder is folded into the last window so a few idle
+        # seconds at the end don't read as a throughput collapse
+        full_windows, remainder = divmod(self.elapsed, self.window)
+        window_count = max(1, int(full_windows) + (1 if remainder >= self.window / 2 else 0))
+        latencies: List[List[float]] = [[] for _ in range(window_count)]
+        for image in self.images:
+            latencies[min(int(image['completed_at'] // self.window), window_count - 1)].append(image['latency'])
+
+        trend = []
+        for index, window_latencies in enumerate(latencies):
+            # Generations run back to back, so the pace of the images finishing in a
+            # window is its throughput; counting whole images instead would quantize
+            # badly when a window only fits one or two of them
+            rate = 60 / statistics.mean(window_latencies) if window_latencies else None
+            trend.append({
+                'start': index * self.window,
+                'images': len(window_latencies),
+                'images_per_minute': round(rate, 2) if rate is not None else None
+            })
+        return trend
+
+    def dropoff_point(self, trend: List[Dict]) -> Optional[float]:
+        best = 0.0
+        for window in trend:
+            if window['images_per_minute'] is None:
+                continue
+            if best and window['images_per_minute'] < best * (1 - self.dropoff_threshold):
+                return window['start']
+            best = max(best, window['images_per_minute'])
+        return None
+
+    def summary(self) -> Dict:
+        """Sustained-generation summary suitable for a test_complete payload"""
+        latencies = [image['latency'] for image in self.images]
+        trend = self.trend()
+        rates = [w['images_per_minute'] for w in trend if w['images_per_minute'] is not None]
+        peak = max(rates, default=0.0)
+        final = rates[-1] if rates else 0.0
+
+        return {
+            'images': len(self.images),
+            'elapsed': round(self.elapsed, 2),
+            'images_per_minute': round(len(self.images) / self.elapsed * 60, 2) if self.elapsed else 0.0,
+            'peak_images_per_minute': peak,
+            'final_images_per_minute': final,
+            'retention_pct': round(final / peak * 100, 1) if peak else None,
+            'dropoff_point': self.dropoff_point(trend),
+            'latency_mean': round(statistics.mean(latencies), 2) if latencies else None,
+            'latency_stdev': round(statistics.stdev(latencies), 3) if len(latencies) > 1 else 0.0,
+            'latency_variance': round(statistics.variance(latencies), 3) if len(latencies) > 1 else 0.0,
+            'latency_min': min(latencies, default=None),
+            'latency_max': max(latencies, default=None),
+            'trend': trend
+        }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Time-Series Store for Snapdragon vs Intel Performance Championship
+Fixed-size ring buffers per device and metric with min/max/avg rollups
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_RESOLUTIONS = (1, 10, 60)
+
+
+class RingBuffer:
+    """Array-backed ring of (timestamp, columns...) rows in time order
+
+    Memory is allocated once; appending past capacity overwrites the oldest
+    row. Timestamps must be non-decreasing so ranges can be found by bisection.
+    """
+
+    def __init__(self, capacity: int, columns: int = 1):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.columns = [array('d', bytes(8 * capacity)) for _ in range(columns)]
+        self.start = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _slot(self, index: int) -> int:
+        """Physical slot of the index-th oldest row"""
+        return (self.start + index) % self.capacity
+
+    def append(self, timestamp: float, *values: float):
+        if self.count < self.capacity:
+            slot = self._slot(self.count)
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.times[slot] = timestamp
+        for column, value in zip(self.columns, values):
+            column[slot] = value
+
+    def last_slot(self) -> Optional[int]:
+        return self._slot(self.count - 1) if self.count else None
+
+    def time_at(self, index: int) -> float:
+        return self.times[self._slot(index)]
+
+    def _bisect(self, timestamp: float) -> int:
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.time_at(mid) < timestamp:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def rows(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterable[Tuple]:
+        """Rows with start <= timestamp <= end, oldest first"""
+        first = self._bisect(start) if start is not None else 0
+        for index in range(first, self.count):
+            slot = self._slot(index)
+            if end is not None and self.times[slot] > end:
+                break
+            yield (self.times[slot],) + tuple(column[slot] for column in self.columns)
+
+
+class RollupSeries:
+    """Fixed-resolution min/max/sum/count buckets over a ring buffer"""
+
+    MIN, MAX, SUM, COUNT = range(4)
+
+    def __init__(self, resolution: float, capacity: int):
+        self.resolution = resolution
+        self.buffer = RingBuffer(capacity, columns=4)
+
+    def add(self, timestamp: float, value: float):
+        bucket = timestamp - timestamp % self.resolution
+        slot = self.buffer.last_slot()
+        if slot is not None and self.buffer.times[slot] == bucket:
+            columns = self.buffer.columns
+            columns[self.MIN][slot] = min(columns[self.MIN][slot], value)
+            columns[self.MAX][slot] = max(columns[self.MAX][slot], value)
+            columns[self.SUM][slot] += value
+            columns[self.COUNT][slot] += 1
+        elif slot is None or bucket > self.buffer.times[slot]:
+            self.buffer.append(bucket, value, value, value, 1)
+        # Samples older than the open bucket are dropped rather than reordered
+
+    def points(self, start: Optional[float] = None, end: Optional[float] = None) -> List[List[float]]:
+        """[bucket_start, min, max, avg] rows for the range"""
+        # Include the bucket that contains `start`
+        first = start - start % self.resolution if start is not None else None
+        return [[t, round(lo, 3), round(hi, 3), round(total / count, 3)]
+                for t, lo, hi, total, count in self.buffer.rows(first, end)]
+
+
+class TimeSeriesStore:
+    """Per-device, per-metric history with 1 s / 10 s / 60 s rollups
+
+    Raw samples and every rollup are bounded ring buffers, so memory is fixed
+    per series regardless of how long the server runs. Queries pick the finest
+    resolution that fits the requested range into max_points.
+    """
+
+    def __init__(self, raw_capacity: int = 600, rollup_capacity: int = 720,
+                 resolutions: Tuple[int, ...] = DEFAULT_RESOLUTIONS):
+        self.raw_capacity = raw_capacity
+        self.rollup_capacity = rollup_capacity
+        self.resolutions = tuple(sorted(resolutions))
+        self._lock = threading.Lock()
+        self._raw: Dict[Tuple[str, str], RingBuffer] = {}
+        self._rollups: Dict[Tuple[str, str], Dict[float, RollupSeries]] = {}
+
+    def record(self, device_id: str, metric: str, timestamp: float, value: float):
+        key = (device_id, metric)
+        with self._lock:
+            raw = self._raw.get(key)
+            if raw is None:
+                raw = self._raw[key] = RingBuffer(self.raw_capacity)
+                self._rollups[key] = {resolution: RollupSeries(resolution, self.rollup_capacity)
+                                      for resolution in self.resolutions}
+            last = raw.last_slot()
+            if last is not None and timestamp < raw.times[last]:
+                return
+            raw.append(timestamp, value)
+            for rollup in self._rollups[key].values():
+                rollup.add(timestamp, value)
+
+    def record_metrics(self, device_id: str, timestamp: float, metrics: Dict):
+        """Record every numeric leaf of a metrics dict ('cpu.percent', 'temperature', ...)"""
+        for metric, value in flatten_metrics(metrics):
+            self.record(device_id, metric, timestamp, value)
+
+    def devices(self) -> List[str]:
+        with self._lock:
+            return sorted({device_id for device_id, _ in self._raw})
+
+    def metrics(self, device_id: Optional[str] = None) -> List[str]:
+        with self._lock:
+            return sorted({metric for d, metric in self._raw if device_id in (None, d)})
+
+    def samples(self, device_id: str, metric: str, start: Optional[float] = None,
+                end: Optional[float] = None) -> List[Tuple[float, float]]:
+        """Raw (timestamp, value) samples still held for a series"""
+        with self._lock:
+            raw = self._raw.get((device_id, metric))
+            return list(raw.rows(start, end)) if raw else []
+
+    def pick_resolution(self, start: float, end: float, max_points: int) -> float:
+        """Finest rollup resolution that covers [start, end] in max_points buckets"""
+        span = max(end - start, 0.0)
+        for resolution in self.resolutions:
+            if span / resolution <= max_points:
+                return resolution
+        return self.resolutions[-1]
+
+    def query(self, start: float, end: float, device_id: Optional[str] = None,
+              metric: Optional[str] = None, max_points: int = 300) -> Dict:
+        """Downsampled [t, min, max, avg] history per device and metric
+
+        Each series holds at most max_points rows (the newest, if the coarsest
+        resolution still doesn't fit), so the payload is bounded.
+        """
+        resolution = self.pick_resolution(start, end, max_points)
+        series: Dict[str, Dict[str, List]] = {}
+        with self._lock:
+            for (d, m), rollups in self._rollups.items():
+                if device_id not in (None, d) or metric not in (None, m):
+                    continue
+                points = rollups[resolution].points(start, end)
+                series.setdefault(d, {})[m] = points[-max_points:]
+        return {
+            'start': start,
+            'end': end,
+            'resolution': resolution,
+            'series': series
+        }
+
+    def summary(self, start: float, end: float,
+                device_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Dict]]:
+        """Whole-range min/max/avg/samples per device and metric (e.g. for one race)"""
+        wanted = set(device_ids) if device_ids is not None else None
+        summary: Dict[str, Dict[str, Dict]] = {}
+        with self._lock:
+            for (d, m), rollups in self._rollups.items():
+                if wanted is not None and d not in wanted:
+                    continue
+                rows = list(rollups[self.resolutions[0]].buffer.rows(start, end))
+                samples = sum(row[4] for row in rows)
+                if not samples:
+                    continue
+                summary.setdefault(d, {})[m] = {
+                    'min': round(min(row[1] for row in rows), 3),
+                    'max': round(max(row[2] for row in rows), 3),
+                    'avg': round(sum(row[3] for row in rows) / samples, 3),
+                    'samples': int(samples)
+                }
+        return summary
+
+
+def flatten_metrics(metrics: Dict, prefix: str = '') -> List[Tuple[str, float]]:
+    """Numeric leaves of a nested metrics dict as dotted names"""
+    leaves = []
+    for key, value in (metrics or {}).items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            leaves.extend(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            leaves.append((name, float(value)))
+    return leaves
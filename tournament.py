@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Tournament Scheduler for Snapdragon vs Intel Performance Championship
+Runs the configured demo_phases back to back with warm-up and cooldown gates
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from race import RUNNING, Race
+from sim_clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+# demo_phases 'type' -> demo_scenarios key, for phases without an explicit scenario
+PHASE_SCENARIOS = {
+    'sd_generation': 'ai_showdown',
+    'sustained_generation': 'sustained_generation',
+    'battery_stress': 'battery_race',
+    'thermal_stress': 'thermal_test'
+}
+
+PENDING = 'pending'
+WARMING_UP = 'warming_up'
+RACING = 'racing'
+SCORING = 'scoring'
+COOLING_DOWN = 'cooling_down'
+DONE = 'done'
+STOPPED = 'stopped'
+
+
+def phase_scenario(phase: Dict) -> Optional[str]:
+    return phase.get('scenario') or PHASE_SCENARIOS.get(phase.get('type'))
+
+
+class Tournament:
+    """One pass over the demo phases on a background thread
+
+    Before each race a warm-up gate waits (bounded) for every connected
+    device to acknowledge the phase's prepare_test; after it a cooldown
+    gate waits (bounded) for temperatures to return to the baseline taken
+    when the tournament started. A race that hangs is closed at its
+    deadline. Setup for the next phase is sent as soon as a race closes,
+    so agents prepare while the server is still scoring.
+    """
+
+    def __init__(self, phases: List[Dict],
+                 start_race: Callable[[str, Callable[[Race], None]], Optional[Race]],
+                 prepare: Callable[[str], None],
+                 temperatures: Callable[[], Dict[str, float]],
+                 publish: Callable[[Dict], None],
+                 close_race: Callable[[Race], None],
+                 warmup_timeout: float = 30.0, cooldown_tolerance: float = 2.0,
+                 cooldown_timeout: float = 120.0, scoring_timeout: float = 30.0,
+                 poll_interval: float = 1.0, clock: Optional[Clock] = None):
+        self.phases = [dict(phase, scenario=phase_scenario(phase)) for phase in phases]
+        self.start_race = start_race
+        self.prepare = prepare
+        self.temperatures = temperatures
+        self.publish = publish
+        self.close_race = close_race
+        self.warmup_timeout = warmup_timeout
+        self.cooldown_tolerance = cooldown_tolerance
+        self.cooldown_timeout = cooldown_timeout
+        self.scoring_timeout = scoring_timeout
+        self.poll_interval = poll_interval
+        self.clock = clock or get_clock()
+
+        self.state = PENDING
+        self.phase_index = -1
+        self.race: Optional[Race] = None
+        self.baseline: Dict[str, float] = {}
+        self.results: List[Dict] = []
+        self._ready: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._changed = self.clock.event()
+        self._closed = self.clock.event()
+        self._scored = self.clock.event()
+        self._stopped = False
+        self._thread = None
+
+    # Notifications from the server
+
+    def race_opened(self, race: Race):
+        """start_race() created the race; called before any agent is told to start"""
+        self.race = race
+
+    def device_ready(self, device_id: str, scenario: str):
+        """An agent finished preparing for a scenario"""
+        with self._lock:
+            self._ready.setdefault(scenario, set()).add(device_id)
+        self._changed.set()
+
+    def device_left(self, device_id: str):
+        """A device disconnected; it has to prepare again after it returns"""
+        with self._lock:
+            for devices in self._ready.values():
+                devices.discard(device_id)
+        self._changed.set()
+
+    def race_closed(self, race: Race):
+        """The current race stopped taking results (scoring follows)"""
+        if race is self.race:
+            self._closed.set()
+
+    def race_scored(self, race: Race, outcome: Dict):
+        if race is self.race:
+            self.results.append({
+                'phase': self.phases[self.phase_index]['name'],
+                'scenario': race.scenario,
+                'race_id': race.race_id,
+                'state': race.state,
+                'winner': outcome.get('winner')
+            })
+            self._scored.set()
+
+    def stop(self):
+        self._stopped = True
+        for event in (self._changed, self._closed, self._scored):
+            event.set()
+
+    # Scheduling
+
+    def start(self):
+        if self._thread is None:
+            self._thread = self.clock.start_thread(self.run, name='tournament')
+        return self._thread
+
+    def _set_state(self, state: str, **details):
+        self.state = state
+        update = self.snapshot()
+        update.update(details)
+        self.publish(update)
+
+    def _wait_until(self, condition: Callable[[], bool], timeout: float) -> bool:
+        """Poll condition (also waking on notifications) until it holds or timeout passes"""
+        deadline = self.clock.monotonic() + timeout
+        while not self._stopped:
+            if condition():
+                return True
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return False
+            self._changed.wait(min(self.poll_interval, remaining))
+            self._changed.clear()
+        return False
+
+    def _prepare(self, scenario: str):
+        """Send prepare_test, forgetting acknowledgements from an earlier phase of the same scenario"""
+        with self._lock:
+            self._ready[scenario] = set()
+        self.prepare(scenario)
+
+    def _all_ready(self, scenario: str) -> bool:
+        devices = set(self.temperatures())
+        with self._lock:
+            return bool(devices) and devices <= self._ready.get(scenario, set())
+
+    def _cooled(self) -> bool:
+        for device_id, temperature in self.temperatures().items():
+            baseline = self.baseline.get(device_id)
+            if baseline is not None and temperature is not None and \
+                    temperature > baseline + self.cooldown_tolerance:
+                return False
+        return True
+
+    def run(self):
+        self.baseline = {d: t for d, t in self.temperatures().items() if t is not None}
+        if self.phases:
+            self._prepare(self.phases[0]['scenario'])
+
+        for index, phase in enumerate(self.phases):
+            if self._stopped:
+                break
+            self.phase_index = index
+            scenario = phase['scenario']
+
+            self._set_state(WARMING_UP)
+            if not self._wait_until(lambda: self._all_ready(scenario), self.warmup_timeout):
+                if self._stopped:
+                    break
+                logger.warning(f"Warm-up gate timed out for {phase['name']}; starting anyway")
+
+            self._closed.clear()
+            self._scored.clear()
+            if self.start_race(scenario, self.race_opened) is None:
+                logger.warning(f"Skipping {phase['name']}: no such scenario {scenario!r}")
+                if index + 1 < len(self.phases):
+                    self._prepare(self.phases[index + 1]['scenario'])
+                continue
+            self._set_state(RACING, race_id=self.race.race_id)
+
+            # Hung phase: close the race at its own deadline
+            self._closed.wait(max(self.race.deadline - self.clock.time(), 0.0))
+            if self.race.state == RUNNING and not self._stopped and self.race.check_timeout(self.clock.time()):
+                logger.warning(f"{phase['name']} hit its deadline with {self.race.pending} outstanding")
+                self.close_race(self.race)
+            if self._stopped:
+                break
+
+            # Pipelined: the next phase's setup overlaps this race's scoring
+            self._set_state(SCORING)
+            upcoming = self.phases[index + 1] if index + 1 < len(self.phases) else None
+            if upcoming:
+                self._prepare(upcoming['scenario'])
+            if not self._scored.wait(self.scoring_timeout):
+                logger.warning(f"Scoring {phase['name']} did not finish in {self.scoring_timeout}s")
+
+            if upcoming and not self._stopped:
+                self._set_state(COOLING_DOWN)
+                if not self._wait_until(self._cooled, self.cooldown_timeout):
+                    logger.warning(f"Cooldown gate timed out before {upcoming['name']}")
+
+        self._set_state(STOPPED if self._stopped else DONE, standings=self.standings())
+
+    def standings(self) -> Dict[str, int]:
+        wins: Dict[str, int] = {}
+        for result in self.results:
+            if result['winner']:
+                wins[result['winner']] = wins.get(result['winner'], 0) + 1
+        return wins
+
+    def snapshot(self) -> Dict:
+        phase = self.phases[self.phase_index] if 0 <= self.phase_index < len(self.phases) else None
+        return {
+            'state': self.state,
+            'phase_index': self.phase_index,
+            'phases': [p['name'] for p in self.phases],
+            'phase': phase['name'] if phase else None,
+            'scenario': phase['scenario'] if phase else None,
+            'results': list(self.results),
+            'standings': self.standings()
+        }